@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import tarfile
 import zipfile
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from pathlib import Path
 from typing import Protocol
 
@@ -31,6 +31,20 @@ class ArchiveReader(Protocol):
         """Extract a file member for reading."""
         ...
 
+    def iter_files(
+        self, match: Callable[[str], bool] | None = None
+    ) -> Iterator[tuple[ArchiveMember, bytes]]:
+        """Iterate over file members and their content in one forward pass.
+
+        Args:
+            match: Optional predicate on the member name. Members for which it
+                returns False are skipped without reading their content.
+
+        Yields:
+            (member, content) tuples in archive order.
+        """
+        ...
+
 
 class ZipArchiveMember:
     """Adapter to make ZipInfo conform to ArchiveMember protocol."""
@@ -97,6 +111,36 @@ class TarArchiveReader:
             raise RuntimeError("Archive not open")
         return self._tar.extractfile(member)  # type: ignore[return-value]
 
+    def iter_files(
+        self, match: Callable[[str], bool] | None = None
+    ) -> Iterator[tuple[ArchiveMember, bytes]]:
+        """Iterate over file members and their content in one forward pass.
+
+        Opens the archive in stream mode so a compressed tarball is
+        decompressed exactly once, rather than once for getmembers() and again
+        for every backwards seek made by extractfile().
+
+        Args:
+            match: Optional predicate on the member name. Members for which it
+                returns False are skipped without reading their content.
+
+        Yields:
+            (member, content) tuples in archive order.
+        """
+        if not self._tar:
+            raise RuntimeError("Archive not open")
+        # "r|*" reads sequentially and detects the compression itself
+        with tarfile.open(self._tar_path, "r|*") as stream:
+            for member in stream:
+                if not member.isfile():
+                    continue
+                if match is not None and not match(member.name):
+                    continue
+                f = stream.extractfile(member)
+                if f is None:
+                    continue
+                yield member, f.read()
+
 
 class ZipArchiveReader:
     """Archive reader for zip files."""
@@ -134,6 +178,27 @@ class ZipArchiveReader:
             raise RuntimeError("Archive not open")
         return self._zip.open(member.name)  # type: ignore[return-value]
 
+    def iter_files(
+        self, match: Callable[[str], bool] | None = None
+    ) -> Iterator[tuple[ArchiveMember, bytes]]:
+        """Iterate over file members and their content in archive order.
+
+        Args:
+            match: Optional predicate on the member name. Members for which it
+                returns False are skipped without reading their content.
+
+        Yields:
+            (member, content) tuples in archive order.
+        """
+        if not self._zip:
+            raise RuntimeError("Archive not open")
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            if match is not None and not match(info.filename):
+                continue
+            yield ZipArchiveMember(info), self._zip.read(info)
+
 
 def open_archive(archive_path: Path) -> ArchiveReader:
     """Open an archive file (tar or zip) for reading.
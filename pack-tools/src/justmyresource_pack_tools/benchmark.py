@@ -0,0 +1,656 @@
+"""Benchmarks for built icon packs.
+
+These helpers measure the trade-offs behind pack build options against a
+real, already-built pack. They are exposed through `pack-tools bench`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import importlib
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+import zlib
+from collections.abc import Awaitable, Callable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from justmyresource_pack_tools.bloom import BLOOM_NAME
+from justmyresource_pack_tools.config import CompressionConfig
+from justmyresource_pack_tools.encodings import ENCODED_NAME
+from justmyresource_pack_tools.index import INDEX_NAME
+from justmyresource_pack_tools.pipeline import find_output_dir
+from justmyresource_pack_tools.repack import ZipEntry, create_icon_zip
+
+
+@dataclass(frozen=True, slots=True)
+class CompressionResult:
+    """Size and read latency of icons.zip under one compression policy."""
+
+    label: str
+    """Human-readable policy name (e.g., "deflate-9")."""
+    policy: CompressionConfig
+    """Policy that produced this result."""
+    zip_bytes: int
+    """Size of the resulting icons.zip."""
+    wheel_bytes: int
+    """Estimated contribution of icons.zip to the wheel (deflated again)."""
+    stored_entries: int
+    """Number of entries the policy left uncompressed."""
+    read_us: float
+    """Mean time to read and decompress one entry, in microseconds."""
+
+
+def default_policies(
+    configured: CompressionConfig,
+) -> list[tuple[str, CompressionConfig]]:
+    """Build the list of compression policies to compare.
+
+    Args:
+        configured: The pack's own policy from upstream.toml.
+
+    Returns:
+        (label, policy) tuples, ending with the configured policy.
+    """
+    return [
+        ("stored", CompressionConfig(method="stored")),
+        ("deflate-1", CompressionConfig(method="deflate", level=1)),
+        ("deflate-6", CompressionConfig(method="deflate", level=6)),
+        ("deflate-9", CompressionConfig(method="deflate", level=9)),
+        ("auto-9", CompressionConfig(method="auto", level=9)),
+        ("configured", configured),
+    ]
+
+
+def _iter_zip_entries(zip_path: Path) -> Iterator[ZipEntry]:
+    """Read every file in a zip as ZipEntry objects.
+
+    Args:
+        zip_path: Path to an existing icons.zip.
+
+    Yields:
+        ZipEntry objects in archive order.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_file:
+        for info in zip_file.infolist():
+            if not info.is_dir():
+                yield ZipEntry(path=info.filename, content=zip_file.read(info))
+
+
+def _time_reads(zip_path: Path, rounds: int) -> float:
+    """Measure the mean time to read one entry from a zip.
+
+    Args:
+        zip_path: Zip file to read.
+        rounds: Number of passes over all entries.
+
+    Returns:
+        Mean read time per entry in microseconds.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_file:
+        infos = [info for info in zip_file.infolist() if not info.is_dir()]
+        if not infos:
+            return 0.0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for info in infos:
+                zip_file.read(info)
+        elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(infos)) * 1e6
+
+
+def bench_compression(
+    icons_zip: Path,
+    policies: list[tuple[str, CompressionConfig]],
+    rounds: int = 5,
+) -> list[CompressionResult]:
+    """Rebuild icons.zip under each policy and measure size and read latency.
+
+    Args:
+        icons_zip: Path to a built icons.zip whose entries are used as input.
+        policies: (label, policy) tuples to compare.
+        rounds: Number of read passes used for the latency measurement.
+
+    Returns:
+        One CompressionResult per policy, in the given order.
+    """
+    results: list[CompressionResult] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, policy in policies:
+            zip_path = Path(tmp) / f"{label}.zip"
+            create_icon_zip(_iter_zip_entries(icons_zip), zip_path, compression=policy)
+            with zipfile.ZipFile(zip_path, "r") as zip_file:
+                stored = sum(
+                    1
+                    for info in zip_file.infolist()
+                    if info.compress_type == zipfile.ZIP_STORED
+                )
+            zip_bytes = zip_path.read_bytes()
+            results.append(
+                CompressionResult(
+                    label=label,
+                    policy=policy,
+                    zip_bytes=len(zip_bytes),
+                    # Wheels are zips too; build backends deflate at level 6
+                    wheel_bytes=len(zlib.compress(zip_bytes, 6)),
+                    stored_entries=stored,
+                    read_us=_time_reads(zip_path, rounds),
+                )
+            )
+    return results
+
+
+@dataclass(frozen=True, slots=True)
+class ThroughputResult:
+    """Wall time of one lookup scenario."""
+
+    label: str
+    """Scenario name (e.g., "asyncio.gather")."""
+    lookups: int
+    """Number of lookups performed."""
+    seconds: float
+    """Best wall time over all rounds."""
+
+    @property
+    def per_second(self) -> float:
+        """Lookups per second."""
+        return self.lookups / self.seconds if self.seconds else 0.0
+
+    @property
+    def mean_us(self) -> float:
+        """Mean time per lookup, in microseconds."""
+        return self.seconds / self.lookups * 1e6 if self.lookups else 0.0
+
+
+def load_provider_factory(pack_dir: Path) -> Callable[[], Any]:
+    """Import a pack from its source tree and return its provider factory.
+
+    Packs need `justmyresource` at runtime, which pack-tools does not depend
+    on, so it must be installed in the same environment.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+
+    Returns:
+        The pack's `get_resource_provider` function.
+
+    Raises:
+        ImportError: If the pack or justmyresource cannot be imported.
+    """
+    output_dir = find_output_dir(pack_dir)
+    src_dir = str(output_dir.parent.resolve())
+    if src_dir not in sys.path:
+        sys.path.insert(0, src_dir)
+    module = importlib.import_module(output_dir.name)
+    factory: Callable[[], Any] = module.get_resource_provider
+    return factory
+
+
+def _best_time(run: Callable[[], object], rounds: int) -> float:
+    """Time a callable and keep the fastest round.
+
+    Args:
+        run: Function performing one round.
+        rounds: Number of rounds.
+
+    Returns:
+        Fastest wall time in seconds.
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_async(
+    pack_dir: Path, lookups: int = 500, rounds: int = 3
+) -> list[ThroughputResult]:
+    """Compare sync and asyncio lookup throughput on cold pack instances.
+
+    Every round uses a fresh provider, so no icon is served from a cache.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of lookups per scenario.
+        rounds: Rounds per scenario; the fastest is reported.
+
+    Returns:
+        One ThroughputResult per scenario.
+    """
+    factory = load_provider_factory(pack_dir)
+    available = list(factory().list_resources())
+    rng = random.Random(0)
+    names = [rng.choice(available) for _ in range(lookups)]
+    hot = names[: max(1, lookups // 10)]
+    duplicated = [hot[i % len(hot)] for i in range(lookups)]
+
+    def sync_loop() -> None:
+        provider = factory()
+        for name in names:
+            provider.get_resource(name)
+
+    def gather(batch: list[str]) -> Callable[[], None]:
+        async def lookup_all() -> None:
+            provider = factory()
+            try:
+                await asyncio.gather(*(provider.aget_resource(n) for n in batch))
+            finally:
+                provider.close()
+
+        return lambda: asyncio.run(lookup_all())
+
+    async def many() -> None:
+        provider = factory()
+        try:
+            await provider.aget_many(names)
+        finally:
+            provider.close()
+
+    scenarios: list[tuple[str, Callable[[], object]]] = [
+        ("sync loop", sync_loop),
+        ("asyncio.gather", gather(names)),
+        ("gather, 10x dup", gather(duplicated)),
+        ("aget_many", lambda: asyncio.run(many())),
+    ]
+    return [
+        ThroughputResult(label=label, lookups=lookups, seconds=_best_time(run, rounds))
+        for label, run in scenarios
+    ]
+
+
+def bench_misses(
+    pack_dir: Path, lookups: int = 500, rounds: int = 3
+) -> list[ThroughputResult]:
+    """Compare the cost of probing a pack for names it does not have.
+
+    Each scenario skips the sidecars that came after it (skip_sidecars=),
+    so the rows show miss latency with only the zip directory, with
+    icons.idx, and with icons.bloom in front of both. Providers are warmed
+    with one lookup first, so one-off loading is not counted. Absent names
+    are derived from real ones, as a registry probing several packs would
+    see them.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of has_resource() calls per scenario.
+        rounds: Rounds per scenario; the fastest is reported.
+
+    Returns:
+        One ThroughputResult per scenario, plus a row of hits for reference.
+    """
+    factory = load_provider_factory(pack_dir)
+    sample = factory()
+    available = list(sample.list_resources())
+    rng = random.Random(0)
+    hits = [rng.choice(available).removesuffix(".svg") for _ in range(lookups)]
+    misses = [f"{name}-{i}-absent" for i, name in enumerate(hits)]
+    package_name = find_output_dir(pack_dir).name
+
+    def provider(index: bool, bloom: bool) -> Any:
+        sidecars = ((INDEX_NAME, index), (BLOOM_NAME, bloom))
+        skip = [name for name, used in sidecars if not used]
+        pack = type(sample)(package_name=package_name, skip_sidecars=skip)
+        pack.has_resource(misses[0])
+        return pack
+
+    def probe(pack: Any, batch: list[str]) -> Callable[[], None]:
+        def run() -> None:
+            for name in batch:
+                pack.has_resource(name)
+
+        return run
+
+    scenarios = [
+        ("zip directory", provider(index=False, bloom=False), misses),
+        ("icons.idx", provider(index=True, bloom=False), misses),
+        ("icons.bloom", provider(index=True, bloom=True), misses),
+        ("hits (bloom)", provider(index=True, bloom=True), hits),
+    ]
+    return [
+        ThroughputResult(
+            label=label,
+            lookups=lookups,
+            seconds=_best_time(probe(pack, batch), rounds),
+        )
+        for label, pack, batch in scenarios
+    ]
+
+
+@dataclass(frozen=True, slots=True)
+class ServingResult:
+    """CPU cost of serving icons over HTTP in one way."""
+
+    label: str
+    """Scenario name (e.g., "passthrough gzip")."""
+    requests: int
+    """Number of requests served."""
+    cpu_seconds: float
+    """Best process CPU time over all rounds."""
+    response_bytes: int
+    """Total size of the response bodies."""
+
+    @property
+    def cpu_us(self) -> float:
+        """Mean CPU time per request, in microseconds."""
+        return self.cpu_seconds / self.requests * 1e6 if self.requests else 0.0
+
+
+def _icon_app(
+    provider: Any, encode: Callable[[Any, str], tuple[bytes, list[Any]]]
+) -> Callable[..., Awaitable[None]]:
+    """Build a minimal ASGI app serving a pack's icons at /<name>.
+
+    Args:
+        provider: Pack instance.
+        encode: Function returning (body, extra headers) for a name.
+
+    Returns:
+        ASGI application callable.
+    """
+
+    async def app(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        body, headers = encode(provider, scope["path"][1:])
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"image/svg+xml"), *headers],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+def bench_serving(
+    pack_dir: Path, requests: int = 500, rounds: int = 3
+) -> list[ServingResult]:
+    """Compare the CPU cost per request of serving icons through ASGI.
+
+    Requests are driven in-process through a minimal ASGI app, without
+    sockets, so the figures are the serving code's own CPU time. Each
+    round uses a fresh provider with the cache disabled. Packs built with
+    [encodings] get one extra scenario per precompressed encoding.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        requests: Number of requests per scenario.
+        rounds: Rounds per scenario; the cheapest is reported.
+
+    Returns:
+        One ServingResult per scenario.
+    """
+    factory = load_provider_factory(pack_dir)
+    available = list(factory().list_resources())
+    rng = random.Random(0)
+    names = [rng.choice(available) for _ in range(requests)]
+    gzip_header = [(b"content-encoding", b"gzip")]
+
+    def inflate(provider: Any, name: str) -> tuple[bytes, list[Any]]:
+        return provider.get_resource(name).data, []
+
+    def regzip(provider: Any, name: str) -> tuple[bytes, list[Any]]:
+        data = provider.get_resource(name).data
+        return gzip.compress(data, compresslevel=6, mtime=0), gzip_header
+
+    def passthrough(provider: Any, name: str) -> tuple[bytes, list[Any]]:
+        return provider.get_compressed(name).to_gzip(), gzip_header
+
+    def serve(
+        label: str, encode: Callable[[Any, str], tuple[bytes, list[Any]]]
+    ) -> ServingResult:
+        sizes: list[int] = []
+
+        async def receive() -> dict[str, Any]:
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message: dict[str, Any]) -> None:
+            if message["type"] == "http.response.body":
+                sizes.append(len(message["body"]))
+
+        async def run_round() -> None:
+            app = _icon_app(factory(), encode)
+            for name in names:
+                scope = {
+                    "type": "http",
+                    "method": "GET",
+                    "path": f"/{name}",
+                    "headers": [(b"accept-encoding", b"gzip")],
+                }
+                await app(scope, receive, send)
+
+        best = float("inf")
+        for _ in range(rounds):
+            sizes.clear()
+            start = time.process_time()
+            asyncio.run(run_round())
+            best = min(best, time.process_time() - start)
+        return ServingResult(
+            label=label, requests=requests, cpu_seconds=best, response_bytes=sum(sizes)
+        )
+
+    def precompressed(
+        encoding: str,
+    ) -> Callable[[Any, str], tuple[bytes, list[Any]]]:
+        header = [(b"content-encoding", encoding.encode("ascii"))]
+
+        def encode(provider: Any, name: str) -> tuple[bytes, list[Any]]:
+            return provider.get_encoded(name, encoding), header
+
+        return encode
+
+    scenarios: list[tuple[str, Callable[[Any, str], tuple[bytes, list[Any]]]]] = [
+        ("inflate, identity", inflate),
+        ("inflate + gzip", regzip),
+        ("passthrough gzip", passthrough),
+    ]
+    if (find_output_dir(pack_dir) / ENCODED_NAME).exists():
+        scenarios += [
+            (f"{ENCODED_NAME} {encoding}", precompressed(encoding))
+            for encoding in factory().list_encodings()
+        ]
+    return [serve(label, encode) for label, encode in scenarios]
+
+
+@dataclass(frozen=True, slots=True)
+class DirectoryResult:
+    """Memory held by one in-memory representation of a pack's directory."""
+
+    label: str
+    """Representation name (e.g., "zipfile.ZipFile")."""
+    names: int
+    """Number of names it can look up."""
+    heap_bytes: int
+    """Python heap retained after building it, as traced by tracemalloc."""
+    lookup_us: float
+    """Mean time to look up one name, in microseconds."""
+
+    @property
+    def bytes_per_icon(self) -> float:
+        """Retained bytes per name."""
+        return self.heap_bytes / self.names if self.names else 0.0
+
+
+def _traced(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Build an object and measure the heap it retains.
+
+    Args:
+        build: Function returning the object.
+
+    Returns:
+        (object, retained bytes). Temporaries freed before build() returns
+        are not counted, nor are one-off caches filled by a first, untraced
+        build.
+    """
+    build()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        built = build()
+        retained = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return built, retained
+
+
+def bench_directory(
+    pack_dir: Path, lookups: int = 1000, rounds: int = 3
+) -> list[DirectoryResult]:
+    """Compare the memory and lookup cost of a pack's directory representations.
+
+    The rows are an open `zipfile.ZipFile` (one `ZipInfo` per icon plus its
+    name dict), the runtime's compact `IconDirectory` read from the same
+    central directory, and icons.idx loaded as an `IconIndex` when the pack
+    has one.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of lookups per representation.
+        rounds: Rounds of lookups; the fastest is reported.
+
+    Returns:
+        One DirectoryResult per representation.
+    """
+    aliases = load_provider_factory(pack_dir)()._get_aliases()
+    output_dir = find_output_dir(pack_dir)
+    runtime = importlib.import_module(f"{output_dir.name}._runtime")
+    zip_path = output_dir / "icons.zip"
+
+    def read_directory() -> Any:
+        with open(zip_path, "rb") as f:
+            return runtime.IconDirectory(f, aliases)
+
+    zip_file, zip_bytes = _traced(lambda: zipfile.ZipFile(zip_path))
+    directory, directory_bytes = _traced(read_directory)
+    rng = random.Random(0)
+    stored = [info.filename for info in zip_file.infolist() if not info.is_dir()]
+    names = [rng.choice(stored) for _ in range(lookups)]
+
+    def lookup_all(find: Callable[[str], object]) -> Callable[[], None]:
+        def run() -> None:
+            for name in names:
+                find(name)
+
+        return run
+
+    def result(
+        label: str, count: int, retained: int, find: Callable[[str], object]
+    ) -> DirectoryResult:
+        seconds = _best_time(lookup_all(find), rounds)
+        return DirectoryResult(
+            label=label,
+            names=count,
+            heap_bytes=retained,
+            lookup_us=seconds / lookups * 1e6,
+        )
+
+    with zip_file:
+        results = [
+            result("zipfile.ZipFile", len(stored), zip_bytes, zip_file.getinfo),
+            result("IconDirectory", len(directory), directory_bytes, directory.find),
+        ]
+    index_path = output_dir / runtime.INDEX_NAME
+    if index_path.exists():
+        index, index_bytes = _traced(lambda: runtime.IconIndex(index_path.read_bytes()))
+        results.append(result(runtime.INDEX_NAME, len(index), index_bytes, index.find))
+    return results
+
+
+STARTUP_SCRIPT = """
+import importlib, json, sys, time
+import justmyresource.pack_utils
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[2])
+imported = time.perf_counter()
+package_dir = module.__path__[0]
+opened = []
+def audit(event, args):
+    if event == "open" and isinstance(args[0], str) and args[0].startswith(package_dir):
+        opened.append(args[0])
+sys.addaudithook(audit)
+module.get_resource_provider()
+constructed = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1e3,
+    "construct_ms": (constructed - imported) * 1e3,
+    "opened": sorted(set(opened)),
+}))
+"""
+"""Run in a fresh interpreter to time one cold import and construction.
+
+justmyresource itself is imported before timing starts: entry-point
+discovery has always loaded it by the time a pack is imported.
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class StartupResult:
+    """Cold-start cost of one pack."""
+
+    pack: str
+    """Pack directory name."""
+    import_ms: float
+    """Best time to import the pack module, in milliseconds."""
+    construct_ms: float
+    """Best time for get_resource_provider(), in milliseconds."""
+    opened: list[str] = field(default_factory=list)
+    """Pack files opened during get_resource_provider() (should be none)."""
+
+    @property
+    def total_ms(self) -> float:
+        """Import plus construction time."""
+        return self.import_ms + self.construct_ms
+
+
+def bench_startup(pack_dir: Path, runs: int = 5) -> StartupResult:
+    """Measure cold import and provider construction time for a pack.
+
+    Each run uses a fresh interpreter so that nothing is already imported or
+    cached. Requires `justmyresource` in the current environment.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        runs: Number of fresh interpreters; the fastest run is reported.
+
+    Returns:
+        StartupResult with the best timings and any files opened while
+        constructing the provider.
+
+    Raises:
+        RuntimeError: If the pack cannot be imported.
+    """
+    output_dir = find_output_dir(pack_dir)
+    command = [
+        sys.executable,
+        "-c",
+        STARTUP_SCRIPT,
+        str(output_dir.parent.resolve()),
+        output_dir.name,
+    ]
+    samples = []
+    for _ in range(runs):
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            errors = result.stderr.strip().splitlines()
+            detail = errors[-1] if errors else f"stdout: {result.stdout.strip()!r}"
+            raise RuntimeError(
+                f"Startup run exited with status {result.returncode}: {detail}"
+            )
+        samples.append(json.loads(result.stdout))
+    return StartupResult(
+        pack=pack_dir.name,
+        import_ms=min(sample["import_ms"] for sample in samples),
+        construct_ms=min(sample["construct_ms"] for sample in samples),
+        opened=sorted({path for sample in samples for path in sample["opened"]}),
+    )
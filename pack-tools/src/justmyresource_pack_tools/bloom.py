@@ -0,0 +1,105 @@
+"""Bloom filter of icon names written next to icons.zip.
+
+Registries that probe several packs for an unprefixed name mostly miss.
+The filter lets the pack runtime answer "not in this pack" with one hash and
+a few bit tests, without loading icons.idx or opening icons.zip. A positive
+answer may be false (about 1% at the default size) and is confirmed by the
+normal lookup.
+
+Format (little-endian), version 2:
+
+- Header (24 bytes): magic ``b"JMRB"``, version (u16), number of hash
+  functions k (u16), number of bits m (u32), number of names (u32),
+  `index.zip_stamp()` of the icons.zip it describes (u64).
+- Bit array: ceil(m / 8) bytes; bit ``p`` is ``data[p >> 3] >> (p & 7) & 1``.
+
+Bit positions of a name are ``(h1 + i * h2) % m`` for ``i`` in ``range(k)``,
+where h1 and h2 are the two little-endian u64 halves of the 16-byte BLAKE2b
+digest of the UTF-8 name, with h2 forced odd. The reader lives in the
+vendored runtime (`runtime/_runtime.py`) and must be kept in step with this
+module.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+from collections.abc import Collection
+from pathlib import Path
+
+from justmyresource_pack_tools.index import zip_stamp
+
+BLOOM_NAME = "icons.bloom"
+"""File written next to icons.zip."""
+
+BLOOM_MAGIC = b"JMRB"
+BLOOM_VERSION = 2
+BLOOM_HEADER = struct.Struct("<4sHHIIQ")
+
+BITS_PER_NAME = 10
+"""Filter size per name; with the optimal k this gives about 1% false hits."""
+
+
+def bloom_positions(name: str, hashes: int, bits: int) -> list[int]:
+    """Compute the bit positions of a name.
+
+    Args:
+        name: Zip path of the icon.
+        hashes: Number of hash functions (k).
+        bits: Size of the bit array (m).
+
+    Returns:
+        k bit positions in [0, m).
+    """
+    digest = hashlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def build_bloom(
+    names: Collection[str], bits_per_name: int = BITS_PER_NAME
+) -> tuple[int, int, bytes]:
+    """Build the bit array of a Bloom filter.
+
+    Args:
+        names: Every name the filter must accept.
+        bits_per_name: Filter size per name.
+
+    Returns:
+        (k, m, bit array).
+    """
+    bits = max(64, len(names) * bits_per_name)
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / max(1, len(names)) * math.log(2)))
+    data = bytearray(bits // 8)
+    for name in names:
+        for position in bloom_positions(name, hashes, bits):
+            data[position >> 3] |= 1 << (position & 7)
+    return hashes, bits, bytes(data)
+
+
+def write_bloom(names: Collection[str], zip_path: Path, output_path: Path) -> int:
+    """Write the Bloom filter for a built icons.zip.
+
+    Args:
+        names: Every zip path the pack serves, including deduplicated aliases.
+        zip_path: Path to the icons.zip the names come from.
+        output_path: Path of the filter file to write.
+
+    Returns:
+        Size of the written filter in bytes.
+    """
+    hashes, bits, data = build_bloom(names)
+    header = BLOOM_HEADER.pack(
+        BLOOM_MAGIC, BLOOM_VERSION, hashes, bits, len(names), zip_stamp(zip_path)
+    )
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_bytes(header + data)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(header) + len(data)
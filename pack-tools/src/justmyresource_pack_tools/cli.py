@@ -2,19 +2,38 @@
 
 from __future__ import annotations
 
-import importlib.util
 import subprocess
 import sys
+import zipfile
 from pathlib import Path
+from typing import Any
 
 import click
 
-from justmyresource_pack_tools.archive import open_archive
-from justmyresource_pack_tools.config import UpstreamConfig
-from justmyresource_pack_tools.download import compute_sha256, download_with_cache
-from justmyresource_pack_tools.manifest import generate_manifest
-from justmyresource_pack_tools.readme import generate_readme
-from justmyresource_pack_tools.repack import create_icon_zip
+from justmyresource_pack_tools.benchmark import (
+    bench_async,
+    bench_compression,
+    bench_directory,
+    bench_misses,
+    bench_serving,
+    bench_startup,
+    default_policies,
+)
+from justmyresource_pack_tools.discovery import write_discovery_index
+from justmyresource_pack_tools.pipeline import (
+    build_pack,
+    discover_packs,
+    fetch_pack,
+    find_output_dir,
+    load_upstream,
+    run_all,
+)
+from justmyresource_pack_tools.runtime import install_runtime, runtime_is_current
+from justmyresource_pack_tools.runtime._discovery import (
+    DiscoveryIndex,
+    default_discovery_path,
+    installed_packs,
+)
 
 
 @click.group()
@@ -31,140 +50,496 @@ def fetch(pack_dir: Path) -> None:
     Args:
         pack_dir: Path to pack directory (e.g., packs/lucide/).
     """
-    upstream_toml = pack_dir / "upstream.toml"
-    if not upstream_toml.exists():
-        click.echo(f"Error: upstream.toml not found in {pack_dir}", err=True)
+    try:
+        fetch_pack(pack_dir, log=click.echo)
+    except Exception as e:
+        click.echo(f"Error fetching {pack_dir.name}: {e}", err=True)
         sys.exit(1)
 
+
+@main.command()
+@click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option("--force", is_flag=True, help="Rebuild even if inputs are unchanged.")
+@click.option(
+    "--reproducible",
+    is_flag=True,
+    help="Byte-identical output for identical inputs (implied by SOURCE_DATE_EPOCH).",
+)
+def build(pack_dir: Path, force: bool, reproducible: bool) -> None:
+    """Build pack (extracts from cache, generates icons.zip + manifest + README).
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        force: Rebuild even if the build fingerprint is unchanged.
+        reproducible: Produce byte-identical artifacts for identical inputs.
+    """
     try:
-        config = UpstreamConfig.load(upstream_toml)
-        cache_dir = pack_dir / "cache"
+        build_pack(pack_dir, log=click.echo, force=force, reproducible=reproducible)
+    except Exception as e:
+        click.echo(f"Error building {pack_dir.name}: {e}", err=True)
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
 
-        click.echo(f"Fetching {pack_dir.name}...")
-        click.echo(f"  URL: {config.source.url}")
-        click.echo(f"  Tag: {config.source.tag}")
 
-        archive_path = download_with_cache(
-            url=config.source.url,
-            cache_dir=cache_dir,
-            expected_sha256=config.source.sha256 if config.source.sha256 else None,
+def _run_all(step: str, packs_dir: Path, jobs: int | None, **options: Any) -> None:
+    """Run a pipeline step for every pack and report per-pack results.
+
+    Args:
+        step: Step name ("fetch" or "build").
+        packs_dir: Path to packs directory (e.g., packs/).
+        jobs: Number of worker processes (None for one per CPU).
+        **options: Extra keyword arguments for the step.
+    """
+    pack_dirs = discover_packs(packs_dir)
+    if not pack_dirs:
+        click.echo(
+            f"Error: no packs with upstream.toml found in {packs_dir}", err=True
         )
+        sys.exit(1)
+
+    click.echo(f"Running {step} for {len(pack_dirs)} packs...")
+    failed: list[str] = []
+    for result in run_all(step, pack_dirs, jobs=jobs, **options):
+        for line in result.output:
+            click.echo(f"[{result.pack}] {line}")
+        if result.ok:
+            click.echo(f"✓ {result.pack} ({result.elapsed:.1f}s)")
+        else:
+            failed.append(result.pack)
+            click.echo(
+                f"✗ {result.pack} ({result.elapsed:.1f}s): {result.error}", err=True
+            )
+            if step == "build" and result.traceback:
+                click.echo(result.traceback, err=True)
+
+    ok_count = len(pack_dirs) - len(failed)
+    click.echo(f"{step}: {ok_count} succeeded, {len(failed)} failed")
+    if failed:
+        click.echo(f"Failed packs: {', '.join(sorted(failed))}", err=True)
+        sys.exit(1)
+
+
+@main.command("fetch-all")
+@click.argument(
+    "packs_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default="packs",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parallel workers (default: CPU count).",
+)
+def fetch_all(packs_dir: Path, jobs: int | None) -> None:
+    """Fetch upstream archives for all packs in parallel.
+
+    Args:
+        packs_dir: Path to packs directory (default: packs/).
+        jobs: Number of worker processes.
+    """
+    _run_all("fetch", packs_dir, jobs)
+
+
+@main.command("build-all")
+@click.argument(
+    "packs_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default="packs",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parallel workers (default: CPU count).",
+)
+@click.option("--force", is_flag=True, help="Rebuild even if inputs are unchanged.")
+@click.option(
+    "--reproducible",
+    is_flag=True,
+    help="Byte-identical output for identical inputs (implied by SOURCE_DATE_EPOCH).",
+)
+def build_all(
+    packs_dir: Path, jobs: int | None, force: bool, reproducible: bool
+) -> None:
+    """Build all packs in parallel, continuing past failures.
 
-        click.echo(f"✓ Archive cached at {archive_path}")
+    Args:
+        packs_dir: Path to packs directory (default: packs/).
+        jobs: Number of worker processes.
+        force: Rebuild even if the build fingerprint is unchanged.
+        reproducible: Produce byte-identical artifacts for identical inputs.
+    """
+    _run_all("build", packs_dir, jobs, force=force, reproducible=reproducible)
+
+
+@main.command("sync-runtime")
+@click.argument(
+    "packs_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default="packs",
+)
+@click.option(
+    "--check",
+    is_flag=True,
+    help="Fail if any pack's copy is out of date instead of rewriting it.",
+)
+def sync_runtime(packs_dir: Path, check: bool) -> None:
+    """Copy the shared runtime module into every pack without rebuilding.
 
+    Args:
+        packs_dir: Directory containing pack directories (default: packs/).
+        check: Only verify the copies, for CI and pre-commit.
+    """
+    stale: list[str] = []
+    try:
+        for pack_dir in discover_packs(packs_dir):
+            output_dir = find_output_dir(pack_dir)
+            if check:
+                if not runtime_is_current(output_dir):
+                    stale.append(pack_dir.name)
+                continue
+            for path in install_runtime(output_dir):
+                click.echo(f"✓ Installed {path}")
     except Exception as e:
-        click.echo(f"Error fetching {pack_dir.name}: {e}", err=True)
+        click.echo(f"Error syncing runtime: {e}", err=True)
+        sys.exit(1)
+    if stale:
+        click.echo(
+            f"✗ Runtime out of date in: {', '.join(stale)}; "
+            "run `pack-tools sync-runtime`",
+            err=True,
+        )
         sys.exit(1)
 
 
-@main.command()
+@main.group()
+def bench() -> None:
+    """Benchmark build options against a built pack."""
+    pass
+
+
+@bench.command("compression")
 @click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
-def build(pack_dir: Path) -> None:
-    """Build pack (extracts from cache, generates icons.zip + manifest + README).
+@click.option(
+    "--rounds", type=click.IntRange(min=1), default=5, help="Read passes per policy."
+)
+def bench_compression_cmd(pack_dir: Path, rounds: int) -> None:
+    """Compare icons.zip compression policies: size vs read latency.
 
     Args:
-        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        rounds: Number of read passes per policy.
     """
-    upstream_toml = pack_dir / "upstream.toml"
-    if not upstream_toml.exists():
-        click.echo(f"Error: upstream.toml not found in {pack_dir}", err=True)
+    try:
+        config = load_upstream(pack_dir)
+        icons_zip = find_output_dir(pack_dir) / "icons.zip"
+        if not zipfile.is_zipfile(icons_zip):
+            raise FileNotFoundError(
+                f"{icons_zip} is missing or not a zip. "
+                f"Run 'pack-tools build {pack_dir}' first."
+            )
+
+        click.echo(f"Benchmarking compression for {pack_dir.name}...")
+        results = bench_compression(
+            icons_zip, default_policies(config.compression), rounds=rounds
+        )
+        click.echo(
+            f"{'policy':<12} {'icons.zip':>12} {'wheel (est.)':>14} "
+            f"{'stored':>8} {'read µs':>9}"
+        )
+        for result in results:
+            click.echo(
+                f"{result.label:<12} {result.zip_bytes:>12,} "
+                f"{result.wheel_bytes:>14,} {result.stored_entries:>8} "
+                f"{result.read_us:>9.2f}"
+            )
+    except Exception as e:
+        click.echo(f"Error benchmarking {pack_dir.name}: {e}", err=True)
         sys.exit(1)
 
+
+@bench.command("async")
+@click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--lookups", type=click.IntRange(min=1), default=500, help="Lookups per scenario."
+)
+@click.option(
+    "--rounds", type=click.IntRange(min=1), default=3, help="Rounds per scenario."
+)
+def bench_async_cmd(pack_dir: Path, lookups: int, rounds: int) -> None:
+    """Compare sync and asyncio lookup throughput on a cold pack.
+
+    Requires justmyresource to be installed alongside pack-tools.
+
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of lookups per scenario.
+        rounds: Rounds per scenario; the fastest is reported.
+    """
     try:
-        config = UpstreamConfig.load(upstream_toml)
-        cache_dir = pack_dir / "cache"
+        click.echo(f"Benchmarking async lookups for {pack_dir.name}...")
+        results = bench_async(pack_dir, lookups=lookups, rounds=rounds)
+        click.echo(f"{'scenario':<18} {'lookups':>8} {'ms':>9} {'lookups/s':>11}")
+        for result in results:
+            click.echo(
+                f"{result.label:<18} {result.lookups:>8} "
+                f"{result.seconds * 1e3:>9.2f} {result.per_second:>11,.0f}"
+            )
+    except Exception as e:
+        click.echo(f"Error benchmarking {pack_dir.name}: {e}", err=True)
+        sys.exit(1)
+
+
+@bench.command("misses")
+@click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--lookups", type=click.IntRange(min=1), default=500, help="Lookups per scenario."
+)
+@click.option(
+    "--rounds", type=click.IntRange(min=1), default=3, help="Rounds per scenario."
+)
+def bench_misses_cmd(pack_dir: Path, lookups: int, rounds: int) -> None:
+    """Compare the latency of lookups for names a pack does not have.
+
+    Requires justmyresource to be installed alongside pack-tools.
 
-        # Check cache exists
-        cached_files = list(cache_dir.glob("*"))
-        if not cached_files:
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of lookups per scenario.
+        rounds: Rounds per scenario; the fastest is reported.
+    """
+    try:
+        click.echo(f"Benchmarking missing-name lookups for {pack_dir.name}...")
+        results = bench_misses(pack_dir, lookups=lookups, rounds=rounds)
+        click.echo(
+            f"{'scenario':<18} {'lookups':>8} {'µs/lookup':>10} {'lookups/s':>11}"
+        )
+        for result in results:
             click.echo(
-                f"Error: No cached archive found in {cache_dir}.\n"
-                f"Run 'pack-tools fetch {pack_dir}' first.",
-                err=True,
+                f"{result.label:<18} {result.lookups:>8} "
+                f"{result.mean_us:>10.2f} {result.per_second:>11,.0f}"
             )
-            sys.exit(1)
+    except Exception as e:
+        click.echo(f"Error benchmarking {pack_dir.name}: {e}", err=True)
+        sys.exit(1)
 
-        # Use the cached archive (should be only one file)
-        archive_path = cached_files[0]
-        click.echo(f"Processing {archive_path.name}...")
 
-        # Determine output directory from pack structure
-        # Look for src/justmyresource_* directory
-        src_dir = pack_dir / "src"
-        if not src_dir.exists():
-            click.echo(f"Error: src/ directory not found in {pack_dir}", err=True)
-            sys.exit(1)
+@bench.command("serving")
+@click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--requests",
+    type=click.IntRange(min=1),
+    default=500,
+    help="Requests per scenario.",
+)
+@click.option(
+    "--rounds", type=click.IntRange(min=1), default=3, help="Rounds per scenario."
+)
+def bench_serving_cmd(pack_dir: Path, requests: int, rounds: int) -> None:
+    """Compare the CPU cost of serving icons over ASGI, gzipped or passed through.
+
+    Requires justmyresource to be installed alongside pack-tools.
 
-        output_dirs = [d for d in src_dir.iterdir() if d.is_dir() and d.name.startswith("justmyresource_")]
-        if not output_dirs:
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        requests: Number of requests per scenario.
+        rounds: Rounds per scenario; the cheapest is reported.
+    """
+    try:
+        click.echo(f"Benchmarking icon serving for {pack_dir.name}...")
+        results = bench_serving(pack_dir, requests=requests, rounds=rounds)
+        click.echo(
+            f"{'scenario':<18} {'requests':>8} {'CPU µs/req':>11} {'bytes/resp':>11}"
+        )
+        for result in results:
+            mean_bytes = result.response_bytes / result.requests
             click.echo(
-                f"Error: No justmyresource_* directory found in {src_dir}",
-                err=True,
+                f"{result.label:<18} {result.requests:>8} "
+                f"{result.cpu_us:>11.2f} {mean_bytes:>11,.0f}"
             )
-            sys.exit(1)
-        output_dir = output_dirs[0]
+    except Exception as e:
+        click.echo(f"Error benchmarking {pack_dir.name}: {e}", err=True)
+        sys.exit(1)
 
-        # Dynamically import and call per-pack bundler
-        build_module_name = config.build.module
-        build_entry_name = config.build.entry
 
-        # Load the build module
-        build_py = pack_dir / f"{build_module_name}.py"
-        if not build_py.exists():
-            click.echo(f"Error: {build_py} not found", err=True)
-            sys.exit(1)
+@bench.command("directory")
+@click.argument("pack_dir", type=click.Path(exists=True, file_okay=False, path_type=Path))
+@click.option(
+    "--lookups", type=click.IntRange(min=1), default=1000, help="Lookups per row."
+)
+@click.option("--rounds", type=click.IntRange(min=1), default=3, help="Rounds per row.")
+def bench_directory_cmd(pack_dir: Path, lookups: int, rounds: int) -> None:
+    """Compare the memory per icon of zipfile and the compact directory.
+
+    Requires justmyresource to be installed alongside pack-tools.
 
-        spec = importlib.util.spec_from_file_location(
-            f"{pack_dir.name}.{build_module_name}", build_py
+    Args:
+        pack_dir: Path to a built pack directory (e.g., packs/lucide/).
+        lookups: Number of lookups per representation.
+        rounds: Rounds of lookups; the fastest is reported.
+    """
+    try:
+        click.echo(f"Benchmarking directory memory for {pack_dir.name}...")
+        results = bench_directory(pack_dir, lookups=lookups, rounds=rounds)
+        click.echo(
+            f"{'directory':<18} {'names':>7} {'bytes':>11} "
+            f"{'bytes/icon':>11} {'µs/lookup':>10}"
         )
-        if spec is None or spec.loader is None:
-            click.echo(f"Error: Could not load {build_py}", err=True)
-            sys.exit(1)
+        for result in results:
+            click.echo(
+                f"{result.label:<18} {result.names:>7} {result.heap_bytes:>11,} "
+                f"{result.bytes_per_icon:>11.1f} {result.lookup_us:>10.2f}"
+            )
+    except Exception as e:
+        click.echo(f"Error benchmarking {pack_dir.name}: {e}", err=True)
+        sys.exit(1)
 
-        build_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(build_module)
 
-        # Get the extract function
-        if not hasattr(build_module, build_entry_name):
+@bench.command("startup")
+@click.argument(
+    "packs_dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default="packs",
+)
+@click.option(
+    "--runs", type=click.IntRange(min=1), default=5, help="Fresh interpreters per pack."
+)
+@click.option(
+    "--budget-ms",
+    type=click.FloatRange(min=0),
+    default=25.0,
+    show_default=True,
+    help="Maximum import + construction time per pack.",
+)
+def bench_startup_cmd(packs_dir: Path, runs: int, budget_ms: float) -> None:
+    """Measure and enforce each pack's cold import and construction time.
+
+    Fails if a pack exceeds the budget or opens any of its files while
+    get_resource_provider() runs. Requires justmyresource to be installed
+    alongside pack-tools.
+
+    Args:
+        packs_dir: Directory containing pack directories (default: packs/).
+        runs: Fresh interpreters per pack; the fastest run is reported.
+        budget_ms: Maximum import + construction time per pack.
+    """
+    failed = False
+    click.echo(f"{'pack':<20} {'import ms':>10} {'construct ms':>13} {'total ms':>9}")
+    for pack_dir in discover_packs(packs_dir):
+        try:
+            result = bench_startup(pack_dir, runs=runs)
+        except Exception as e:
+            click.echo(f"✗ {pack_dir.name}: {e}", err=True)
+            failed = True
+            continue
+        click.echo(
+            f"{result.pack:<20} {result.import_ms:>10.2f} "
+            f"{result.construct_ms:>13.3f} {result.total_ms:>9.2f}"
+        )
+        if result.total_ms > budget_ms:
+            click.echo(f"✗ {result.pack}: over the {budget_ms:g} ms budget", err=True)
+            failed = True
+        if result.opened:
             click.echo(
-                f"Error: {build_entry_name} not found in {build_py}",
+                f"✗ {result.pack}: get_resource_provider() opened "
+                f"{', '.join(result.opened)}",
                 err=True,
             )
-            sys.exit(1)
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+@main.group()
+def discovery() -> None:
+    """Manage the merged discovery index of installed packs."""
+    pass
 
-        extract_func = getattr(build_module, build_entry_name)
-
-        # Open archive and extract icons
-        with open_archive(archive_path) as archive:
-            entries = list(extract_func(archive, config))
-
-        # Create icons.zip
-        zip_path = output_dir / "icons.zip"
-        icon_count = create_icon_zip(iter(entries), zip_path)
-        click.echo(f"✓ Created {zip_path} with {icon_count} icons")
-
-        # Generate manifest
-        manifest_path = output_dir / "pack_manifest.json"
-        computed_sha256 = compute_sha256(archive_path)
-        generate_manifest(
-            upstream_toml_path=upstream_toml,
-            icon_count=icon_count,
-            variants=None,  # Read from config
-            output_path=manifest_path,
-            computed_sha256=computed_sha256,
-        )
-        click.echo(f"✓ Generated {manifest_path}")
 
-        # Generate README
-        generate_readme(pack_dir)
-        click.echo(f"✓ Generated {pack_dir / 'README.md'}")
+@discovery.command("build")
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index file (default: <prefix>/share/justmyresource/icons-discovery.idx).",
+)
+def discovery_build_cmd(output: Path | None) -> None:
+    """Index every installed pack built by pack-tools.
 
+    Args:
+        output: Index file to write; defaults to default_discovery_path().
+    """
+    try:
+        output = output or default_discovery_path()
+        packs = installed_packs(refresh=True)
+        entries = write_discovery_index(packs, output)
+        click.echo(f"✓ Indexed {entries} icons from {len(packs)} packs to {output}")
     except Exception as e:
-        click.echo(f"Error building {pack_dir.name}: {e}", err=True)
-        import traceback
+        click.echo(f"Error building discovery index: {e}", err=True)
+        sys.exit(1)
 
-        traceback.print_exc()
+
+@discovery.command("packs")
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Rescan entry points even if the snapshot is current.",
+)
+def discovery_packs_cmd(refresh: bool) -> None:
+    """List installed packs built by pack-tools.
+
+    Uses the installed-pack snapshot while it is current, and rewrites it
+    after a scan.
+
+    Args:
+        refresh: Rescan the entry points even if the snapshot is current.
+    """
+    try:
+        for pack in installed_packs(refresh=refresh):
+            click.echo(
+                f"{pack.name:<20} {pack.distribution} {pack.version} "
+                f"({pack.entry_point})"
+            )
+    except Exception as e:
+        click.echo(f"Error listing installed packs: {e}", err=True)
+        sys.exit(1)
+
+
+@discovery.command("lookup")
+@click.argument("name")
+@click.option(
+    "--index",
+    "index_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index file (default: <prefix>/share/justmyresource/icons-discovery.idx).",
+)
+def discovery_lookup_cmd(name: str, index_path: Path | None) -> None:
+    """Show which installed packs provide an icon.
+
+    Args:
+        name: Icon name, optionally with a variant and/or pack prefix.
+        index_path: Index file; defaults to default_discovery_path().
+    """
+    index = DiscoveryIndex.load(index_path)
+    if index is None:
+        click.echo(
+            "Error: Discovery index is missing or stale. "
+            "Run 'pack-tools discovery build' first.",
+            err=True,
+        )
+        sys.exit(1)
+    entries = index.lookup(name)
+    if not entries:
+        click.echo(f"Error: No installed pack provides {name!r}", err=True)
         sys.exit(1)
+    for entry in entries:
+        click.echo(f"{entry.pack}:{entry.path} ({entry.size:,} bytes)")
 
 
 @main.command()
@@ -74,6 +74,61 @@ class BuildConfig:
 
     module: str = "pack"
     entry: str = "extract"
+    name_aliases: str = "name_aliases"
+    """Optional function in the module yielding upstream name aliases."""
+
+
+@dataclass(frozen=True, slots=True)
+class OptimizeConfig:
+    """SVG optimisation configuration from upstream.toml [optimize] section."""
+
+    enabled: bool = False
+    precision: int = 3
+    strip_metadata: bool = True
+
+
+COMPRESSION_METHODS = ("stored", "deflate", "auto")
+"""Valid values for [compression] method."""
+
+
+@dataclass(frozen=True, slots=True)
+class CompressionConfig:
+    """icons.zip compression policy from upstream.toml [compression] section.
+
+    - "stored": no compression.
+    - "deflate": deflate every entry at `level`.
+    - "auto": deflate at `level`, but store entries smaller than `min_size`
+      bytes or whose compressed size exceeds `max_ratio` of the original.
+
+    With `dedupe`, byte-identical entries are stored once and the duplicates
+    are listed in icon_aliases.json.
+    """
+
+    method: str = "deflate"
+    level: int = 6
+    min_size: int = 128
+    max_ratio: float = 0.9
+    dedupe: bool = False
+
+
+ENCODINGS = ("gzip", "br", "zstd")
+"""Valid values for [encodings] formats, as HTTP Content-Encoding tokens."""
+
+
+@dataclass(frozen=True, slots=True)
+class EncodingsConfig:
+    """Precompressed HTTP encodings from upstream.toml [encodings] section.
+
+    When enabled, every icon is also compressed at maximum level in each of
+    `formats` and written to icons.encoded next to icons.zip. Formats whose
+    compressor is not installed ("br" needs the brotli package, "zstd" needs
+    Python 3.14's compression.zstd) are skipped.
+    """
+
+    enabled: bool = False
+    formats: tuple[str, ...] = ENCODINGS
+    workers: int = 0
+    """Encoding processes; 0 uses one per CPU."""
 
 
 @dataclass(frozen=True, slots=True)
@@ -84,6 +139,9 @@ class UpstreamConfig:
     license: LicenseConfig
     pack: PackConfig
     build: BuildConfig
+    optimize: OptimizeConfig = OptimizeConfig()
+    compression: CompressionConfig = CompressionConfig()
+    encodings: EncodingsConfig = EncodingsConfig()
 
     @classmethod
     def load(cls, upstream_toml_path: Path) -> UpstreamConfig:
@@ -142,7 +200,60 @@ class UpstreamConfig:
         build = BuildConfig(
             module=build_dict.get("module", "pack"),
             entry=build_dict.get("entry", "extract"),
+            name_aliases=build_dict.get("name_aliases", "name_aliases"),
+        )
+
+        optimize_dict = config.get("optimize", {})
+        optimize = OptimizeConfig(
+            enabled=optimize_dict.get("enabled", False),
+            precision=optimize_dict.get("precision", 3),
+            strip_metadata=optimize_dict.get("strip_metadata", True),
+        )
+
+        compression_dict = config.get("compression", {})
+        compression = CompressionConfig(
+            method=compression_dict.get("method", "deflate"),
+            level=compression_dict.get("level", 6),
+            min_size=compression_dict.get("min_size", 128),
+            max_ratio=compression_dict.get("max_ratio", 0.9),
+            dedupe=compression_dict.get("dedupe", False),
         )
 
-        return cls(source=source, license=license_config, pack=pack, build=build)
+        if compression.method not in COMPRESSION_METHODS:
+            raise ValueError(
+                f"Invalid [compression] method: {compression.method!r} "
+                f"(expected one of {', '.join(COMPRESSION_METHODS)})"
+            )
+        if not 0 <= compression.level <= 9:
+            raise ValueError(
+                f"Invalid [compression] level: {compression.level} (expected 0-9)"
+            )
+
+        encodings_dict = config.get("encodings", {})
+        encodings = EncodingsConfig(
+            enabled=encodings_dict.get("enabled", False),
+            formats=tuple(encodings_dict.get("formats", ENCODINGS)),
+            workers=encodings_dict.get("workers", 0),
+        )
+
+        unknown = [name for name in encodings.formats if name not in ENCODINGS]
+        if unknown:
+            raise ValueError(
+                f"Invalid [encodings] formats: {', '.join(map(repr, unknown))} "
+                f"(expected any of {', '.join(ENCODINGS)})"
+            )
+        if encodings.workers < 0:
+            raise ValueError(
+                f"Invalid [encodings] workers: {encodings.workers} (expected >= 0)"
+            )
+
+        return cls(
+            source=source,
+            license=license_config,
+            pack=pack,
+            build=build,
+            optimize=optimize,
+            compression=compression,
+            encodings=encodings,
+        )
 
@@ -0,0 +1,148 @@
+"""Merged discovery index over every installed icon pack: the writer.
+
+Finding which installed packs provide "home" otherwise means asking each
+pack in turn. The discovery index merges the icons.idx, icon_names.json and
+pack_manifest.json of every installed pack built by pack-tools into one
+file. Packs installed after the index was built are not detected; rebuild
+the index after installing packs.
+
+Registries read the index, and list installed packs through the snapshot,
+with the standard-library-only `_discovery.py` that is vendored into every
+pack next to `_runtime.py` (source: `runtime/_discovery.py`), so they never
+import pack-tools.
+
+Format (little-endian), version 1:
+
+- Header (24 bytes): magic ``b"JMRD"``, version (u16), reserved (u16), pack
+  count (u32), key count K (u32), entry count E (u32), length of the pack
+  table (u32).
+- Pack table: UTF-8 JSON list of pack records (see `write_discovery_index`).
+- Key starts: K + 1 u32; the entries of key ``i`` are
+  ``entries[starts[i]:starts[i + 1]]``.
+- Entries (24 bytes each): pack number (u16), compression method (u16),
+  offset of the entry's data within the pack's icons.zip (u64), compressed
+  size (u32), uncompressed size (u32), CRC-32 (u32).
+- Text: the K keys and the zip path of each of the E entries, UTF-8 and
+  joined by newlines.
+
+Keys are icon base names (no variant prefix or extension) and the base
+names of each pack's icon_names.json keys, so upstream aliases and
+alternative spellings are found too.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from justmyresource_pack_tools.index import INDEX_NAME, read_index, zip_stamp
+from justmyresource_pack_tools.names import NAMES_NAME
+from justmyresource_pack_tools.normalize import strip_extension
+from justmyresource_pack_tools.runtime._discovery import (
+    DISCOVERY_ENTRY,
+    DISCOVERY_HEADER,
+    DISCOVERY_MAGIC,
+    DISCOVERY_VERSION,
+    InstalledPack,
+    file_stamp,
+)
+from justmyresource_pack_tools.search import pack_u32
+
+
+def _base(key: str) -> str:
+    """Get the base name of a zip path or lookup key."""
+    return strip_extension(key).rpartition("/")[2]
+
+
+def write_discovery_index(packs: Iterable[InstalledPack], output_path: Path) -> int:
+    """Merge the indexes of several packs into one discovery index.
+
+    Args:
+        packs: Packs to include, in lookup priority order.
+        output_path: Path of the index file to write; parent directories
+            are created.
+
+    Returns:
+        Number of entries written.
+
+    Raises:
+        ValueError: If a pack has no usable icons.idx, or a path contains
+            a newline.
+    """
+    pack_table: list[dict[str, Any]] = []
+    by_key: dict[str, set[tuple[int, bool, str]]] = {}
+    records: list[dict[str, tuple[int, int, int, int, int]]] = []
+    for number, pack in enumerate(packs):
+        manifest_path = pack.manifest_path
+        archive_path = pack.package_dir / "icons.zip"
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        pack_data = manifest.get("pack", {})
+        stamp, pack_records = read_index(pack.package_dir / INDEX_NAME)
+        if stamp != zip_stamp(archive_path):
+            raise ValueError(f"{pack.name}: icons.idx does not match icons.zip")
+        records.append(pack_records)
+        pack_table.append(
+            {
+                "name": pack.name,
+                "distribution": pack.distribution,
+                "version": pack.version,
+                "package": pack.package,
+                "archive": str(archive_path),
+                "prefixes": pack_data.get("prefixes", []),
+                "default_variant": pack_data.get("default_variant", ""),
+                "stamps": {
+                    "manifest": [str(manifest_path), *file_stamp(manifest_path)],
+                    "archive": [str(archive_path), *file_stamp(archive_path)],
+                },
+            }
+        )
+
+        default_prefix = f"{pack_data.get('default_variant', '')}/"
+        names_path = pack.package_dir / NAMES_NAME
+        names: dict[str, str] = {}
+        if names_path.is_file():
+            names = json.loads(names_path.read_text(encoding="utf-8")).get("names", {})
+        keyed = [(_base(path), path) for path in pack_records]
+        keyed += [(_base(key), path) for key, path in names.items()]
+        for key, path in keyed:
+            if path in pack_records:
+                entry = (number, not path.startswith(default_prefix), path)
+                by_key.setdefault(key, set()).add(entry)
+
+    keys = sorted(by_key)
+    starts = [0]
+    body = bytearray()
+    paths: list[str] = []
+    for key in keys:
+        for number, _, path in sorted(by_key[key]):
+            if "\n" in path or "\n" in key:
+                raise ValueError(f"Cannot index path containing a newline: {path!r}")
+            method, offset, compress_size, size, crc = records[number][path]
+            body += DISCOVERY_ENTRY.pack(
+                number, method, offset, compress_size, size, crc
+            )
+            paths.append(path)
+        starts.append(len(paths))
+
+    table = json.dumps(pack_table, separators=(",", ":")).encode("utf-8")
+    header = DISCOVERY_HEADER.pack(
+        DISCOVERY_MAGIC,
+        DISCOVERY_VERSION,
+        0,
+        len(pack_table),
+        len(keys),
+        len(paths),
+        len(table),
+    )
+    text = "\n".join([*keys, *paths]).encode("utf-8")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_bytes(header + table + pack_u32(starts) + body + text)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(paths)
@@ -0,0 +1,192 @@
+"""Precompressed HTTP encodings of every icon, written next to icons.zip.
+
+CDN origins serving icons would otherwise compress each response again.
+When [encodings] is enabled, the build compresses every icon once, at the
+maximum level of each format, in a process pool, and writes the results to
+icons.encoded. The pack runtime's `get_encoded()` returns them with one
+seek and read.
+
+Format (little-endian), version 2:
+
+- Header (24 bytes): magic ``b"JMRE"``, version (u16), encoding count E
+  (u16), path count P (u32), length of the text section (u32),
+  `index.zip_stamp()` of the icons.zip it describes (u64).
+- Text: the E encoding names and the P paths (sorted, including
+  deduplicated aliases), UTF-8 and joined by newlines.
+- Records: P x E (offset u64, length u32) pairs, path-major; offsets are
+  relative to the start of the data section.
+- Data: the encoded bodies, back to back. Aliases share the bodies of the
+  path they alias.
+
+The reader lives in the vendored runtime (`runtime/_runtime.py`) and must
+be kept in step with this module.
+"""
+
+from __future__ import annotations
+
+import functools
+import gzip
+import os
+import struct
+import zipfile
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from justmyresource_pack_tools.index import zip_stamp
+
+ENCODED_NAME = "icons.encoded"
+"""File written next to icons.zip."""
+
+ENCODED_MAGIC = b"JMRE"
+ENCODED_VERSION = 2
+ENCODED_HEADER = struct.Struct("<4sHHIIQ")
+ENCODED_RECORD = struct.Struct("<QI")
+
+BATCH_SIZE = 1024
+"""Icons read from icons.zip and handed to the pool at a time."""
+
+
+@functools.cache
+def get_compressor(encoding: str) -> Callable[[bytes], bytes] | None:
+    """Get the maximum-level compressor of an HTTP content coding.
+
+    Args:
+        encoding: "gzip", "br" or "zstd".
+
+    Returns:
+        Function compressing bytes, or None if its library is not installed.
+
+    Raises:
+        ValueError: If the encoding is not supported.
+    """
+    if encoding == "gzip":
+        # mtime=0 keeps the output reproducible
+        return functools.partial(gzip.compress, compresslevel=9, mtime=0)
+    if encoding == "br":
+        try:
+            import brotli  # type: ignore[import-not-found]
+        except ImportError:
+            return None
+        return functools.partial(brotli.compress, quality=11)
+    if encoding == "zstd":
+        try:
+            from compression import zstd  # type: ignore[import-not-found]
+        except ImportError:
+            return None
+        level = zstd.CompressionParameter.compression_level.bounds()[1]
+        return functools.partial(zstd.compress, level=level)
+    raise ValueError(f"Unsupported encoding: {encoding!r}")
+
+
+def available_encodings(encodings: Iterable[str]) -> list[str]:
+    """Filter encodings down to those whose compressor is installed.
+
+    Args:
+        encodings: Requested encodings.
+
+    Returns:
+        The installed ones, in request order.
+    """
+    return [name for name in encodings if get_compressor(name) is not None]
+
+
+def encode_content(content: bytes, encodings: tuple[str, ...]) -> list[bytes]:
+    """Compress one icon in several encodings; runs in the pool's workers.
+
+    Args:
+        content: Icon content.
+        encodings: Encodings to produce, all installed.
+
+    Returns:
+        One body per encoding, in order.
+
+    Raises:
+        ValueError: If an encoding's compressor is not installed.
+    """
+    bodies = []
+    for encoding in encodings:
+        compress = get_compressor(encoding)
+        if compress is None:
+            raise ValueError(f"No compressor installed for {encoding!r}")
+        bodies.append(compress(content))
+    return bodies
+
+
+def write_encoded(
+    zip_path: Path,
+    encodings: Iterable[str],
+    output_path: Path,
+    aliases: dict[str, str] | None = None,
+    workers: int | None = None,
+) -> int:
+    """Write every icon of a built icons.zip in each encoding.
+
+    Args:
+        zip_path: Path to the built icons.zip.
+        encodings: Encodings to produce, all installed (see
+            available_encodings()).
+        output_path: Path of the file to write.
+        aliases: Deduplication alias table; aliases share their target's
+            bodies.
+        workers: Number of encoding processes; None uses one per CPU.
+
+    Returns:
+        Total size of the encoded bodies in bytes.
+
+    Raises:
+        ValueError: If a path contains a newline.
+    """
+    encodings = tuple(encodings)
+    aliases = aliases or {}
+    with zipfile.ZipFile(zip_path, "r") as zip_file:
+        stored = sorted(name for name in zip_file.namelist() if not name.endswith("/"))
+    paths = sorted([*stored, *aliases])
+    for path in paths:
+        if "\n" in path:
+            raise ValueError(f"Cannot index path containing a newline: {path!r}")
+    text = "\n".join([*encodings, *paths]).encode("utf-8")
+    header = ENCODED_HEADER.pack(
+        ENCODED_MAGIC,
+        ENCODED_VERSION,
+        len(encodings),
+        len(paths),
+        len(text),
+        zip_stamp(zip_path),
+    )
+
+    records: dict[str, bytes] = {}
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        with (
+            open(tmp_path, "wb") as out,
+            zipfile.ZipFile(zip_path, "r") as zip_file,
+            ProcessPoolExecutor(max_workers=workers) as pool,
+        ):
+            out.write(header + text)
+            table_offset = out.tell()
+            # Records are filled in once every body's offset is known
+            out.write(bytes(len(paths) * len(encodings) * ENCODED_RECORD.size))
+            data_offset = out.tell()
+            for start in range(0, len(stored), BATCH_SIZE):
+                batch = stored[start : start + BATCH_SIZE]
+                contents = [zip_file.read(path) for path in batch]
+                results = pool.map(
+                    encode_content, contents, repeat(encodings), chunksize=32
+                )
+                for path, bodies in zip(batch, results, strict=True):
+                    record = bytearray()
+                    for body in bodies:
+                        record += ENCODED_RECORD.pack(
+                            out.tell() - data_offset, len(body)
+                        )
+                        out.write(body)
+                    records[path] = bytes(record)
+            data_size = out.tell() - data_offset
+            out.seek(table_offset)
+            out.write(b"".join(records[aliases.get(path, path)] for path in paths))
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return data_size
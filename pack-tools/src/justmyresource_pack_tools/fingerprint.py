@@ -0,0 +1,105 @@
+"""Build fingerprints for incremental pack builds.
+
+A fingerprint is a SHA-256 over everything that determines the output of
+`pack-tools build` for a pack: the upstream archive checksum, the per-pack
+bundler source, the parsed upstream.toml and the pack-tools version and
+source. It is stored in pack_manifest.json so that an unchanged pack can be
+skipped without opening the archive.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+
+from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.download import compute_sha256
+
+FINGERPRINT_VERSION = 1
+"""Bump to invalidate every stored fingerprint when the scheme changes."""
+
+
+def get_pack_tools_version() -> str:
+    """Get the installed pack-tools version.
+
+    Returns:
+        Version string, or "unknown" if pack-tools is not installed.
+    """
+    try:
+        return version("justmyresource-pack-tools")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _hash_pack_tools_source() -> str:
+    """Hash the pack-tools source files.
+
+    Editable installs keep the same version while the code changes, so the
+    source is hashed as well as the version.
+
+    Returns:
+        SHA-256 hex digest over all pack-tools modules and templates.
+    """
+    package_dir = Path(__file__).parent
+    sha256_hash = hashlib.sha256()
+    for path in sorted(package_dir.rglob("*")):
+        if path.suffix not in (".py", ".j2") or "__pycache__" in path.parts:
+            continue
+        sha256_hash.update(path.relative_to(package_dir).as_posix().encode())
+        sha256_hash.update(path.read_bytes())
+    return sha256_hash.hexdigest()
+
+
+def compute_fingerprint(
+    pack_dir: Path,
+    config: UpstreamConfig,
+    archive_path: Path,
+    options: dict[str, Any] | None = None,
+) -> str:
+    """Compute the build fingerprint for a pack.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        config: Parsed upstream configuration.
+        archive_path: Path to the cached upstream archive. Only hashed when
+            upstream.toml does not pin a sha256.
+        options: Build options that change the output (e.g., reproducible).
+
+    Returns:
+        SHA-256 hex digest identifying the build inputs.
+    """
+    build_py = pack_dir / f"{config.build.module}.py"
+    inputs = {
+        "fingerprint_version": FINGERPRINT_VERSION,
+        "archive_sha256": config.source.sha256 or compute_sha256(archive_path),
+        "archive_name": archive_path.name,
+        "bundler_sha256": compute_sha256(build_py) if build_py.exists() else "",
+        "config": dataclasses.asdict(config),
+        "pack_tools_version": get_pack_tools_version(),
+        "pack_tools_sha256": _hash_pack_tools_source(),
+        "options": options or {},
+    }
+    encoded = json.dumps(inputs, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def read_fingerprint(manifest_path: Path) -> str | None:
+    """Read the build fingerprint stored in an existing pack_manifest.json.
+
+    Args:
+        manifest_path: Path to pack_manifest.json.
+
+    Returns:
+        Stored fingerprint, or None if the manifest is missing or has none.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    fingerprint = manifest.get("pack", {}).get("build_fingerprint")
+    return fingerprint if isinstance(fingerprint, str) else None
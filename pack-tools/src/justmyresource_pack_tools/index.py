@@ -0,0 +1,194 @@
+"""Binary name → offset index written next to icons.zip.
+
+Opening icons.zip with `zipfile` parses the whole central directory and
+builds a `ZipInfo` per entry before the first lookup. The index lets the
+pack runtime find one entry with a binary search over a flat buffer and read
+its compressed bytes with a single seek, without touching the central
+directory.
+
+Format (little-endian), version 2:
+
+- Header (20 bytes): magic ``b"JMRI"``, version (u16), reserved (u16),
+  entry count (u32), zip_stamp() of the icons.zip it describes (u64).
+- Records (28 bytes each, sorted by UTF-8 name): name offset (u32) and
+  length (u16) into the name table, compression method (u16), offset of the
+  entry's compressed data within icons.zip (u64), compressed size (u32),
+  uncompressed size (u32), CRC-32 (u32).
+- Name table: UTF-8 names concatenated in record order.
+
+Deduplicated aliases get their own record pointing at the stored entry's
+data. The reader lives in the vendored runtime (`runtime/_runtime.py`) and
+must be kept in step with this module.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+INDEX_NAME = "icons.idx"
+"""File written next to icons.zip."""
+
+INDEX_MAGIC = b"JMRI"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<4sHHIQ")
+INDEX_RECORD = struct.Struct("<IHHQIII")
+
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+_LOCAL_HEADER_MAGIC = b"PK\x03\x04"
+
+_END_RECORD = struct.Struct("<4s4H2IH")
+_END_RECORD_MAGIC = b"PK\x05\x06"
+
+
+def zip_stamp(zip_path: Path) -> int:
+    """Fingerprint an icons.zip for the artifacts written next to it.
+
+    The central directory records every entry's name, CRC-32, sizes and
+    offset, so its CRC-32 changes whenever the content does, even if a
+    rebuild happens to produce a zip of the same size. The stamp is that
+    CRC-32 in the high 32 bits and the low 32 bits of the file size.
+
+    Args:
+        zip_path: Path to the zip.
+
+    Returns:
+        Stamp stored in the header of each sidecar.
+
+    Raises:
+        ValueError: If the file has no end of central directory record.
+    """
+    with open(zip_path, "rb") as f:
+        size = f.seek(0, 2)
+        tail_size = min(size, _END_RECORD.size + 0xFFFF)
+        f.seek(size - tail_size)
+        tail = f.read(tail_size)
+        end = tail.rfind(_END_RECORD_MAGIC)
+        if end < 0 or len(tail) - end < _END_RECORD.size:
+            raise ValueError(f"{zip_path} is not a zip file")
+        # Zip64 archives clamp the offset to 0xFFFFFFFF; the runtime clamps
+        # it the same way, so the stamps still agree
+        f.seek(min(_END_RECORD.unpack_from(tail, end)[6], size))
+        return (zlib.crc32(f.read()) << 32) | (size & 0xFFFFFFFF)
+
+
+def _data_offset(fp: BinaryIO, info: zipfile.ZipInfo) -> int:
+    """Find where an entry's compressed data starts.
+
+    The local header's extra field can differ from the central directory's,
+    so its length is read from the local header itself.
+
+    Args:
+        fp: The zip file, opened for binary reading.
+        info: Entry to locate.
+
+    Returns:
+        Absolute offset of the compressed data.
+
+    Raises:
+        ValueError: If the local header is malformed.
+    """
+    fp.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(fp.read(_LOCAL_HEADER.size))
+    if header[0] != _LOCAL_HEADER_MAGIC:
+        raise ValueError(f"Bad local header for {info.filename}")
+    name_length, extra_length = header[-2], header[-1]
+    return int(info.header_offset + _LOCAL_HEADER.size + name_length + extra_length)
+
+
+def write_index(
+    zip_path: Path, output_path: Path, aliases: dict[str, str] | None = None
+) -> int:
+    """Write the binary index for a built icons.zip.
+
+    Args:
+        zip_path: Path to the icons.zip to index.
+        output_path: Path of the index file to write.
+        aliases: Optional alias path → stored path table from a deduplicating
+            build; each alias is indexed with its stored entry's record.
+
+    Returns:
+        Number of names in the index, including aliases.
+
+    Raises:
+        ValueError: If the zip uses a method the runtime cannot read, or an
+            alias points at a missing entry.
+    """
+    records: dict[str, tuple[int, int, int, int, int]] = {}
+    with open(zip_path, "rb") as fp, zipfile.ZipFile(fp, "r") as zip_file:
+        for info in zip_file.infolist():
+            if info.is_dir():
+                continue
+            if info.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+                raise ValueError(
+                    f"Cannot index {info.filename}: "
+                    f"unsupported compression method {info.compress_type}"
+                )
+            records[info.filename] = (
+                info.compress_type,
+                _data_offset(fp, info),
+                info.compress_size,
+                info.file_size,
+                info.CRC,
+            )
+    for alias, stored_path in (aliases or {}).items():
+        if stored_path not in records:
+            raise ValueError(f"Alias {alias} points at missing entry {stored_path}")
+        records[alias] = records[stored_path]
+
+    encoded = sorted((name.encode("utf-8"), record) for name, record in records.items())
+    names = bytearray()
+    body = bytearray()
+    for name, (method, offset, compress_size, file_size, crc) in encoded:
+        body += INDEX_RECORD.pack(
+            len(names), len(name), method, offset, compress_size, file_size, crc
+        )
+        names += name
+    header = INDEX_HEADER.pack(
+        INDEX_MAGIC, INDEX_VERSION, 0, len(encoded), zip_stamp(zip_path)
+    )
+
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_bytes(header + body + names)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(encoded)
+
+
+def read_index(
+    index_path: Path,
+) -> tuple[int, dict[str, tuple[int, int, int, int, int]]]:
+    """Read an index written by write_index().
+
+    Args:
+        index_path: Path to icons.idx.
+
+    Returns:
+        (zip_stamp() of the icons.zip it describes, mapping of zip path to
+        (method, data offset, compressed size, size, CRC-32)).
+
+    Raises:
+        ValueError: If the file is not a supported index.
+    """
+    data = index_path.read_bytes()
+    if len(data) < INDEX_HEADER.size:
+        raise ValueError(f"{index_path} is truncated")
+    magic, version, _, count, stamp = INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        raise ValueError(f"{index_path} is not a supported index")
+    names_offset = INDEX_HEADER.size + count * INDEX_RECORD.size
+    records: dict[str, tuple[int, int, int, int, int]] = {}
+    for i in range(count):
+        name_offset, name_length, method, offset, compress_size, file_size, crc = (
+            INDEX_RECORD.unpack_from(data, INDEX_HEADER.size + i * INDEX_RECORD.size)
+        )
+        start = names_offset + name_offset
+        name = data[start : start + name_length].decode("utf-8")
+        records[name] = (method, offset, compress_size, file_size, crc)
+    return stamp, records
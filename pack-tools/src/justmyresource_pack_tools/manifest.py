@@ -7,11 +7,13 @@ and extracted content metadata.
 from __future__ import annotations
 
 import json
+import os
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.repack import ZIP_EPOCH
 
 
 def generate_manifest(
@@ -20,6 +22,10 @@ def generate_manifest(
     variants: list[str] | None = None,
     output_path: Path | None = None,
     computed_sha256: str | None = None,
+    build_fingerprint: str | None = None,
+    optimization: dict[str, Any] | None = None,
+    deduplication: dict[str, Any] | None = None,
+    reproducible: bool = False,
 ) -> dict[str, Any]:
     """Generate pack_manifest.json from upstream.toml and pack metadata.
 
@@ -29,6 +35,13 @@ def generate_manifest(
         variants: Optional list of variant names. If None, reads from upstream.toml [pack].variants.
         output_path: Optional path to write manifest JSON file.
         computed_sha256: Computed SHA-256 of the downloaded archive.
+        build_fingerprint: Optional fingerprint of the build inputs, used by
+            `pack-tools build` to skip unchanged packs.
+        optimization: Optional SVG optimisation summary (settings and
+            before/after byte counts), stored under contents.optimization.
+        deduplication: Optional content deduplication summary (alias and
+            stored entry counts), stored under contents.deduplication.
+        reproducible: Use a fixed build timestamp (see get_build_timestamp()).
 
     Returns:
         Dictionary containing the manifest data.
@@ -55,15 +68,16 @@ def generate_manifest(
             if len(repo_part) == 2:
                 upstream_repo = f"https://github.com/{'/'.join(repo_part)}"
 
-    manifest = {
+    manifest: dict[str, Any] = {
         "pack": {
             "name": pack_name,
             "version": config.source.tag,
             "upstream_repo": upstream_repo,
             "upstream_tag": config.source.tag,
             "upstream_license": config.license.spdx,
-            "build_timestamp": get_build_timestamp(),
+            "build_timestamp": get_build_timestamp(reproducible),
             "sha256_archive": sha256,
+            "build_fingerprint": build_fingerprint or "",
             # Include pack metadata for runtime access
             "prefixes": config.pack.prefixes,
             "description": config.pack.description,
@@ -82,6 +96,11 @@ def generate_manifest(
         },
     }
 
+    if optimization is not None:
+        manifest["contents"]["optimization"] = optimization
+    if deduplication is not None:
+        manifest["contents"]["deduplication"] = deduplication
+
     if output_path:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         with open(output_path, "w", encoding="utf-8") as f:
@@ -90,12 +109,26 @@ def generate_manifest(
     return manifest
 
 
-def get_build_timestamp() -> str:
-    """Get current timestamp in ISO 8601 format.
+def get_build_timestamp(reproducible: bool = False) -> str:
+    """Get the build timestamp in ISO 8601 format.
+
+    Uses SOURCE_DATE_EPOCH if set (for reproducible builds). Otherwise
+    reproducible builds use the 1980-01-01 zip epoch that their icons.zip
+    entries carry, and other builds the current time.
+
+    Args:
+        reproducible: Never fall back to the current time.
 
     Returns:
         ISO 8601 timestamp string (e.g., "2026-02-16T12:00:00Z").
     """
-    return datetime.now(UTC).isoformat().replace("+00:00", "Z")
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if source_date_epoch:
+        timestamp = datetime.fromtimestamp(int(source_date_epoch), UTC)
+    elif reproducible:
+        timestamp = datetime(*ZIP_EPOCH, tzinfo=UTC)
+    else:
+        timestamp = datetime.now(UTC)
+    return timestamp.isoformat().replace("+00:00", "Z")
 
 
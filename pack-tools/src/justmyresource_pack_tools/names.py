@@ -0,0 +1,148 @@
+"""Build-time name table for O(1) name resolution at runtime.
+
+Callers spell icon names in many ways: "arrow_down", "arrowDown",
+"ArrowDown.svg", an upstream alias such as "home" for "house", or a name
+without the weight suffix some upstreams put in file names. The runtime maps
+any such spelling to a lookup key with `name_key()` and probes the table
+written here once; a miss falls back to the pack's `_normalize_name()`.
+
+The table only stores keys the fallback cannot resolve by itself, so it
+stays small:
+
+- canonical names that `name_key()` does not leave unchanged,
+- bare names that only exist outside the default variant (e.g. Font Awesome
+  brands), and
+- upstream aliases yielded by the pack's extract() or its optional alias
+  hook.
+
+`name_key()` is duplicated in the vendored runtime (`runtime/_runtime.py`)
+and the two must stay identical.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from justmyresource_pack_tools.normalize import strip_extension, to_kebab_case
+
+NAMES_NAME = "icon_names.json"
+"""File written next to icons.zip."""
+
+
+class NameAlias(NamedTuple):
+    """Additional spelling of an icon, yielded by extract() or the alias hook."""
+
+    alias: str
+    """Accepted name, without extension (e.g., "home" or "bold/arrow-right")."""
+    target: str
+    """Name it resolves to, without extension (e.g., "house").
+
+    A target without a variant prefix applies to every variant containing an
+    icon of that name, and the alias gets the same prefix.
+    """
+
+
+def name_key(name: str) -> str:
+    """Reduce a user-supplied name to its lookup key.
+
+    Args:
+        name: Resource name in any supported spelling.
+
+    Returns:
+        kebab-case name without the .svg extension.
+    """
+    if name.endswith(".svg"):
+        name = name[:-4]
+    return to_kebab_case(name)
+
+
+def _split(stem: str) -> tuple[str, str]:
+    """Split a name into its variant prefix and base name.
+
+    Args:
+        stem: Zip path without extension (e.g., "24/outline/home").
+
+    Returns:
+        (variant, base name); variant is "" for unprefixed names.
+    """
+    variant, _, base = stem.rpartition("/")
+    return variant, base
+
+
+def build_name_table(
+    paths: Iterable[str],
+    default_variant: str = "",
+    aliases: Iterable[NameAlias] = (),
+) -> dict[str, str]:
+    """Compute the lookup key → zip path table for a pack.
+
+    Canonical names always win over aliases, and an alias never replaces a
+    key already in the table.
+
+    Args:
+        paths: Every zip path in the pack, including deduplicated aliases.
+        default_variant: Variant that bare names resolve to ("" if none).
+        aliases: Upstream aliases from the pack's alias hook.
+
+    Returns:
+        Mapping of lookup key to zip path.
+    """
+    by_stem: dict[str, str] = {}
+    by_base: dict[str, list[str]] = {}
+    for path in sorted(paths):
+        stem = strip_extension(path)
+        by_stem[stem] = path
+        by_base.setdefault(_split(stem)[1], []).append(stem)
+
+    table: dict[str, str] = {}
+
+    def add(key: str, path: str) -> None:
+        if key not in by_stem and key not in table:
+            table[key] = path
+
+    for stem, path in by_stem.items():
+        key = name_key(stem)
+        if key != stem:
+            add(key, path)
+
+    # Bare names resolve to the default variant; an icon that only exists in
+    # one other variant (e.g. brands/github) is reachable bare as well
+    for base, stems in by_base.items():
+        if default_variant and f"{default_variant}/{base}" in by_stem:
+            continue
+        prefixed = [stem for stem in stems if "/" in stem]
+        if len(prefixed) == 1:
+            add(name_key(base), by_stem[prefixed[0]])
+
+    for alias, target in aliases:
+        if "/" in target:
+            if target in by_stem:
+                add(name_key(alias), by_stem[target])
+            continue
+        for stem in by_base.get(target, []):
+            variant, _ = _split(stem)
+            if variant:
+                add(name_key(f"{variant}/{alias}"), by_stem[stem])
+            if variant == default_variant or len(by_base[target]) == 1:
+                add(name_key(alias), by_stem[stem])
+    return table
+
+
+def write_name_table(table: dict[str, str], output_path: Path) -> None:
+    """Write a name table produced by build_name_table().
+
+    Args:
+        table: Mapping of lookup key to zip path.
+        output_path: Path of the JSON file to write.
+    """
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "names": dict(sorted(table.items()))}, f, indent=0)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,356 @@
+"""Pure-Python SVG optimisation for icon packs.
+
+This module implements the optional optimisation stage that runs between a
+pack's bundler and `create_icon_zip`. It is deliberately conservative: it only
+applies transformations that cannot change how an icon renders.
+
+- Comments, processing instructions, the XML declaration and DOCTYPE are
+  dropped, and whitespace-only text between elements is removed.
+- Editor metadata (`<metadata>`, Inkscape/Sodipodi/Illustrator/Sketch
+  elements and attributes) and the root `version`/`baseProfile` attributes
+  are removed.
+- Coordinates in path data, `points`, `transform` and geometry attributes
+  are rounded to a fixed number of decimal places.
+- The document is re-serialised in a canonical form (double quotes, default
+  SVG namespace, no redundant namespace declarations).
+
+An icon that cannot be parsed, or that would not get smaller, is passed
+through unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+import xml.etree.ElementTree as ET
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from justmyresource_pack_tools.config import OptimizeConfig
+from justmyresource_pack_tools.repack import ZipEntry
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+EDITOR_NAMESPACES = frozenset(
+    {
+        "http://www.inkscape.org/namespaces/inkscape",
+        "http://sodipodi.sourceforge.net/DTD/sodipodi-0.dtd",
+        "http://ns.adobe.com/AdobeIllustrator/10.0/",
+        "http://ns.adobe.com/Extensibility/1.0/",
+        "http://ns.adobe.com/Graphs/1.0/",
+        "http://ns.adobe.com/SaveForWeb/1.0/",
+        "http://ns.adobe.com/Variables/1.0/",
+        "http://www.bohemiancoding.com/sketch/ns",
+        "http://purl.org/dc/elements/1.1/",
+        "http://creativecommons.org/ns#",
+        "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    }
+)
+"""Namespaces whose elements and attributes only carry editor state."""
+
+ROOT_REDUNDANT_ATTRIBUTES = frozenset({"version", "baseProfile"})
+"""Attributes of the root <svg> element that browsers ignore."""
+
+NUMERIC_ATTRIBUTES = frozenset(
+    {
+        "x",
+        "y",
+        "x1",
+        "y1",
+        "x2",
+        "y2",
+        "cx",
+        "cy",
+        "r",
+        "rx",
+        "ry",
+        "fx",
+        "fy",
+        "stroke-width",
+        "points",
+        "transform",
+        "gradientTransform",
+        "patternTransform",
+    }
+)
+"""Attributes whose numbers can be rounded with a plain number regex."""
+
+TEXT_ELEMENTS = frozenset({"text", "tspan", "textPath"})
+"""Elements whose whitespace-only text is significant."""
+
+_NUMBER = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_PATH_COMMANDS = frozenset("MmZzLlHhVvCcSsQqTtAa")
+_PATH_SEPARATORS = frozenset(" ,\t\n\r\f")
+
+ET.register_namespace("", SVG_NS)
+ET.register_namespace("xlink", XLINK_NS)
+
+
+@dataclass(slots=True)
+class OptimizeStats:
+    """Byte counts collected while optimising a pack."""
+
+    files: int = 0
+    """Number of SVG files seen."""
+    skipped: int = 0
+    """Number of files passed through unchanged (unparseable or no gain)."""
+    bytes_before: int = 0
+    """Total size of the SVGs before optimisation."""
+    bytes_after: int = 0
+    """Total size of the SVGs after optimisation."""
+
+    def to_manifest(self, config: OptimizeConfig) -> dict[str, Any]:
+        """Summarise the stats for pack_manifest.json.
+
+        Args:
+            config: Optimisation settings used for the build.
+
+        Returns:
+            Dictionary for the manifest "contents.optimization" field.
+        """
+        return {
+            "precision": config.precision,
+            "strip_metadata": config.strip_metadata,
+            "files": self.files,
+            "skipped": self.skipped,
+            "bytes_before": self.bytes_before,
+            "bytes_after": self.bytes_after,
+        }
+
+
+def format_number(token: str, precision: int) -> str:
+    """Round a number token and write it in its shortest form.
+
+    Integers are returned unchanged. Decimals are rounded to `precision`
+    places with trailing zeros and the leading zero removed (e.g. "0.5000"
+    becomes ".5").
+
+    Args:
+        token: Number as it appears in the SVG.
+        precision: Decimal places to keep; negative keeps full precision.
+
+    Returns:
+        Shortest equivalent representation of the rounded number.
+    """
+    if precision < 0 or not any(c in token for c in ".eE"):
+        return token
+    text = f"{round(float(token), precision):.{precision}f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    if text in ("-0", ""):
+        return "0"
+    if text.startswith("0."):
+        return text[1:]
+    if text.startswith("-0."):
+        return "-" + text[2:]
+    return text
+
+
+def _join_path_tokens(tokens: list[tuple[str, str]]) -> str:
+    """Join path tokens using the fewest separators that parse unambiguously.
+
+    Args:
+        tokens: (kind, text) tuples where kind is "cmd", "num" or "flag".
+
+    Returns:
+        Path data string.
+    """
+    parts: list[str] = []
+    prev_kind = "cmd"
+    prev_text = ""
+    for kind, text in tokens:
+        if kind != "cmd" and prev_kind != "cmd":
+            needs_separator = not (
+                kind == "num"
+                and prev_kind == "num"
+                and (
+                    text.startswith("-")
+                    or (text.startswith(".") and any(c in prev_text for c in ".eE"))
+                )
+            )
+            if needs_separator:
+                parts.append(" ")
+        parts.append(text)
+        prev_kind, prev_text = kind, text
+    return "".join(parts)
+
+
+def round_path_data(d: str, precision: int) -> str:
+    """Round the coordinates in SVG path data.
+
+    Arc flags are tokenised as single characters, as the SVG grammar
+    requires, so compacted arcs such as "a1 1 0 011 1" survive intact.
+
+    Args:
+        d: Value of a path's `d` attribute.
+        precision: Decimal places to keep; negative keeps full precision.
+
+    Returns:
+        Rounded path data, or `d` unchanged if it cannot be tokenised.
+    """
+    tokens: list[tuple[str, str]] = []
+    command = ""
+    arg_index = 0
+    i = 0
+    while i < len(d):
+        c = d[i]
+        if c in _PATH_SEPARATORS:
+            i += 1
+            continue
+        if c.isalpha():
+            if c not in _PATH_COMMANDS:
+                return d
+            command = c
+            arg_index = 0
+            tokens.append(("cmd", c))
+            i += 1
+            continue
+        if command in ("A", "a") and arg_index % 7 in (3, 4):
+            if c not in "01":
+                return d
+            tokens.append(("flag", c))
+            arg_index += 1
+            i += 1
+            continue
+        match = _NUMBER.match(d, i)
+        if match is None:
+            return d
+        tokens.append(("num", format_number(match.group(), precision)))
+        arg_index += 1
+        i = match.end()
+    return _join_path_tokens(tokens)
+
+
+def _round_numbers(value: str, precision: int) -> str:
+    """Round every number in an attribute value.
+
+    Args:
+        value: Attribute value (e.g. a points list or transform).
+        precision: Decimal places to keep.
+
+    Returns:
+        Value with rounded numbers.
+    """
+    return _NUMBER.sub(lambda m: format_number(m.group(), precision), value)
+
+
+def _namespace(name: str) -> str:
+    """Get the namespace URI of an ElementTree tag or attribute name.
+
+    Args:
+        name: Name in "{uri}local" or "local" form.
+
+    Returns:
+        Namespace URI, or "" for unqualified names.
+    """
+    if name.startswith("{"):
+        return name[1:].split("}", 1)[0]
+    return ""
+
+
+def _local_name(name: str) -> str:
+    """Strip the namespace from an ElementTree tag or attribute name.
+
+    Args:
+        name: Name in "{uri}local" or "local" form.
+
+    Returns:
+        Local part of the name.
+    """
+    return name.rsplit("}", 1)[-1]
+
+
+def _clean(element: ET.Element, config: OptimizeConfig) -> None:
+    """Optimise an element and its descendants in place.
+
+    Args:
+        element: Element to optimise.
+        config: Optimisation settings.
+    """
+    # ET.fromstring() drops comments and processing instructions, so every
+    # child has a str tag
+    for child in list(element):
+        if config.strip_metadata and (
+            _namespace(child.tag) in EDITOR_NAMESPACES
+            or _local_name(child.tag) == "metadata"
+        ):
+            element.remove(child)
+            continue
+        _clean(child, config)
+
+    for name, value in list(element.attrib.items()):
+        if config.strip_metadata and _namespace(name) in EDITOR_NAMESPACES:
+            del element.attrib[name]
+        elif name == "d":
+            element.attrib[name] = round_path_data(value, config.precision)
+        elif name in NUMERIC_ATTRIBUTES:
+            element.attrib[name] = _round_numbers(value, config.precision)
+
+    # Whitespace-only text between elements is insignificant, except inside
+    # text content elements where it separates words
+    if _local_name(element.tag) in TEXT_ELEMENTS:
+        return
+    if element.text is not None and not element.text.strip() and len(element):
+        element.text = None
+    for child in element:
+        if child.tail is not None and not child.tail.strip():
+            child.tail = None
+
+
+def optimize_svg(content: bytes, config: OptimizeConfig) -> bytes:
+    """Optimise a single SVG document.
+
+    Args:
+        content: Original SVG bytes.
+        config: Optimisation settings.
+
+    Returns:
+        Optimised SVG bytes, or `content` unchanged if it cannot be parsed or
+        the result is not smaller.
+    """
+    try:
+        root = ET.fromstring(content)
+    except ET.ParseError:
+        return content
+
+    if config.strip_metadata:
+        for name in ROOT_REDUNDANT_ATTRIBUTES:
+            root.attrib.pop(name, None)
+    _clean(root, config)
+
+    try:
+        optimized = ET.tostring(root, encoding="unicode").replace(" />", "/>")
+    except (TypeError, ValueError):
+        return content
+
+    result = optimized.encode("utf-8")
+    return result if len(result) < len(content) else content
+
+
+def optimize_entries(
+    entries: Iterable[ZipEntry], config: OptimizeConfig, stats: OptimizeStats
+) -> Iterator[ZipEntry]:
+    """Optimise the SVG entries of a stream of ZipEntry objects.
+
+    Non-SVG entries are passed through untouched.
+
+    Args:
+        entries: ZipEntry objects from a pack bundler.
+        config: Optimisation settings.
+        stats: Stats object updated as entries are consumed.
+
+    Yields:
+        ZipEntry objects with optimised content.
+    """
+    for entry in entries:
+        if not entry.path.endswith(".svg"):
+            yield entry
+            continue
+        optimized = optimize_svg(entry.content, config)
+        stats.files += 1
+        stats.bytes_before += len(entry.content)
+        stats.bytes_after += len(optimized)
+        if optimized is entry.content:
+            stats.skipped += 1
+        yield ZipEntry(path=entry.path, content=optimized)
@@ -0,0 +1,565 @@
+"""Fetch and build pipeline for icon packs.
+
+This module holds the per-pack fetch and build steps used by the CLI, plus
+an orchestrator that runs them for every pack in a directory using a
+process pool.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import os
+import time
+import traceback
+import zipfile
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from justmyresource_pack_tools.archive import open_archive
+from justmyresource_pack_tools.bloom import BLOOM_NAME, write_bloom
+from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.download import compute_sha256, download_with_cache
+from justmyresource_pack_tools.encodings import (
+    ENCODED_NAME,
+    available_encodings,
+    write_encoded,
+)
+from justmyresource_pack_tools.fingerprint import compute_fingerprint, read_fingerprint
+from justmyresource_pack_tools.index import INDEX_NAME, write_index
+from justmyresource_pack_tools.manifest import generate_manifest
+from justmyresource_pack_tools.names import (
+    NAMES_NAME,
+    NameAlias,
+    build_name_table,
+    write_name_table,
+)
+from justmyresource_pack_tools.optimize import OptimizeStats, optimize_entries
+from justmyresource_pack_tools.readme import generate_readme
+from justmyresource_pack_tools.repack import (
+    ALIASES_NAME,
+    create_icon_zip,
+    write_aliases,
+)
+from justmyresource_pack_tools.runtime import VENDORED_MODULES, install_runtime
+from justmyresource_pack_tools.search import SEARCH_NAME, write_search_index
+from justmyresource_pack_tools.tags import (
+    TAGS_NAME,
+    IconMetadata,
+    build_tag_index,
+    split_metadata,
+    write_tag_index,
+)
+
+Log = Callable[[str], None]
+
+
+@dataclass(slots=True)
+class PackResult:
+    """Outcome of running a pipeline step for a single pack."""
+
+    pack: str
+    """Pack directory name (e.g., "lucide")."""
+    ok: bool
+    """True if the step completed without raising."""
+    elapsed: float
+    """Wall-clock duration of the step in seconds."""
+    output: list[str] = field(default_factory=list)
+    """Lines logged by the step."""
+    error: str = ""
+    """Error message if the step failed."""
+    traceback: str = ""
+    """Formatted traceback if the step failed."""
+
+
+def discover_packs(packs_dir: Path) -> list[Path]:
+    """Find all pack directories containing an upstream.toml.
+
+    Args:
+        packs_dir: Path to packs directory (e.g., packs/).
+
+    Returns:
+        Sorted list of pack directories.
+    """
+    return sorted(toml.parent for toml in packs_dir.glob("*/upstream.toml"))
+
+
+def load_upstream(pack_dir: Path) -> UpstreamConfig:
+    """Load upstream.toml for a pack.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+
+    Returns:
+        Parsed UpstreamConfig.
+
+    Raises:
+        FileNotFoundError: If upstream.toml does not exist.
+    """
+    upstream_toml = pack_dir / "upstream.toml"
+    if not upstream_toml.exists():
+        raise FileNotFoundError(f"upstream.toml not found in {pack_dir}")
+    return UpstreamConfig.load(upstream_toml)
+
+
+def find_cached_archive(pack_dir: Path) -> Path:
+    """Locate the cached upstream archive for a pack.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+
+    Returns:
+        Path to the cached archive.
+
+    Raises:
+        FileNotFoundError: If no archive has been fetched yet.
+    """
+    cache_dir = pack_dir / "cache"
+    cached_files = sorted(cache_dir.glob("*"))
+    if not cached_files:
+        raise FileNotFoundError(
+            f"No cached archive found in {cache_dir}.\n"
+            f"Run 'pack-tools fetch {pack_dir}' first."
+        )
+    # Use the cached archive (should be only one file)
+    return cached_files[0]
+
+
+def find_output_dir(pack_dir: Path) -> Path:
+    """Locate the src/justmyresource_* package directory of a pack.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+
+    Returns:
+        Path to the package directory that receives build artifacts.
+
+    Raises:
+        FileNotFoundError: If the package directory cannot be found.
+    """
+    src_dir = pack_dir / "src"
+    if not src_dir.exists():
+        raise FileNotFoundError(f"src/ directory not found in {pack_dir}")
+
+    output_dirs = sorted(
+        d
+        for d in src_dir.iterdir()
+        if d.is_dir() and d.name.startswith("justmyresource_")
+    )
+    if not output_dirs:
+        raise FileNotFoundError(f"No justmyresource_* directory found in {src_dir}")
+    return output_dirs[0]
+
+
+def load_build_module(pack_dir: Path, config: UpstreamConfig) -> ModuleType:
+    """Dynamically import the per-pack build module.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        config: Upstream configuration naming the module.
+
+    Returns:
+        The imported build module (e.g., pack.py).
+
+    Raises:
+        FileNotFoundError: If the build module does not exist.
+        ImportError: If the module cannot be loaded.
+    """
+    build_module_name = config.build.module
+
+    build_py = pack_dir / f"{build_module_name}.py"
+    if not build_py.exists():
+        raise FileNotFoundError(f"{build_py} not found")
+
+    spec = importlib.util.spec_from_file_location(
+        f"{pack_dir.name}.{build_module_name}", build_py
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load {build_py}")
+
+    build_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build_module)
+    return build_module
+
+
+def load_bundler(pack_dir: Path, config: UpstreamConfig) -> Callable[..., Any]:
+    """Dynamically import the per-pack bundler entry point.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        config: Upstream configuration naming the module and entry point.
+
+    Returns:
+        The extract function implementing the PackBundler protocol.
+
+    Raises:
+        FileNotFoundError: If the build module does not exist.
+        ImportError: If the module cannot be loaded.
+        AttributeError: If the entry point is missing from the module.
+    """
+    build_module = load_build_module(pack_dir, config)
+    build_entry_name = config.build.entry
+    if not hasattr(build_module, build_entry_name):
+        raise AttributeError(f"{build_entry_name} not found in {build_module.__file__}")
+
+    return getattr(build_module, build_entry_name)  # type: ignore[no-any-return]
+
+
+def list_zip_paths(zip_path: Path, aliases: dict[str, str] | None = None) -> list[str]:
+    """List every icon path a built pack serves.
+
+    Args:
+        zip_path: Path to the built icons.zip.
+        aliases: Optional deduplication alias table; aliases are included.
+
+    Returns:
+        Zip paths of all icons, including deduplicated aliases.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_file:
+        paths = [name for name in zip_file.namelist() if not name.endswith("/")]
+    return paths + list(aliases or {})
+
+
+def fetch_pack(pack_dir: Path, log: Log = print) -> Path:
+    """Fetch upstream archive for a pack into its cache/ directory.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        log: Callback receiving progress messages.
+
+    Returns:
+        Path to the cached archive.
+    """
+    config = load_upstream(pack_dir)
+
+    log(f"Fetching {pack_dir.name}...")
+    log(f"  URL: {config.source.url}")
+    log(f"  Tag: {config.source.tag}")
+
+    archive_path = download_with_cache(
+        url=config.source.url,
+        cache_dir=pack_dir / "cache",
+        expected_sha256=config.source.sha256 if config.source.sha256 else None,
+    )
+
+    log(f"✓ Archive cached at {archive_path}")
+    return archive_path
+
+
+def build_artifacts(
+    pack_dir: Path, output_dir: Path, config: UpstreamConfig
+) -> list[Path]:
+    """List the files a build of this pack produces.
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        output_dir: Package directory holding the build artifacts.
+        config: Upstream configuration of the pack.
+
+    Returns:
+        Paths of all build artifacts.
+    """
+    artifacts = [
+        output_dir / "icons.zip",
+        output_dir / "pack_manifest.json",
+        output_dir / INDEX_NAME,
+        output_dir / BLOOM_NAME,
+        output_dir / SEARCH_NAME,
+        output_dir / TAGS_NAME,
+        output_dir / NAMES_NAME,
+        *(output_dir / module for module in VENDORED_MODULES),
+        pack_dir / "README.md",
+    ]
+    if config.compression.dedupe:
+        artifacts.append(output_dir / ALIASES_NAME)
+    if config.encodings.enabled:
+        artifacts.append(output_dir / ENCODED_NAME)
+    return artifacts
+
+
+def is_up_to_date(artifacts: list[Path], fingerprint: str) -> bool:
+    """Check whether a pack's build artifacts match a build fingerprint.
+
+    Args:
+        artifacts: Paths of all build artifacts (see build_artifacts()).
+        fingerprint: Fingerprint of the current build inputs.
+
+    Returns:
+        True if all artifacts exist and were built from the same inputs.
+    """
+    manifest_path = next(p for p in artifacts if p.name == "pack_manifest.json")
+    if not all(path.exists() for path in artifacts):
+        return False
+    return read_fingerprint(manifest_path) == fingerprint
+
+
+def build_pack(
+    pack_dir: Path,
+    log: Log = print,
+    force: bool = False,
+    reproducible: bool = False,
+) -> int | None:
+    """Build a pack: extract from cache, generate icons.zip + manifest + README.
+
+    The build is skipped if the artifacts were produced from identical inputs
+    (see `justmyresource_pack_tools.fingerprint`).
+
+    Args:
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        log: Callback receiving progress messages.
+        force: Rebuild even if the build fingerprint is unchanged.
+        reproducible: Produce byte-identical artifacts for identical inputs.
+            Implied when SOURCE_DATE_EPOCH is set.
+
+    Returns:
+        Number of icons written to icons.zip, or None if the build was skipped.
+    """
+    upstream_toml = pack_dir / "upstream.toml"
+    config = load_upstream(pack_dir)
+
+    archive_path = find_cached_archive(pack_dir)
+    output_dir = find_output_dir(pack_dir)
+
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH", "")
+    reproducible = reproducible or bool(source_date_epoch)
+    options: dict[str, Any] = {
+        "reproducible": reproducible,
+        "source_date_epoch": source_date_epoch,
+    }
+    # Which encodings get built depends on the installed compressors
+    encodings = available_encodings(config.encodings.formats)
+    if config.encodings.enabled:
+        options["encodings"] = encodings
+    fingerprint = compute_fingerprint(pack_dir, config, archive_path, options=options)
+    artifacts = build_artifacts(pack_dir, output_dir, config)
+    if not force and is_up_to_date(artifacts, fingerprint):
+        log(f"✓ {pack_dir.name} is up to date ({fingerprint[:12]}), skipping build")
+        return None
+
+    log(f"Processing {archive_path.name}...")
+    build_module = load_build_module(pack_dir, config)
+    extract_func = getattr(build_module, config.build.entry, None)
+    if extract_func is None:
+        raise AttributeError(
+            f"{config.build.entry} not found in {build_module.__file__}"
+        )
+    name_alias_func = getattr(build_module, config.build.name_aliases, None)
+
+    # Stream extracted icons straight into icons.zip; the archive must stay
+    # open until the bundler's generator is exhausted
+    zip_path = output_dir / "icons.zip"
+    optimize_stats = OptimizeStats()
+    aliases: dict[str, str] | None = {} if config.compression.dedupe else None
+    metadata: list[IconMetadata] = []
+    name_aliases: list[NameAlias] = []
+    with open_archive(archive_path) as archive:
+        entries = split_metadata(extract_func(archive, config), metadata, name_aliases)
+        if config.optimize.enabled:
+            entries = optimize_entries(entries, config.optimize, optimize_stats)
+        icon_count = create_icon_zip(
+            entries,
+            zip_path,
+            reproducible=reproducible,
+            compression=config.compression,
+            aliases=aliases,
+        )
+    log(f"✓ Created {zip_path} with {icon_count} icons")
+
+    aliases_path = output_dir / ALIASES_NAME
+    if aliases is not None:
+        write_aliases(aliases, aliases_path)
+        log(
+            f"✓ Deduplicated {len(aliases)} icons "
+            f"({icon_count - len(aliases)} stored), wrote {aliases_path}"
+        )
+    else:
+        aliases_path.unlink(missing_ok=True)
+
+    index_path = output_dir / INDEX_NAME
+    index_count = write_index(zip_path, index_path, aliases)
+    log(f"✓ Indexed {index_count} names in {index_path}")
+
+    paths = list_zip_paths(zip_path, aliases)
+    bloom_path = output_dir / BLOOM_NAME
+    bloom_bytes = write_bloom(paths, zip_path, bloom_path)
+    log(f"✓ Wrote {bloom_bytes}-byte name filter to {bloom_path}")
+    search_path = output_dir / SEARCH_NAME
+    search_keys = write_search_index(
+        paths, config.pack.default_variant, zip_path, search_path
+    )
+    log(f"✓ Indexed {search_keys} search keys in {search_path}")
+    tags_path = output_dir / TAGS_NAME
+    tags, categories = build_tag_index(metadata, paths)
+    write_tag_index(tags, categories, zip_path, tags_path)
+    log(f"✓ Indexed {len(tags)} tags and {len(categories)} categories in {tags_path}")
+
+    encoded_path = output_dir / ENCODED_NAME
+    if config.encodings.enabled:
+        skipped = set(config.encodings.formats) - set(encodings)
+        if skipped:
+            missing = ", ".join(sorted(skipped))
+            log(f"⚠ Skipping encodings without a compressor: {missing}")
+        encoded_bytes = write_encoded(
+            zip_path,
+            encodings,
+            encoded_path,
+            aliases,
+            workers=config.encodings.workers or None,
+        )
+        log(
+            f"✓ Wrote {encoded_bytes} bytes of {', '.join(encodings)} "
+            f"encodings to {encoded_path}"
+        )
+    else:
+        encoded_path.unlink(missing_ok=True)
+
+    # Precompute alternative spellings and upstream aliases of icon names;
+    # the hook only derives aliases from the built paths, so the upstream
+    # archive is not read a second time
+    if name_alias_func is not None:
+        name_aliases.extend(name_alias_func(config, paths))
+    names_path = output_dir / NAMES_NAME
+    name_table = build_name_table(paths, config.pack.default_variant, name_aliases)
+    write_name_table(name_table, names_path)
+    log(
+        f"✓ Wrote {len(name_table)} extra names "
+        f"({len(name_aliases)} upstream aliases) to {names_path}"
+    )
+
+    # Vendor the shared runtime that the pack's __init__.py imports, and the
+    # discovery reader for registries
+    for path in install_runtime(output_dir):
+        log(f"✓ Installed {path}")
+    if config.optimize.enabled:
+        saved = optimize_stats.bytes_before - optimize_stats.bytes_after
+        log(
+            f"✓ Optimized SVGs: {optimize_stats.bytes_before} → "
+            f"{optimize_stats.bytes_after} bytes ({saved} saved)"
+        )
+
+    # Generate manifest
+    manifest_path = output_dir / "pack_manifest.json"
+    computed_sha256 = compute_sha256(archive_path)
+    generate_manifest(
+        upstream_toml_path=upstream_toml,
+        icon_count=icon_count,
+        variants=None,  # Read from config
+        output_path=manifest_path,
+        computed_sha256=computed_sha256,
+        build_fingerprint=fingerprint,
+        reproducible=reproducible,
+        optimization=(
+            optimize_stats.to_manifest(config.optimize)
+            if config.optimize.enabled
+            else None
+        ),
+        deduplication=(
+            {"aliases": len(aliases), "stored": icon_count - len(aliases)}
+            if aliases is not None
+            else None
+        ),
+    )
+    log(f"✓ Generated {manifest_path}")
+
+    # Generate README (generate_readme reports its own progress)
+    generate_readme(pack_dir)
+
+    return icon_count
+
+
+STEPS: dict[str, Callable[..., Any]] = {
+    "fetch": fetch_pack,
+    "build": build_pack,
+}
+
+
+def run_step(step: str, pack_dir: Path, **options: Any) -> PackResult:
+    """Run a pipeline step for one pack, capturing its output.
+
+    Never raises: failures are reported through the returned PackResult so
+    that one broken pack does not abort a batch run.
+
+    Args:
+        step: Step name ("fetch" or "build").
+        pack_dir: Path to pack directory (e.g., packs/lucide/).
+        **options: Extra keyword arguments for the step (e.g., force=True).
+
+    Returns:
+        PackResult describing the outcome.
+    """
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    ok = True
+    error = ""
+    tb = ""
+
+    # Helpers such as download_with_cache() print directly, so capture stdout
+    # rather than passing a log callback; this keeps messages in order and
+    # stops output from parallel workers interleaving on the terminal.
+    with contextlib.redirect_stdout(stdout):
+        try:
+            STEPS[step](pack_dir, print, **options)
+        except Exception as e:
+            ok = False
+            error = str(e)
+            tb = traceback.format_exc()
+
+    return PackResult(
+        pack=pack_dir.name,
+        ok=ok,
+        elapsed=time.perf_counter() - start,
+        output=[line for line in stdout.getvalue().splitlines() if line],
+        error=error,
+        traceback=tb,
+    )
+
+
+def run_all(
+    step: str, pack_dirs: list[Path], jobs: int | None = None, **options: Any
+) -> Iterator[PackResult]:
+    """Run a pipeline step for several packs in a process pool.
+
+    Args:
+        step: Step name ("fetch" or "build").
+        pack_dirs: Pack directories to process.
+        jobs: Number of worker processes. Defaults to os.cpu_count().
+        **options: Extra keyword arguments for the step (e.g., force=True).
+
+    Yields:
+        PackResult objects in completion order. If a worker process dies
+        (e.g., killed by the OOM killer), every pack it left unfinished is
+        reported as a failure rather than aborting the run.
+    """
+    if step not in STEPS:
+        raise ValueError(f"Unknown step: {step}")
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pack_dirs) <= 1:
+        for pack_dir in pack_dirs:
+            yield run_step(step, pack_dir, **options)
+        return
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pack_dirs))) as pool:
+        futures = {
+            pool.submit(run_step, step, pack_dir, **options): pack_dir
+            for pack_dir in pack_dirs
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except BrokenProcessPool:
+                # The pool is unusable once a worker dies: every pending
+                # future fails the same way, so each unfinished pack is listed
+                yield PackResult(
+                    pack=futures[future].name,
+                    ok=False,
+                    elapsed=time.perf_counter() - start,
+                    error="worker process died before the pack finished",
+                )
@@ -11,7 +11,9 @@ from typing import Protocol
 
 from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.names import NameAlias
 from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.tags import IconMetadata
 
 
 class PackBundler(Protocol):
@@ -20,11 +22,17 @@ class PackBundler(Protocol):
     Per-pack build scripts implement this protocol by providing an `extract`
     function that transforms upstream archive contents into standardized
     ZipEntry objects.
+
+    The build streams entries straight into icons.zip, so implementations
+    should be generators that read and yield one file at a time. Upstream
+    tags and categories, and upstream aliases of icon names, can be reported
+    by yielding IconMetadata and NameAlias records in the same stream, in
+    any order relative to the icons they describe.
     """
 
     def extract(
         self, archive: ArchiveReader, config: UpstreamConfig
-    ) -> Iterator[ZipEntry]:
+    ) -> Iterator[ZipEntry | IconMetadata | NameAlias]:
         """Extract icons from upstream archive into standardized ZipEntry items.
 
         Args:
@@ -32,8 +40,33 @@ class PackBundler(Protocol):
             config: Upstream configuration loaded from upstream.toml.
 
         Yields:
-            ZipEntry objects with normalized paths and content.
+            ZipEntry objects with normalized paths and content, and
+            optionally IconMetadata and NameAlias records for them; aliases
+            of unknown targets are ignored.
         """
         ...
 
 
+class NameAliasProvider(Protocol):
+    """Optional protocol for name aliases derived from the built pack.
+
+    A pack's build module may define a `name_aliases` function (the name is
+    configurable via [build] name_aliases) that reports additional accepted
+    names derived from upstream naming quirks. It runs after icons.zip is
+    built and does not see the upstream archive: aliases read from upstream
+    metadata are yielded by extract() instead, in the same single pass.
+    """
+
+    def name_aliases(
+        self, config: UpstreamConfig, paths: list[str]
+    ) -> Iterator[NameAlias]:
+        """Report aliases of the pack's icons.
+
+        Args:
+            config: Upstream configuration loaded from upstream.toml.
+            paths: Every zip path in the built pack.
+
+        Yields:
+            NameAlias objects; aliases of unknown targets are ignored.
+        """
+        ...
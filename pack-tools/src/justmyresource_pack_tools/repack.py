@@ -1,12 +1,43 @@
-"""Repacking utilities for creating icon zip files."""
+"""Repacking utilities for creating icon zip files.
+
+Memory use
+----------
+`create_icon_zip` consumes its entries lazily and writes each one to disk
+before pulling the next, so a streaming bundler (a generator, as every
+`pack.py` is) never has more than one SVG in memory at a time. Peak memory
+for a build is therefore bounded by:
+
+- the largest single entry, held twice while it is compressed, plus
+- roughly 0.5 KiB per entry for the `ZipInfo` record `zipfile` keeps to
+  write the central directory at the end of the archive.
+
+For a 100k-icon pack of typical (<10 KiB) SVGs that is about 50 MiB,
+independent of the total size of the icons. Reproducible builds sort entries
+through an uncompressed spool file, which doubles the per-entry overhead, and
+deduplication keeps a 32-byte digest per unique entry.
+
+Reproducible builds
+-------------------
+With `reproducible=True`, entries are written in sorted path order with a
+fixed timestamp (SOURCE_DATE_EPOCH if set, else 1980-01-01) and fixed
+permissions, so identical inputs give a byte-identical icons.zip on any
+machine with the same zlib.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import time
 import zipfile
-from collections.abc import Iterator
+import zlib
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import NamedTuple
 
+from justmyresource_pack_tools.config import CompressionConfig
+
 
 class ZipEntry(NamedTuple):
     """Entry to write into the icon zip."""
@@ -17,24 +48,170 @@ class ZipEntry(NamedTuple):
     """File content as bytes."""
 
 
-def create_icon_zip(entries: Iterator[ZipEntry], output_path: Path) -> int:
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+"""Earliest timestamp representable in a zip file."""
+
+ENTRY_MODE = 0o100644
+"""Unix mode (regular file, rw-r--r--) written for every reproducible entry."""
+
+
+def get_zip_timestamp() -> tuple[int, int, int, int, int, int]:
+    """Get the fixed entry timestamp used for reproducible zips.
+
+    Honours SOURCE_DATE_EPOCH (https://reproducible-builds.org/specs/source-date-epoch/),
+    clamped to the 1980 zip epoch.
+
+    Returns:
+        ZipInfo date_time tuple.
+    """
+    source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not source_date_epoch:
+        return ZIP_EPOCH
+    date_time = time.gmtime(int(source_date_epoch))[:6]
+    return max(date_time, ZIP_EPOCH)
+
+
+def select_compression(
+    content: bytes, policy: CompressionConfig
+) -> tuple[int, int | None]:
+    """Choose the compression method and level for one entry.
+
+    Args:
+        content: Entry content.
+        policy: Compression policy from upstream.toml.
+
+    Returns:
+        (compress_type, compresslevel) to pass to ZipFile.writestr().
+    """
+    if policy.method == "stored":
+        return zipfile.ZIP_STORED, None
+    if policy.method == "auto":
+        if len(content) < policy.min_size:
+            return zipfile.ZIP_STORED, None
+        compressor = zlib.compressobj(policy.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed_size = len(compressor.compress(content) + compressor.flush())
+        if compressed_size > len(content) * policy.max_ratio:
+            return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, policy.level
+
+
+def _sorted_entries(
+    entries: Iterable[ZipEntry], spool_path: Path
+) -> Iterator[ZipEntry]:
+    """Yield entries sorted by path without holding their content in memory.
+
+    Entries are first spooled into an uncompressed zip, then read back one at
+    a time in sorted order.
+
+    Args:
+        entries: Iterable of ZipEntry objects in any order.
+        spool_path: Temporary file used as the spool.
+
+    Yields:
+        ZipEntry objects sorted by path.
+    """
+    with zipfile.ZipFile(spool_path, "w", zipfile.ZIP_STORED) as spool:
+        for entry in entries:
+            spool.writestr(entry.path, entry.content)
+    with zipfile.ZipFile(spool_path, "r") as spool:
+        for info in sorted(spool.infolist(), key=lambda info: info.filename):
+            yield ZipEntry(path=info.filename, content=spool.read(info))
+
+
+def create_icon_zip(
+    entries: Iterable[ZipEntry],
+    output_path: Path,
+    reproducible: bool = False,
+    compression: CompressionConfig | None = None,
+    aliases: dict[str, str] | None = None,
+) -> int:
     """Create an icon zip file from entries.
 
+    Entries are streamed: each one is compressed and written before the next
+    is requested, so `entries` should be a generator rather than a list when
+    building large packs. The archive is written to a temporary file and
+    moved into place on success, so a failing bundler never leaves a
+    truncated icons.zip behind.
+
     Args:
-        entries: Iterator of ZipEntry objects to write.
+        entries: Iterable of ZipEntry objects to write.
         output_path: Path where the zip file will be created.
+        reproducible: Write entries in sorted order with fixed timestamps and
+            permissions so identical inputs produce identical bytes.
+        compression: Per-entry compression policy. Defaults to deflate at
+            level 6 for every entry.
+        aliases: If given, content is deduplicated: only the first entry with
+            a given content is written, and every later entry with identical
+            bytes is recorded here as alias path → stored path.
 
     Returns:
-        Number of entries written.
+        Number of entries written, including deduplicated aliases.
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    spool_path = output_path.with_name(f"{output_path.name}.spool")
+    date_time = get_zip_timestamp() if reproducible else None
+    policy = compression or CompressionConfig()
+    stored_paths: dict[bytes, str] = {}
+
+    if reproducible:
+        entries = _sorted_entries(entries, spool_path)
 
     count = 0
-    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for entry in entries:
-            zip_file.writestr(entry.path, entry.content)
-            count += 1
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for entry in entries:
+                count += 1
+                if aliases is not None:
+                    digest = hashlib.sha256(entry.content).digest()
+                    stored_path = stored_paths.setdefault(digest, entry.path)
+                    if stored_path != entry.path:
+                        aliases[entry.path] = stored_path
+                        continue
+
+                compress_type, compresslevel = select_compression(entry.content, policy)
+                if date_time is None:
+                    zip_file.writestr(
+                        entry.path,
+                        entry.content,
+                        compress_type=compress_type,
+                        compresslevel=compresslevel,
+                    )
+                else:
+                    info = zipfile.ZipInfo(entry.path, date_time=date_time)
+                    info.create_system = 3  # Unix, regardless of build host
+                    info.external_attr = ENTRY_MODE << 16
+                    zip_file.writestr(
+                        info,
+                        entry.content,
+                        compress_type=compress_type,
+                        compresslevel=compresslevel,
+                    )
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        spool_path.unlink(missing_ok=True)
 
     return count
 
 
+ALIASES_NAME = "icon_aliases.json"
+"""File written next to icons.zip listing deduplicated entries."""
+
+
+def write_aliases(aliases: dict[str, str], output_path: Path) -> None:
+    """Write the alias table produced by a deduplicating create_icon_zip().
+
+    Args:
+        aliases: Mapping of alias path to the path that stores its content.
+        output_path: Path of the JSON file to write.
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            data = {"version": 1, "aliases": dict(sorted(aliases.items()))}
+            json.dump(data, f, indent=0)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
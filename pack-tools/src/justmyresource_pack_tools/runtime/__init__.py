@@ -0,0 +1,85 @@
+"""Runtime support code vendored into each pack at build time.
+
+Packs have no runtime dependencies beyond `justmyresource`, so shared
+runtime logic (reading the build artifacts that pack-tools generates) cannot
+live in pack-tools itself. Instead, the modules in this package are the
+single source of truth and `install_runtime()` copies them into each pack's
+`src/justmyresource_<name>/` directory, next to icons.zip:
+
+- `_runtime.py`: the resource provider that the pack's __init__.py imports.
+- `_discovery.py`: the standard-library-only reader of the installed-pack
+  snapshot and the discovery index, for registries.
+"""
+
+from __future__ import annotations
+
+from importlib.resources import files
+from pathlib import Path
+
+RUNTIME_MODULE = "_runtime.py"
+"""File name of the runtime module, both here and in each pack."""
+
+DISCOVERY_MODULE = "_discovery.py"
+"""File name of the discovery reader module, both here and in each pack."""
+
+VENDORED_MODULES = (RUNTIME_MODULE, DISCOVERY_MODULE)
+"""Every module copied into each pack."""
+
+_HEADER = (
+    "# This file is generated by pack-tools from "
+    "justmyresource_pack_tools/runtime/{module}.\n"
+    "# Do not edit manually; run `pack-tools sync-runtime` to update it.\n"
+)
+
+
+def render_runtime(module: str = RUNTIME_MODULE) -> str:
+    """Get the source of a vendored module as written into packs.
+
+    Args:
+        module: File name of the module (one of VENDORED_MODULES).
+
+    Returns:
+        Module source, prefixed with a generated-file header.
+    """
+    source = files(__name__).joinpath(module).read_text(encoding="utf-8")
+    return _HEADER.format(module=module) + source
+
+
+def runtime_is_current(output_dir: Path) -> bool:
+    """Check that a pack's copies of the vendored modules are up to date.
+
+    Args:
+        output_dir: Pack package directory (e.g., src/justmyresource_lucide/).
+
+    Returns:
+        True if every copy exists and matches render_runtime().
+    """
+    for module in VENDORED_MODULES:
+        path = output_dir / module
+        if not path.exists() or path.read_text(encoding="utf-8") != render_runtime(
+            module
+        ):
+            return False
+    return True
+
+
+def install_runtime(output_dir: Path) -> list[Path]:
+    """Write the vendored modules into a pack's package directory.
+
+    Files are only rewritten if their content changed, so repeated builds do
+    not touch their mtime.
+
+    Args:
+        output_dir: Pack package directory (e.g., src/justmyresource_lucide/).
+
+    Returns:
+        Paths to the installed modules.
+    """
+    paths = []
+    for module in VENDORED_MODULES:
+        path = output_dir / module
+        source = render_runtime(module)
+        if not path.exists() or path.read_text(encoding="utf-8") != source:
+            path.write_text(source, encoding="utf-8")
+        paths.append(path)
+    return paths
@@ -0,0 +1,146 @@
+"""Search index over icon names written next to icons.zip.
+
+Icon pickers search every installed pack as the user types. Listing and
+scanning every zip path on each keystroke does not scale to 100k icons, so
+the build ships a compact index that the pack runtime loads once:
+
+- Search keys, the icon's base name without variant prefix or extension,
+  sorted so that prefix queries are a bisect plus a forward scan.
+- A trigram posting list over the keys for substring and fuzzy queries.
+
+Format (little-endian), version 2:
+
+- Header (32 bytes): magic ``b"JMRS"``, version (u16), reserved (u16), key
+  count K (u32), path count P (u32), trigram count T (u32), posting count N
+  (u32), `index.zip_stamp()` of the icons.zip it describes (u64).
+- Key starts: K + 1 u32; the paths of key ``i`` are
+  ``paths[starts[i]:starts[i + 1]]``, default variant first.
+- Trigram offsets: T + 1 u32; the postings of trigram ``j`` are
+  ``postings[offsets[j]:offsets[j + 1]]``.
+- Postings: N u32 key numbers, ascending within each trigram.
+- Text: the K keys, P paths and T trigrams, in that order, UTF-8 and
+  joined by newlines.
+
+The reader lives in the vendored runtime (`runtime/_runtime.py`) and must
+be kept in step with this module.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+
+from justmyresource_pack_tools.index import zip_stamp
+from justmyresource_pack_tools.normalize import strip_extension
+
+SEARCH_NAME = "icons.search"
+"""File written next to icons.zip."""
+
+SEARCH_MAGIC = b"JMRS"
+SEARCH_VERSION = 2
+SEARCH_HEADER = struct.Struct("<4sHHIIIIQ")
+
+
+def search_key(path: str) -> str:
+    """Get the key an icon is searched by.
+
+    Args:
+        path: Zip path (e.g., "24/outline/arrow-down.svg").
+
+    Returns:
+        Base name without variant prefix or extension (e.g., "arrow-down").
+    """
+    return strip_extension(path).rpartition("/")[2]
+
+
+def trigrams(key: str) -> set[str]:
+    """Split a key into its overlapping three-character substrings.
+
+    Args:
+        key: Search key.
+
+    Returns:
+        Distinct trigrams; empty for keys shorter than three characters.
+    """
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+def pack_u32(values: Iterable[int]) -> bytes:
+    """Pack integers as little-endian u32."""
+    packed = array("I", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def write_search_index(
+    paths: Iterable[str], default_variant: str, zip_path: Path, output_path: Path
+) -> int:
+    """Write the search index for a built icons.zip.
+
+    Args:
+        paths: Every zip path the pack serves, including deduplicated aliases.
+        default_variant: Variant whose path is listed first for each key
+            ("" if none).
+        zip_path: Path to the icons.zip the paths come from.
+        output_path: Path of the index file to write.
+
+    Returns:
+        Number of distinct search keys.
+
+    Raises:
+        ValueError: If a path contains a newline.
+    """
+    default_prefix = f"{default_variant}/" if default_variant else ""
+    by_key: dict[str, list[str]] = {}
+    for path in paths:
+        if "\n" in path:
+            raise ValueError(f"Cannot index path containing a newline: {path!r}")
+        by_key.setdefault(search_key(path), []).append(path)
+    keys = sorted(by_key)
+
+    ordered_paths: list[str] = []
+    starts = [0]
+    postings_by_trigram: dict[str, list[int]] = {}
+    for number, key in enumerate(keys):
+        ordered_paths.extend(
+            sorted(
+                by_key[key],
+                key=lambda path: (not path.startswith(default_prefix), path),
+            )
+        )
+        starts.append(len(ordered_paths))
+        for trigram in trigrams(key):
+            postings_by_trigram.setdefault(trigram, []).append(number)
+
+    trigram_list = sorted(postings_by_trigram)
+    offsets = [0]
+    postings: list[int] = []
+    for trigram in trigram_list:
+        postings.extend(postings_by_trigram[trigram])
+        offsets.append(len(postings))
+
+    header = SEARCH_HEADER.pack(
+        SEARCH_MAGIC,
+        SEARCH_VERSION,
+        0,
+        len(keys),
+        len(ordered_paths),
+        len(trigram_list),
+        len(postings),
+        zip_stamp(zip_path),
+    )
+    text = "\n".join([*keys, *ordered_paths, *trigram_list]).encode("utf-8")
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_bytes(
+            header + pack_u32(starts) + pack_u32(offsets) + pack_u32(postings) + text
+        )
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return len(keys)
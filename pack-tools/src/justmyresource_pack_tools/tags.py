@@ -0,0 +1,179 @@
+"""Tag and category index compiled from upstream icon metadata.
+
+Bundlers may yield `IconMetadata` records alongside their `ZipEntry`
+objects. The build collects them and writes an inverted index (term → icon
+numbers) next to icons.zip, so the pack runtime can answer "icons tagged X"
+without decompressing any SVG.
+
+Format (little-endian), version 2:
+
+- Header (32 bytes): magic ``b"JMRT"``, version (u16), reserved (u16), tag
+  count T (u32), category count C (u32), path count P (u32), posting count
+  N (u32), `index.zip_stamp()` of the icons.zip it describes (u64).
+- Term offsets: T + C + 1 u32; the postings of term ``j`` (tags first,
+  then categories) are ``postings[offsets[j]:offsets[j + 1]]``.
+- Postings: N u32 path numbers, ascending within each term.
+- Text: the T tags, C categories and P paths, each group sorted, UTF-8 and
+  joined by newlines.
+
+The reader lives in the vendored runtime (`runtime/_runtime.py`) and must
+be kept in step with this module.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from justmyresource_pack_tools.index import zip_stamp
+from justmyresource_pack_tools.names import NameAlias
+from justmyresource_pack_tools.normalize import strip_extension
+from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.search import pack_u32
+
+TAGS_NAME = "icons.tags"
+"""File written next to icons.zip."""
+
+TAGS_MAGIC = b"JMRT"
+TAGS_VERSION = 2
+TAGS_HEADER = struct.Struct("<4sHHIIIIQ")
+
+
+class IconMetadata(NamedTuple):
+    """Tags and categories of an icon, yielded by a bundler's extract()."""
+
+    path: str
+    """Zip path of the icon (e.g., "outlined/home.svg").
+
+    A path without a variant prefix that is not itself in the pack applies
+    to every variant containing an icon of that name.
+    """
+    tags: tuple[str, ...] = ()
+    """Free-form search terms (e.g., ("building", "house"))."""
+    categories: tuple[str, ...] = ()
+    """Upstream categories (e.g., ("action",))."""
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a tag or category for storage and lookup.
+
+    Args:
+        term: Tag or category as written upstream.
+
+    Returns:
+        Lowercase term without surrounding whitespace.
+    """
+    return " ".join(term.split()).lower()
+
+
+def split_metadata(
+    items: Iterable[ZipEntry | IconMetadata | NameAlias],
+    records: list[IconMetadata],
+    aliases: list[NameAlias],
+) -> Iterator[ZipEntry]:
+    """Separate metadata records from a bundler's output stream.
+
+    Args:
+        items: Objects yielded by a bundler's extract().
+        records: List receiving every IconMetadata in stream order.
+        aliases: List receiving every NameAlias in stream order.
+
+    Yields:
+        The ZipEntry objects, unchanged.
+    """
+    for item in items:
+        if isinstance(item, IconMetadata):
+            records.append(item)
+        elif isinstance(item, NameAlias):
+            aliases.append(item)
+        else:
+            yield item
+
+
+def build_tag_index(
+    records: Iterable[IconMetadata], paths: Iterable[str]
+) -> tuple[dict[str, set[str]], dict[str, set[str]]]:
+    """Resolve metadata records against the icons a pack actually has.
+
+    Args:
+        records: Metadata records from the bundler.
+        paths: Every zip path in the pack, including deduplicated aliases.
+
+    Returns:
+        (tag → zip paths, category → zip paths); records for unknown icons
+        are dropped.
+    """
+    known = set(paths)
+    by_base: dict[str, list[str]] = {}
+    for path in known:
+        by_base.setdefault(strip_extension(path).rpartition("/")[2], []).append(path)
+
+    tags: dict[str, set[str]] = {}
+    categories: dict[str, set[str]] = {}
+    for record in records:
+        if record.path in known:
+            targets = [record.path]
+        elif "/" not in record.path:
+            targets = by_base.get(strip_extension(record.path), [])
+        else:
+            continue
+        for terms, index in ((record.tags, tags), (record.categories, categories)):
+            for term in terms:
+                term = normalize_term(term)
+                if term:
+                    index.setdefault(term, set()).update(targets)
+    return tags, categories
+
+
+def write_tag_index(
+    tags: dict[str, set[str]],
+    categories: dict[str, set[str]],
+    zip_path: Path,
+    output_path: Path,
+) -> None:
+    """Write the tag index produced by build_tag_index().
+
+    Args:
+        tags: Tag → zip paths.
+        categories: Category → zip paths.
+        zip_path: Path to the icons.zip the paths come from.
+        output_path: Path of the index file to write.
+
+    Raises:
+        ValueError: If a term or path contains a newline.
+    """
+    tag_terms = sorted(tags)
+    category_terms = sorted(categories)
+    paths = sorted(set().union(*tags.values(), *categories.values()))
+    for text in (*tag_terms, *category_terms, *paths):
+        if "\n" in text:
+            raise ValueError(f"Cannot index text containing a newline: {text!r}")
+    numbers = {path: number for number, path in enumerate(paths)}
+
+    offsets = [0]
+    postings: list[int] = []
+    for index, terms in ((tags, tag_terms), (categories, category_terms)):
+        for term in terms:
+            postings.extend(sorted(numbers[path] for path in index[term]))
+            offsets.append(len(postings))
+
+    header = TAGS_HEADER.pack(
+        TAGS_MAGIC,
+        TAGS_VERSION,
+        0,
+        len(tag_terms),
+        len(category_terms),
+        len(paths),
+        len(postings),
+        zip_stamp(zip_path),
+    )
+    payload = "\n".join([*tag_terms, *category_terms, *paths]).encode("utf-8")
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_bytes(header + pack_u32(offsets) + pack_u32(postings) + payload)
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
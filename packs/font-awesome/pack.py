@@ -1,20 +1,30 @@
 """Build script for Font Awesome icon pack.
 
 Extracts SVGs from the upstream zip archive and repackages them
-into a standardized icons.zip format with variant prefixes.
+into a standardized icons.zip format with variant prefixes. Search terms
+and upstream aliases (e.g. "home" for "house") are read from
+metadata/icons.json in the same pass.
 """
 
 from __future__ import annotations
 
+import json
 from collections.abc import Iterator
 from pathlib import Path
 
 from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.names import NameAlias
 from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.tags import IconMetadata
 
+METADATA_FILE = "/metadata/icons.json"
+"""Upstream per-icon metadata, keyed by icon name."""
 
-def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry]:
+
+def extract(
+    archive: ArchiveReader, config: UpstreamConfig
+) -> Iterator[ZipEntry | IconMetadata | NameAlias]:
     """Extract icons from Font Awesome upstream archive.
 
     Font Awesome archive structure (zip from GitHub releases):
@@ -29,6 +39,8 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
             brands/
               github.svg
               ...
+          metadata/
+            icons.json   (search terms, aliases)
 
     Output structure (multi-variant):
         solid/arrow-right.svg
@@ -42,21 +54,27 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         config: Upstream configuration loaded from upstream.toml.
 
     Yields:
-        ZipEntry objects with normalized paths and content.
+        ZipEntry objects with normalized paths and content, an IconMetadata
+        record with the search terms of each icon, and a NameAlias per
+        former name listed under "aliases.names"; terms and aliases apply
+        to every style the icon exists in.
     """
     # Get allowed variants from config
     allowed_variants = set(config.pack.variants)
 
-    for member in archive.getmembers():
-        # Only process SVG files
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */svgs/{variant}/*.svg
-        if "/svgs/" not in member.name:
-            continue
-
-        if not member.name.endswith(".svg"):
+    # Filter for paths matching */svgs/{variant}/*.svg and the icon metadata;
+    # only matching files are read
+    for member, content in archive.iter_files(
+        lambda name: (
+            ("/svgs/" in name and name.endswith(".svg")) or name.endswith(METADATA_FILE)
+        )
+    ):
+        if member.name.endswith(METADATA_FILE):
+            for icon_name, metadata in json.loads(content).items():
+                terms = metadata.get("search", {}).get("terms", [])
+                yield IconMetadata(path=f"{icon_name}.svg", tags=tuple(terms))
+                for alias in metadata.get("aliases", {}).get("names", []):
+                    yield NameAlias(alias=alias, target=icon_name)
             continue
 
         # Extract variant and filename from path
@@ -82,10 +100,4 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Multi-variant, so output preserves style prefix
         zip_path = f"{variant}/{filename}"
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
-
-
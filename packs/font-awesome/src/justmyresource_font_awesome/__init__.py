@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_font_awesome._runtime import IconResourcePack
 
 
-class FontAwesomeResourcePack(ZippedResourcePack):
+class FontAwesomeResourcePack(IconResourcePack):
     """Resource pack for Font Awesome Free icons.
 
     Provides access to 2000+ SVG icons from Font Awesome Free:
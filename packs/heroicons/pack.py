@@ -55,18 +55,11 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
     # Get allowed variants from config
     allowed_variants = set(config.pack.variants)
 
-    for member in archive.getmembers():
-        # Only process SVG files
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */optimized/{size}/{style}/*.svg
-        if "/optimized/" not in member.name:
-            continue
-
-        if not member.name.endswith(".svg"):
-            continue
-
+    # Filter for paths matching */optimized/{size}/{style}/*.svg; only matching
+    # files are read
+    for member, content in archive.iter_files(
+        lambda name: "/optimized/" in name and name.endswith(".svg")
+    ):
         # Extract size, style, and filename from path
         # Example: "heroicons-2.2.0/optimized/24/outline/arrow-right.svg"
         # -> size = "24", style = "outline", filename = "arrow-right.svg"
@@ -94,9 +87,5 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Multi-variant, so output preserves variant prefix
         zip_path = f"{variant}/{filename}"
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
 
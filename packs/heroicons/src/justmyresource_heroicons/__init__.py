@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_heroicons._runtime import IconResourcePack
 
 
-class HeroiconsResourcePack(ZippedResourcePack):
+class HeroiconsResourcePack(IconResourcePack):
     """Resource pack for Heroicons.
 
     Provides access to 300+ SVG icons from Tailwind Labs, organized by
@@ -0,0 +1,416 @@
+# This file is generated by pack-tools from justmyresource_pack_tools/runtime/_discovery.py.
+# Do not edit manually; run `pack-tools sync-runtime` to update it.
+"""Installed-pack listing and discovery index reader for registries.
+
+Registries that resolve names across every installed icon pack use this
+module without importing pack-tools: it is vendored next to `_runtime.py`
+in every pack and needs nothing beyond the standard library, so it can be
+imported from any installed pack (e.g. `justmyresource_lucide._discovery`)
+or copied into the registry itself.
+
+- `installed_packs()` lists the packs registered under the
+  justmyresource.packs entry points. Listing them needs importlib.metadata
+  to scan every installed distribution, which takes tens of milliseconds in
+  large environments, so the result is kept in a JSON snapshot and reused
+  while the mtime of every sys.path directory is unchanged. Installing,
+  upgrading or removing a distribution adds or removes a directory in
+  site-packages and so changes its mtime.
+- `DiscoveryIndex` reads the merged index that `pack-tools discovery build`
+  writes (see `justmyresource_pack_tools.discovery` for the format) and
+  routes a lookup to the right pack, path and icons.zip offset with a
+  single bisect. The index records the mtime and size of each pack's
+  manifest and icons.zip; installing, upgrading or removing a pack changes
+  them, and `DiscoveryIndex.is_current()` reports the index as stale.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+from dataclasses import dataclass
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, NamedTuple
+
+ENTRY_POINT_GROUP = "justmyresource.packs"
+"""Entry point group that icon packs register under."""
+
+DISCOVERY_ENV = "JUSTMYRESOURCE_ICONS_DISCOVERY"
+"""Environment variable overriding the default index location."""
+
+SNAPSHOT_ENV = "JUSTMYRESOURCE_PACKS_SNAPSHOT"
+"""Environment variable overriding the default snapshot location."""
+
+SNAPSHOT_VERSION = 1
+
+DISCOVERY_MAGIC = b"JMRD"
+DISCOVERY_VERSION = 1
+DISCOVERY_HEADER = struct.Struct("<4sHHIIII")
+DISCOVERY_ENTRY = struct.Struct("<HHQIII")
+
+_CAMEL_BOUNDARY = re.compile(r"([a-z])([A-Z])")
+_HYPHENS = re.compile(r"-+")
+
+
+def name_key(name: str) -> str:
+    """Reduce a user-supplied name to its lookup key.
+
+    Must match `name_key()` in `_runtime.py` and
+    `justmyresource_pack_tools.names.name_key()`.
+
+    Args:
+        name: Resource name in any supported spelling.
+
+    Returns:
+        kebab-case name without the .svg extension.
+    """
+    if name.endswith(".svg"):
+        name = name[:-4]
+    base, dot, extension = name.rpartition(".")
+    if not dot:
+        base, extension = name, ""
+    else:
+        extension = "." + extension
+    result = _CAMEL_BOUNDARY.sub(r"\1-\2", base.replace("_", "-"))
+    return _HYPHENS.sub("-", result).strip("-").lower() + extension
+
+
+@dataclass(frozen=True, slots=True)
+class InstalledPack:
+    """Icon pack found through the justmyresource.packs entry points."""
+
+    name: str
+    """Entry point name (e.g., "lucide")."""
+    distribution: str
+    """Distribution name (e.g., "justmyresource-lucide")."""
+    version: str
+    """Installed distribution version."""
+    package: str
+    """Import name of the pack package (e.g., "justmyresource_lucide")."""
+    package_dir: Path
+    """Directory holding icons.zip and the other build artifacts."""
+    entry_point: str
+    """Entry point value (e.g., "justmyresource_lucide:get_resource_provider")."""
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the pack's pack_manifest.json."""
+        return self.package_dir / "pack_manifest.json"
+
+
+class DiscoveryEntry(NamedTuple):
+    """One icon that a lookup resolved to."""
+
+    pack: str
+    """Entry point name of the pack."""
+    path: str
+    """Zip path of the icon within the pack's icons.zip."""
+    method: int
+    """Zip compression method (0 stored, 8 deflated)."""
+    offset: int
+    """Offset of the compressed data within icons.zip."""
+    compress_size: int
+    """Compressed size in bytes."""
+    size: int
+    """Uncompressed size in bytes."""
+    crc: int
+    """CRC-32 of the uncompressed content."""
+
+
+def default_discovery_path() -> Path:
+    """Get the location of the discovery index for this environment.
+
+    Returns:
+        $JUSTMYRESOURCE_ICONS_DISCOVERY if set, else
+        <sys.prefix>/share/justmyresource/icons-discovery.idx.
+    """
+    override = os.environ.get(DISCOVERY_ENV)
+    if override:
+        return Path(override)
+    return Path(sys.prefix) / "share" / "justmyresource" / "icons-discovery.idx"
+
+
+def default_snapshot_path() -> Path:
+    """Get the location of the installed-pack snapshot for this environment.
+
+    Returns:
+        $JUSTMYRESOURCE_PACKS_SNAPSHOT if set, else
+        <sys.prefix>/share/justmyresource/packs-snapshot.json.
+    """
+    override = os.environ.get(SNAPSHOT_ENV)
+    if override:
+        return Path(override)
+    return Path(sys.prefix) / "share" / "justmyresource" / "packs-snapshot.json"
+
+
+def file_stamp(path: Path) -> list[int]:
+    """Get the (mtime in ns, size) of a file, used to detect changes.
+
+    Args:
+        path: File to stat.
+
+    Returns:
+        [mtime in nanoseconds, size in bytes].
+
+    Raises:
+        OSError: If the file cannot be stat'ed.
+    """
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def find_installed_packs() -> list[InstalledPack]:
+    """List installed packs that were built by pack-tools.
+
+    Packs are located without importing them. Entry points whose package
+    has no icons.zip (packs not built by pack-tools) are skipped.
+
+    Returns:
+        Installed packs, sorted by distribution and entry point name.
+    """
+    # Imported here: importlib.metadata alone costs tens of milliseconds,
+    # which a current snapshot saves.
+    from importlib.metadata import entry_points
+
+    packs = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        package = entry_point.module
+        spec = find_spec(package)
+        if spec is None or not spec.submodule_search_locations:
+            continue
+        package_dir = Path(next(iter(spec.submodule_search_locations)))
+        if not (package_dir / "icons.zip").is_file():
+            continue
+        dist = entry_point.dist
+        packs.append(
+            InstalledPack(
+                name=entry_point.name,
+                distribution=dist.name if dist else "unknown",
+                version=dist.version if dist else "",
+                package=package,
+                package_dir=package_dir,
+                entry_point=entry_point.value,
+            )
+        )
+    return sorted(packs, key=lambda pack: (pack.distribution, pack.name))
+
+
+def _path_stamps() -> list[list[Any]]:
+    """Get the mtime of every sys.path entry, used to detect installs.
+
+    The current directory ("") is not stamped; files written there would
+    otherwise invalidate the snapshot constantly.
+    """
+    stamps: list[list[Any]] = []
+    for entry in sys.path:
+        try:
+            stamps.append([entry, os.stat(entry).st_mtime_ns if entry else None])
+        except OSError:
+            stamps.append([entry, None])
+    return stamps
+
+
+def write_snapshot(packs: Iterable[InstalledPack], output_path: Path) -> None:
+    """Save a list of installed packs together with the sys.path stamps.
+
+    Args:
+        packs: Packs returned by find_installed_packs().
+        output_path: Path of the snapshot file to write; parent directories
+            are created.
+    """
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "sys_path": _path_stamps(),
+        "packs": [
+            {
+                "name": pack.name,
+                "distribution": pack.distribution,
+                "version": pack.version,
+                "package": pack.package,
+                "package_dir": str(pack.package_dir),
+                "entry_point": pack.entry_point,
+                "manifest": str(pack.manifest_path),
+            }
+            for pack in packs
+        ],
+    }
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+        os.replace(tmp_path, output_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def read_snapshot(path: Path) -> list[InstalledPack] | None:
+    """Load a snapshot written by write_snapshot() if it is still current.
+
+    Costs one stat call per sys.path entry.
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The installed packs, or None if the snapshot is missing, unreadable,
+        or sys.path or any of its directories changed since it was written.
+    """
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["version"] != SNAPSHOT_VERSION or data["sys_path"] != _path_stamps():
+            return None
+        return [
+            InstalledPack(
+                name=pack["name"],
+                distribution=pack["distribution"],
+                version=pack["version"],
+                package=pack["package"],
+                package_dir=Path(pack["package_dir"]),
+                entry_point=pack["entry_point"],
+            )
+            for pack in data["packs"]
+        ]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def installed_packs(
+    snapshot_path: Path | None = None, refresh: bool = False
+) -> list[InstalledPack]:
+    """List installed packs, from the snapshot when it is current.
+
+    A stale or missing snapshot is replaced after scanning the entry
+    points; if it cannot be written (read-only prefix), the scan result is
+    still returned.
+
+    Args:
+        snapshot_path: Snapshot file; defaults to default_snapshot_path().
+        refresh: Scan the entry points even if the snapshot is current.
+
+    Returns:
+        Installed packs, sorted by distribution and entry point name.
+    """
+    path = snapshot_path or default_snapshot_path()
+    if not refresh:
+        packs = read_snapshot(path)
+        if packs is not None:
+            return packs
+    packs = find_installed_packs()
+    try:
+        write_snapshot(packs, path)
+    except OSError:
+        pass
+    return packs
+
+
+class DiscoveryIndex:
+    """Parsed discovery index."""
+
+    def __init__(self, data: bytes) -> None:
+        """Parse an index buffer.
+
+        Args:
+            data: Contents of a file written by `pack-tools discovery build`.
+
+        Raises:
+            ValueError: If the data is not a supported index.
+        """
+        if len(data) < DISCOVERY_HEADER.size:
+            raise ValueError("Discovery index is truncated")
+        magic, version, _, _, keys, entries, table_size = DISCOVERY_HEADER.unpack_from(
+            data
+        )
+        if magic != DISCOVERY_MAGIC or version != DISCOVERY_VERSION:
+            raise ValueError("Unsupported discovery index format")
+        position = DISCOVERY_HEADER.size
+        self.packs: list[dict[str, Any]] = json.loads(
+            data[position : position + table_size]
+        )
+        """Pack records, in lookup priority order."""
+        position += table_size
+        self._starts = array("I")
+        self._starts.frombytes(data[position : position + 4 * (keys + 1)])
+        if sys.byteorder == "big":
+            self._starts.byteswap()
+        position += 4 * (keys + 1)
+        self._entries = data[position : position + DISCOVERY_ENTRY.size * entries]
+        position += DISCOVERY_ENTRY.size * entries
+        text = data[position:].decode("utf-8").split("\n") if keys else []
+        if len(text) != keys + entries or len(self._starts) != keys + 1:
+            raise ValueError("Discovery index is truncated")
+        self._keys = text[:keys]
+        self._paths = text[keys:]
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> DiscoveryIndex | None:
+        """Load a discovery index if it exists and is current.
+
+        Args:
+            path: Index file; defaults to default_discovery_path().
+
+        Returns:
+            The index, or None if it is missing, unreadable or stale.
+        """
+        try:
+            index = cls((path or default_discovery_path()).read_bytes())
+        except (OSError, ValueError):
+            return None
+        return index if index.is_current() else None
+
+    def is_current(self) -> bool:
+        """Check that no indexed pack was changed or removed since the build.
+
+        Costs two stat calls per pack.
+
+        Returns:
+            True if every pack's manifest and icons.zip are unchanged.
+        """
+        for pack in self.packs:
+            for path, mtime_ns, size in pack["stamps"].values():
+                try:
+                    if file_stamp(Path(path)) != [mtime_ns, size]:
+                        return False
+                except OSError:
+                    return False
+        return True
+
+    def lookup(self, name: str) -> list[DiscoveryEntry]:
+        """Find every installed icon matching a name.
+
+        Args:
+            name: Resource name in any accepted spelling, optionally with a
+                variant prefix ("bold/house") and/or a pack name or prefix
+                ("lucide:house").
+
+        Returns:
+            Matching entries, in pack priority order and with each pack's
+            default variant first.
+        """
+        pack_prefix, _, name = name.rpartition(":")
+        variant, _, base = name_key(name).rpartition("/")
+        path_prefix = f"{variant}/" if variant else ""
+        packs = {
+            number
+            for number, pack in enumerate(self.packs)
+            if not pack_prefix
+            or pack_prefix == pack["name"]
+            or pack_prefix in pack["prefixes"]
+        }
+        i = bisect_left(self._keys, base)
+        if i == len(self._keys) or self._keys[i] != base:
+            return []
+        found = []
+        for number in range(self._starts[i], self._starts[i + 1]):
+            pack, *record = DISCOVERY_ENTRY.unpack_from(
+                self._entries, number * DISCOVERY_ENTRY.size
+            )
+            path = self._paths[number]
+            if pack in packs and path.startswith(path_prefix):
+                found.append(DiscoveryEntry(self.packs[pack]["name"], path, *record))
+        return found
@@ -1,26 +1,33 @@
 """Build script for Lucide icon pack.
 
 Extracts SVGs from the upstream tar.gz archive and repackages them
-into a standardized icons.zip format.
+into a standardized icons.zip format. Tags, categories and upstream aliases
+(renamed icons) are read from the per-icon JSON metadata in the same pass.
 """
 
 from __future__ import annotations
 
+import json
 from collections.abc import Iterator
 from pathlib import Path
 
 from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.names import NameAlias
 from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.tags import IconMetadata
 
 
-def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry]:
+def extract(
+    archive: ArchiveReader, config: UpstreamConfig
+) -> Iterator[ZipEntry | IconMetadata | NameAlias]:
     """Extract icons from Lucide upstream archive.
 
     Lucide archive structure (tar.gz from GitHub):
         lucide-{tag}/
           icons/
             arrow-down.svg
+            arrow-down.json   (tags, categories, aliases)
             alarm-clock.svg
             ...
 
@@ -34,19 +41,30 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         config: Upstream configuration loaded from upstream.toml.
 
     Yields:
-        ZipEntry objects with normalized paths and content.
+        ZipEntry objects with normalized paths and content, an IconMetadata
+        record per icon JSON file, and a NameAlias per former name listed
+        under "aliases" (as strings or {"name": ...} objects).
     """
-    for member in archive.getmembers():
-        # Only process SVG files in the icons/ directory
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */icons/*.svg
-        # Skip nested directories like icons/categories/
-        if "/icons/" not in member.name:
-            continue
-
-        if not member.name.endswith(".svg"):
+    # Filter for paths matching */icons/*.svg or *.json; only matching files
+    # are read
+    for member, content in archive.iter_files(
+        lambda name: "/icons/" in name and name.endswith((".svg", ".json"))
+    ):
+        if member.name.endswith(".json"):
+            try:
+                metadata = json.loads(content)
+            except ValueError:
+                continue
+            icon_name = Path(member.name).stem
+            yield IconMetadata(
+                path=f"{icon_name}.svg",
+                tags=tuple(metadata.get("tags", [])),
+                categories=tuple(metadata.get("categories", [])),
+            )
+            for alias in metadata.get("aliases", []):
+                alias_name = alias.get("name") if isinstance(alias, dict) else alias
+                if isinstance(alias_name, str):
+                    yield NameAlias(alias=alias_name, target=icon_name)
             continue
 
         # Extract just the filename (e.g., "arrow-down.svg")
@@ -57,9 +75,4 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Single variant, so output is flat
         zip_path = filename
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
-
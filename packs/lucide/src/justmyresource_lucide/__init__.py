@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_lucide._runtime import IconResourcePack
 
 
-class LucideResourcePack(ZippedResourcePack):
+class LucideResourcePack(IconResourcePack):
     """Resource pack for Lucide icons.
 
     Provides access to 1500+ SVG icons from the Lucide icon library.
@@ -1,20 +1,31 @@
 """Build script for Material Design Icons (Community) icon pack.
 
 Extracts SVGs from the upstream zip archive and repackages them
-into a standardized icons.zip format.
+into a standardized icons.zip format. Tags and upstream aliases are read
+from meta.json.
 """
 
 from __future__ import annotations
 
+import json
 from collections.abc import Iterator
 from pathlib import Path
 
 from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.names import NameAlias
 from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.tags import IconMetadata
 
 
-def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry]:
+def _is_meta_json(name: str) -> bool:
+    """Check whether an archive member is the root meta.json."""
+    return name.count("/") == 1 and name.endswith("/meta.json")
+
+
+def extract(
+    archive: ArchiveReader, config: UpstreamConfig
+) -> Iterator[ZipEntry | IconMetadata | NameAlias]:
     """Extract icons from Material Design Icons (Community) upstream archive.
 
     Material Design Icons (Community) archive structure (zip from GitHub):
@@ -26,6 +37,7 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
             ...
           templates/
             ...
+          meta.json   (names, tags, aliases)
 
     Output structure (flat, single variant):
         ab-testing.svg
@@ -38,19 +50,22 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         config: Upstream configuration loaded from upstream.toml.
 
     Yields:
-        ZipEntry objects with normalized paths and content.
+        ZipEntry objects with normalized paths and content, an IconMetadata
+        record per icon listed in meta.json, and a NameAlias per alias it
+        lists.
     """
-    for member in archive.getmembers():
-        # Only process SVG files
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */svg/*.svg
-        # Exclude templates/ directory
-        if "/svg/" not in member.name:
-            continue
-
-        if not member.name.endswith(".svg"):
+    # Filter for paths matching */svg/*.svg (excludes templates/ directory)
+    # and the root meta.json; only matching files are read
+    for member, content in archive.iter_files(
+        lambda name: ("/svg/" in name and name.endswith(".svg")) or _is_meta_json(name)
+    ):
+        if _is_meta_json(member.name):
+            for icon in json.loads(content):
+                yield IconMetadata(
+                    path=f"{icon['name']}.svg", tags=tuple(icon.get("tags", []))
+                )
+                for alias in icon.get("aliases", []):
+                    yield NameAlias(alias=alias, target=icon["name"])
             continue
 
         # Extract just the filename (e.g., "ab-testing.svg")
@@ -61,9 +76,4 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Single variant, so output is flat
         zip_path = filename
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
-
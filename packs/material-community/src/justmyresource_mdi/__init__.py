@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_mdi._runtime import IconResourcePack
 
 
-class MDIResourcePack(ZippedResourcePack):
+class MDIResourcePack(IconResourcePack):
     """Resource pack for Material Design Icons (Community).
 
     Provides access to 7000+ SVG icons from the Pictogrammers community.
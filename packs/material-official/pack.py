@@ -1,7 +1,8 @@
 """Build script for Material Design Icons (Official) icon pack.
 
 Extracts SVGs from the upstream tar.gz archive and repackages them
-into a standardized icons.zip format with variant prefixes.
+into a standardized icons.zip format with variant prefixes. The upstream
+category directory of each icon is kept as its category.
 """
 
 from __future__ import annotations
@@ -13,6 +14,7 @@ from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
 from justmyresource_pack_tools.normalize import to_kebab_case
 from justmyresource_pack_tools.repack import ZipEntry
+from justmyresource_pack_tools.tags import IconMetadata
 
 # Variant directory name mapping
 VARIANT_MAP = {
@@ -24,7 +26,9 @@ VARIANT_MAP = {
 }
 
 
-def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry]:
+def extract(
+    archive: ArchiveReader, config: UpstreamConfig
+) -> Iterator[ZipEntry | IconMetadata]:
     """Extract icons from Material Design Icons (Official) upstream archive.
 
     Material Design Icons (Official) archive structure (tar.gz from GitHub):
@@ -51,23 +55,17 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         config: Upstream configuration loaded from upstream.toml.
 
     Yields:
-        ZipEntry objects with normalized paths and content.
+        ZipEntry objects with normalized paths and content, each followed by
+        an IconMetadata record with its category.
     """
     # Get allowed variants from config
     allowed_variants = set(config.pack.variants)
 
-    for member in archive.getmembers():
-        # Only process SVG files
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */src/{category}/{icon_name}/{variant_dir}/24px.svg
-        if "/src/" not in member.name:
-            continue
-
-        if not member.name.endswith("24px.svg"):
-            continue
-
+    # Filter for paths matching */src/{category}/{icon_name}/{variant_dir}/24px.svg;
+    # the tarball is decompressed in a single pass and only matching files are read
+    for member, content in archive.iter_files(
+        lambda name: "/src/" in name and name.endswith("24px.svg")
+    ):
         # Extract category, icon_name, and variant_dir from path
         # Example: "material-design-icons-4.0.0/src/action/account_balance/materialiconsoutlined/24px.svg"
         # -> category = "action", icon_name = "account_balance", variant_dir = "materialiconsoutlined"
@@ -101,9 +99,6 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Multi-variant, so output preserves variant prefix
         zip_path = f"{variant}/{normalized_name}.svg"
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
+        yield IconMetadata(path=zip_path, categories=(category,))
 
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_material_icons._runtime import IconResourcePack
 
 
-class MaterialIconsResourcePack(ZippedResourcePack):
+class MaterialIconsResourcePack(IconResourcePack):
     """Resource pack for Material Design Icons (Official).
 
     Provides access to 2500+ SVG icons from Google's Material Design icon set
@@ -11,6 +11,7 @@ from pathlib import Path
 
 from justmyresource_pack_tools.archive import ArchiveReader
 from justmyresource_pack_tools.config import UpstreamConfig
+from justmyresource_pack_tools.names import NameAlias
 from justmyresource_pack_tools.repack import ZipEntry
 
 
@@ -59,18 +60,10 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
     # Get allowed variants from config
     allowed_variants = set(config.pack.variants)
 
-    for member in archive.getmembers():
-        # Only process SVG files
-        if not member.isfile():
-            continue
-
-        # Filter for paths matching */assets/{weight}/*.svg
-        if "/assets/" not in member.name:
-            continue
-
-        if not member.name.endswith(".svg"):
-            continue
-
+    # Filter for paths matching */assets/{weight}/*.svg; only matching files are read
+    for member, content in archive.iter_files(
+        lambda name: "/assets/" in name and name.endswith(".svg")
+    ):
         # Extract weight and filename from path
         # Example: "phosphor-icons-core-2.0.8/assets/regular/arrow-right.svg"
         # -> weight = "regular", filename = "arrow-right.svg"
@@ -94,9 +87,28 @@ def extract(archive: ArchiveReader, config: UpstreamConfig) -> Iterator[ZipEntry
         # Multi-variant, so output preserves weight prefix
         zip_path = f"{weight}/{filename}"
 
-        # Read file content
-        with archive.extractfile(member) as f:
-            content = f.read()
-
         yield ZipEntry(path=zip_path, content=content)
 
+
+def name_aliases(config: UpstreamConfig, paths: list[str]) -> Iterator[NameAlias]:
+    """Accept Phosphor weight names without the weight suffix.
+
+    Upstream file names outside the regular weight carry the weight as a
+    suffix ("bold/arrow-right-bold.svg"), so "bold/arrow-right" is accepted
+    as well.
+
+    Args:
+        config: Upstream configuration loaded from upstream.toml.
+        paths: Every zip path in the built pack.
+
+    Yields:
+        NameAlias objects mapping unsuffixed names to suffixed icons.
+    """
+    for path in paths:
+        weight, _, filename = path.partition("/")
+        stem = Path(filename).stem
+        suffix = f"-{weight}"
+        if weight != config.pack.default_variant and stem.endswith(suffix):
+            yield NameAlias(
+                alias=f"{weight}/{stem[: -len(suffix)]}", target=f"{weight}/{stem}"
+            )
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource_phosphor._runtime import IconResourcePack
 
 
-class PhosphorResourcePack(ZippedResourcePack):
+class PhosphorResourcePack(IconResourcePack):
     """Resource pack for Phosphor Icons.
 
     Provides access to 1200+ SVG icons with flexible weight system:
@@ -0,0 +1,2314 @@
+# This file is generated by pack-tools from justmyresource_pack_tools/runtime/_runtime.py.
+# Do not edit manually; run `pack-tools sync-runtime` to update it.
+"""Shared runtime for JustMyResource icon packs.
+
+Provides `IconResourcePack`, the `ZippedResourcePack` subclass used by every
+pack in this repository. It understands the optional artifacts that
+pack-tools writes next to icons.zip:
+
+- icon_aliases.json: names whose content is byte-identical to another icon
+  and is therefore stored only once in icons.zip.
+- icon_names.json: lookup keys of alternative spellings (snake_case,
+  camelCase, upstream aliases) mapped to zip paths. Names are reduced to a
+  key with `name_key()` and resolved with a single dict probe, falling back
+  to `_normalize_name()`.
+- icons.idx: a sorted binary name → offset index (see
+  `justmyresource_pack_tools.index` for the format). When present and
+  matching icons.zip, lookups binary-search it and read the entry's bytes
+  directly, without parsing the zip central directory. Without it, the
+  central directory is read once into an `IconDirectory`, which keeps
+  names and entry fields in compact `array` columns rather than holding
+  one `ZipInfo` object per icon, and is searched the same way.
+- icons.bloom: a Bloom filter of every zip path (see
+  `justmyresource_pack_tools.bloom`). Names it rejects are reported missing
+  without loading the index or reading icons.zip, so probing a pack for a
+  name it lacks is cheap; `has_resource()` is the intended probe.
+- icons.search: sorted search keys and trigram postings (see
+  `justmyresource_pack_tools.search`), loaded once and used by `search()`
+  for prefix, substring and fuzzy name queries.
+- icons.tags: upstream tags and categories as an inverted index (see
+  `justmyresource_pack_tools.tags`), so `get_tagged()` and `get_category()`
+  never decompress an SVG.
+- icons.encoded: every icon precompressed at build time in HTTP content
+  codings such as gzip and br (see `justmyresource_pack_tools.encodings`),
+  served by `get_encoded()` with one seek and read.
+
+`get_compressed()` returns an icon's payload exactly as stored in icons.zip
+(a raw deflate stream, or the plain bytes of a stored entry) together with
+its CRC-32 and size. `CompressedResource.to_gzip()` wraps it as a gzip
+member, so HTTP servers can answer `Content-Encoding: gzip` without
+inflating or recompressing anything.
+
+With an index, reads can also go through a read-only memory map of
+icons.zip (`reader="mmap"`). The map is created once per pack instance and
+shared by all threads without locking; stored entries are returned by
+`get_resource_view()` as zero-copy views.
+
+Decompressed icons can be kept in a thread-safe LRU cache bounded by total
+bytes (`cache_bytes=`). It is off by default.
+
+Pre-forked servers can instead share one decompressed copy of each pack
+between all their worker processes (`shared_cache=True`, see
+`SharedIconCache`). The first process to read an icon decompresses the
+whole pack into a file under /dev/shm (or the temp directory), and every
+process then maps that file read-only, so the pages are shared. Or the
+master process calls `warm()` before forking, to decompress selected icons
+into an anonymous shared map that the workers inherit.
+
+`aget_resource()` and `aget_many()` are asyncio counterparts of the getters.
+Reads run on a small per-pack thread pool (`async_workers=`), so cold reads
+never block the event loop, and concurrent awaits of the same icon share a
+single read.
+
+Construction is free of file I/O: the manifest, index, aliases and zip are
+all loaded on first use, and asyncio and the thread pool are only imported
+by the async getters. Discovering every installed pack through its entry
+point therefore costs little more than importing it.
+
+Every constructor option can also be set without touching
+`get_resource_provider()`, through environment variables: a per-pack
+variable named after the package (e.g. JUSTMYRESOURCE_LUCIDE_CACHE_BYTES)
+takes precedence over one for all packs (JUSTMYRESOURCE_ICONS_CACHE_BYTES).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+import zipfile
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from importlib.resources import files
+from typing import IO, TYPE_CHECKING, Any, BinaryIO, NamedTuple
+
+from justmyresource.pack_utils import ZippedResourcePack
+from justmyresource.types import PackInfo, ResourceContent
+
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+ALIASES_NAME = "icon_aliases.json"
+"""Alias table written by pack-tools when [compression] dedupe is enabled."""
+
+INDEX_NAME = "icons.idx"
+INDEX_MAGIC = b"JMRI"
+INDEX_VERSION = 2
+INDEX_HEADER = struct.Struct("<4sHHIQ")
+INDEX_RECORD = struct.Struct("<IHHQIII")
+
+BLOOM_NAME = "icons.bloom"
+BLOOM_MAGIC = b"JMRB"
+BLOOM_VERSION = 2
+BLOOM_HEADER = struct.Struct("<4sHHIIQ")
+
+SEARCH_NAME = "icons.search"
+SEARCH_MAGIC = b"JMRS"
+SEARCH_VERSION = 2
+SEARCH_HEADER = struct.Struct("<4sHHIIIIQ")
+
+TAGS_NAME = "icons.tags"
+TAGS_MAGIC = b"JMRT"
+TAGS_VERSION = 2
+TAGS_HEADER = struct.Struct("<4sHHIIIIQ")
+
+ENCODED_NAME = "icons.encoded"
+ENCODED_MAGIC = b"JMRE"
+ENCODED_VERSION = 2
+ENCODED_HEADER = struct.Struct("<4sHHIIQ")
+ENCODED_RECORD = struct.Struct("<QI")
+
+SHARED_MAGIC = b"JMRC"
+SHARED_VERSION = 2
+SHARED_HEADER = struct.Struct("=4sHHQQ")
+
+METHOD_STORED = 0
+METHOD_DEFLATED = 8
+
+LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+LOCAL_HEADER_MAGIC = b"PK\x03\x04"
+
+END_RECORD = struct.Struct("<4s4H2IH")
+END_RECORD_MAGIC = b"PK\x05\x06"
+
+GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+"""gzip member header: deflate, no flags, no mtime, unknown OS."""
+GZIP_TRAILER = struct.Struct("<II")
+
+NAMES_NAME = "icon_names.json"
+"""Name table written by pack-tools (see justmyresource_pack_tools.names)."""
+
+_CAMEL_BOUNDARY = re.compile(r"([a-z])([A-Z])")
+_HYPHENS = re.compile(r"-+")
+
+
+def name_key(name: str) -> str:
+    """Reduce a user-supplied name to its lookup key.
+
+    Must match `justmyresource_pack_tools.names.name_key()`, which applies
+    `normalize.to_kebab_case()` after stripping ".svg".
+
+    Args:
+        name: Resource name in any supported spelling.
+
+    Returns:
+        kebab-case name without the .svg extension.
+    """
+    if name.endswith(".svg"):
+        name = name[:-4]
+    base, dot, extension = name.rpartition(".")
+    if not dot:
+        base, extension = name, ""
+    else:
+        extension = "." + extension
+    result = _CAMEL_BOUNDARY.sub(r"\1-\2", base.replace("_", "-"))
+    return _HYPHENS.sub("-", result).strip("-").lower() + extension
+
+
+def normalize_term(term: str) -> str:
+    """Normalize a tag or category like `justmyresource_pack_tools.tags`."""
+    return " ".join(term.split()).lower()
+
+
+SETTINGS_ENV_PREFIX = "JUSTMYRESOURCE_ICONS_"
+"""Prefix of environment variables that apply to every pack."""
+
+READERS = ("file", "mmap")
+"""Reader backends: a file handle per read, or a shared memory map."""
+
+SIDECARS = (INDEX_NAME, BLOOM_NAME, SEARCH_NAME, TAGS_NAME, ENCODED_NAME)
+"""Optional accelerator files that `skip_sidecars` can turn off."""
+
+
+def get_setting(package_name: str, key: str) -> str | None:
+    """Read a runtime option from the environment.
+
+    Args:
+        package_name: Pack package name (e.g., "justmyresource_lucide").
+        key: Option name (e.g., "CACHE_BYTES").
+
+    Returns:
+        Value of JUSTMYRESOURCE_<PACK>_<KEY> if set, else of
+        JUSTMYRESOURCE_ICONS_<KEY>, else None.
+    """
+    for name in (f"{package_name.upper()}_{key}", f"{SETTINGS_ENV_PREFIX}{key}"):
+        value = os.environ.get(name)
+        if value:
+            return value
+    return None
+
+
+def _enabled(value: str | None) -> bool:
+    """Interpret an on/off setting."""
+    return (value or "").lower() in ("1", "true", "yes", "on")
+
+
+def shared_cache_dir(package_name: str) -> str:
+    """Get the directory holding the shared caches of this user's packs.
+
+    Args:
+        package_name: Pack package name, for the per-pack setting.
+
+    Returns:
+        The SHARED_CACHE_DIR setting if set, else a per-user directory in
+        /dev/shm when it exists (memory-backed on Linux), else in the
+        temporary directory.
+    """
+    configured = get_setting(package_name, "SHARED_CACHE_DIR")
+    if configured:
+        return configured
+    if not hasattr(os, "getuid"):
+        # Windows: the temporary directory is already per user
+        return os.path.join(tempfile.gettempdir(), "justmyresource")
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, f"justmyresource-{os.getuid()}")
+
+
+@contextmanager
+def _host_lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock shared by every process on the host.
+
+    The lock only stops workers from filling the same cache at once; the
+    atomic rename that publishes a cache is what keeps readers safe, so
+    platforms without fcntl simply go without it.
+
+    Args:
+        path: Lock file, created if missing.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process still exists on this host.
+
+    Args:
+        pid: Process ID.
+
+    Returns:
+        False only if the process is known to have exited. On Windows,
+        where os.kill() would terminate the process, always True.
+    """
+    if os.name == "nt":
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+def zip_stamp(f: IO[bytes]) -> int:
+    """Fingerprint icons.zip, to tell which build a sidecar file describes.
+
+    This is the CRC-32 of the central directory in the high 32 bits and the
+    low 32 bits of the file size. The central directory records every entry's
+    CRC-32, so a rebuild of the same size still gets a new stamp. Must match
+    `justmyresource_pack_tools.index.zip_stamp()`.
+
+    Args:
+        f: The zip, opened in binary mode.
+
+    Returns:
+        The stamp.
+
+    Raises:
+        ValueError: If the file has no end of central directory record.
+    """
+    size = f.seek(0, 2)
+    tail_size = min(size, END_RECORD.size + 0xFFFF)
+    f.seek(size - tail_size)
+    tail = f.read(tail_size)
+    end = tail.rfind(END_RECORD_MAGIC)
+    if end < 0 or len(tail) - end < END_RECORD.size:
+        raise ValueError("Not a zip file")
+    f.seek(min(END_RECORD.unpack_from(tail, end)[6], size))
+    return (zlib.crc32(f.read()) << 32) | (size & 0xFFFFFFFF)
+
+
+class CompressedResource(NamedTuple):
+    """Payload of an icon as stored in icons.zip."""
+
+    data: bytes | memoryview
+    """Raw deflate stream, or the content itself for stored entries."""
+    method: int
+    """METHOD_DEFLATED or METHOD_STORED."""
+    size: int
+    """Uncompressed size in bytes."""
+    crc: int
+    """CRC-32 of the uncompressed content."""
+
+    def to_gzip(self) -> bytes:
+        """Wrap the payload as a gzip member without recompressing it.
+
+        Deflated payloads are framed as they are. Stored payloads are
+        framed as uncompressed deflate blocks, which costs a copy but no
+        compression.
+
+        Note that HTTP's `Content-Encoding: deflate` means a zlib stream,
+        whose Adler-32 checksum cannot be computed without the uncompressed
+        bytes; gzip only needs the stored CRC-32 and size.
+
+        Returns:
+            A complete gzip member (RFC 1952).
+        """
+        trailer = GZIP_TRAILER.pack(self.crc, self.size & 0xFFFFFFFF)
+        if self.method == METHOD_DEFLATED:
+            return b"".join((GZIP_HEADER, self.data, trailer))
+        parts: list[bytes | memoryview] = [GZIP_HEADER]
+        data = memoryview(self.data)
+        for start in range(0, max(len(data), 1), 0xFFFF):
+            block = data[start : start + 0xFFFF]
+            final = start + 0xFFFF >= len(data)
+            parts.append(struct.pack("<BHH", final, len(block), len(block) ^ 0xFFFF))
+            parts.append(block)
+        parts.append(trailer)
+        return b"".join(parts)
+
+
+class CacheInfo(NamedTuple):
+    """Counters of a ByteLRUCache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class ByteLRUCache:
+    """Thread-safe LRU cache bounded by the total size of its values.
+
+    Values larger than the whole budget are never stored.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize cache.
+
+        Args:
+            max_bytes: Upper bound on the summed length of cached values.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Look up a value and mark it as most recently used.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            Cached value, or None on a miss.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store a value, evicting least recently used values to make room.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+        """
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            while self._size + size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._evictions += 1
+            self._entries[key] = value
+            self._size += size
+
+    def clear(self) -> None:
+        """Drop every cached value. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def info(self) -> CacheInfo:
+        """Get a snapshot of the cache counters.
+
+        Returns:
+            CacheInfo with hit, miss and eviction counts and current size.
+        """
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size,
+                max_bytes=self.max_bytes,
+            )
+
+
+class IconIndex:
+    """Read-only view of an icons.idx buffer.
+
+    Lookups binary-search the fixed-size records in place, so loading an
+    index costs one file read regardless of the number of icons.
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Parse the index header.
+
+        Args:
+            data: Contents of icons.idx.
+
+        Raises:
+            ValueError: If the data is not a supported index.
+        """
+        if len(data) < INDEX_HEADER.size:
+            raise ValueError("Index is truncated")
+        magic, version, _, count, stamp = INDEX_HEADER.unpack_from(data)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            raise ValueError("Unsupported index format")
+        self._data = data
+        self._count = count
+        self._names_offset = INDEX_HEADER.size + count * INDEX_RECORD.size
+        if len(data) < self._names_offset:
+            raise ValueError("Index is truncated")
+        self.zip_stamp: int = stamp
+        """zip_stamp() of the icons.zip this index was built for."""
+
+    def __len__(self) -> int:
+        """Get the number of names in the index, including aliases."""
+        return int(self._count)
+
+    def _record(self, i: int) -> tuple[int, int, int, int, int, int, int]:
+        """Unpack the i-th record."""
+        return INDEX_RECORD.unpack_from(
+            self._data, INDEX_HEADER.size + i * INDEX_RECORD.size
+        )
+
+    def _name(self, record: tuple[int, ...]) -> bytes:
+        """Get the encoded name of a record."""
+        start = self._names_offset + record[0]
+        return self._data[start : start + record[1]]
+
+    def find(self, name: str) -> tuple[int, int, int, int, int] | None:
+        """Look up an entry by its path in icons.zip.
+
+        Args:
+            name: Normalized resource name.
+
+        Returns:
+            (method, data offset, compressed size, size, CRC-32), or None if
+            the name is not in the index.
+        """
+        key = name.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            if self._name(record) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            record = self._record(lo)
+            if self._name(record) == key:
+                return record[2:]
+        return None
+
+    def entries(self) -> list[tuple[int, int, int, int, int]]:
+        """Get every distinct entry, in icons.zip order.
+
+        Returns:
+            Records as returned by find(); aliases share their target's.
+        """
+        records = {self._record(i)[2:] for i in range(self._count)}
+        return sorted(records, key=lambda entry: entry[1])
+
+    def names(self) -> list[str]:
+        """Decode every name in the index.
+
+        Returns:
+            Names in sorted order.
+        """
+        return [self._name(self._record(i)).decode("utf-8") for i in range(self._count)]
+
+
+class IconDirectory:
+    """Compact in-memory directory of icons.zip, for packs without icons.idx.
+
+    Built once from the zip central directory. Names are interned in one
+    sorted UTF-8 blob and the entry fields are kept in `array` columns, so an
+    icon costs a few dozen bytes instead of a `ZipInfo` object and its slot
+    in zipfile's name dict. Lookups binary-search the blob, and the interface
+    matches `IconIndex`.
+    """
+
+    def __init__(self, f: IO[bytes], aliases: dict[str, str]) -> None:
+        """Read the central directory and local headers of icons.zip.
+
+        Args:
+            f: icons.zip, opened in binary mode.
+            aliases: Alias → stored path table; each alias gets its stored
+                entry's fields.
+
+        Raises:
+            ValueError: If the zip is unreadable, or an entry is malformed or
+                uses a method other than stored and deflated.
+        """
+        try:
+            with zipfile.ZipFile(f) as zip_file:
+                infos = zip_file.infolist()
+        except zipfile.BadZipFile as e:
+            raise ValueError(f"Cannot read zip directory: {e}") from e
+        entries: dict[str, tuple[int, int, int, int, int]] = {}
+        for info in infos:
+            if info.is_dir():
+                continue
+            if info.compress_type not in (METHOD_STORED, METHOD_DEFLATED):
+                raise ValueError(f"Unsupported compression method for {info.filename}")
+            f.seek(info.header_offset)
+            header = f.read(LOCAL_HEADER.size)
+            if len(header) < LOCAL_HEADER.size or not header.startswith(
+                LOCAL_HEADER_MAGIC
+            ):
+                raise ValueError(f"Bad local header for {info.filename}")
+            fields = LOCAL_HEADER.unpack(header)
+            entries[info.filename] = (
+                info.compress_type,
+                info.header_offset + LOCAL_HEADER.size + fields[-2] + fields[-1],
+                info.compress_size,
+                info.file_size,
+                info.CRC,
+            )
+        del infos
+        for alias, stored_path in aliases.items():
+            entry = entries.get(stored_path)
+            if entry is not None:
+                entries[alias] = entry
+
+        rows = sorted((name.encode("utf-8"), entry) for name, entry in entries.items())
+        self._names = b"".join(name for name, _ in rows)
+        self._starts = array("I", [0])
+        self._methods = array("B")
+        self._offsets = array("Q")
+        self._compressed_sizes = array("I")
+        self._sizes = array("I")
+        self._crcs = array("I")
+        end = 0
+        for name, (method, offset, compress_size, file_size, crc) in rows:
+            end += len(name)
+            self._starts.append(end)
+            self._methods.append(method)
+            self._offsets.append(offset)
+            self._compressed_sizes.append(compress_size)
+            self._sizes.append(file_size)
+            self._crcs.append(crc)
+        self.zip_stamp: int = zip_stamp(f)
+        """zip_stamp() of the icons.zip this directory was read from."""
+
+    def __len__(self) -> int:
+        """Get the number of names, including aliases."""
+        return len(self._methods)
+
+    def _name(self, i: int) -> bytes:
+        """Get the encoded i-th name."""
+        return self._names[self._starts[i] : self._starts[i + 1]]
+
+    def _entry(self, i: int) -> tuple[int, int, int, int, int]:
+        """Assemble the i-th entry from the columns."""
+        return (
+            self._methods[i],
+            self._offsets[i],
+            self._compressed_sizes[i],
+            self._sizes[i],
+            self._crcs[i],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the names blob and the columns, in bytes."""
+        columns = (
+            self._starts,
+            self._methods,
+            self._offsets,
+            self._compressed_sizes,
+            self._sizes,
+            self._crcs,
+        )
+        return len(self._names) + sum(len(c) * c.itemsize for c in columns)
+
+    def find(self, name: str) -> tuple[int, int, int, int, int] | None:
+        """Look up an entry by its path in icons.zip.
+
+        Args:
+            name: Normalized resource name.
+
+        Returns:
+            (method, data offset, compressed size, size, CRC-32), as
+            returned by IconIndex.find(), or None if the name is not in the
+            zip.
+        """
+        key = name.encode("utf-8")
+        lo, hi = 0, len(self._methods)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._name(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._methods) and self._name(lo) == key:
+            return self._entry(lo)
+        return None
+
+    def entries(self) -> list[tuple[int, int, int, int, int]]:
+        """Get every distinct entry, in icons.zip order.
+
+        Returns:
+            Records as returned by find(); aliases share their target's.
+        """
+        records = {self._entry(i) for i in range(len(self._methods))}
+        return sorted(records, key=lambda entry: entry[1])
+
+    def names(self) -> list[str]:
+        """Decode every name in the directory.
+
+        Returns:
+            Names in sorted order.
+        """
+        return [self._name(i).decode("utf-8") for i in range(len(self._methods))]
+
+
+class BloomFilter:
+    """Read-only view of an icons.bloom buffer."""
+
+    def __init__(self, data: bytes) -> None:
+        """Parse the filter header.
+
+        Args:
+            data: Contents of icons.bloom.
+
+        Raises:
+            ValueError: If the data is not a supported filter.
+        """
+        if len(data) < BLOOM_HEADER.size:
+            raise ValueError("Filter is truncated")
+        magic, version, hashes, bits, _, stamp = BLOOM_HEADER.unpack_from(data)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION or not bits:
+            raise ValueError("Unsupported filter format")
+        if len(data) < BLOOM_HEADER.size + (bits + 7) // 8:
+            raise ValueError("Filter is truncated")
+        self._bits_data = data[BLOOM_HEADER.size :]
+        self._hashes = hashes
+        self._bits = bits
+        self.zip_stamp: int = stamp
+        """zip_stamp() of the icons.zip this filter was built for."""
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a zip path may be in the pack.
+
+        Returns:
+            False if the name is certainly absent; True if it is probably
+            present.
+        """
+        if not isinstance(name, str):
+            return False
+        digest = hashlib.blake2b(name.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        data, bits = self._bits_data, self._bits
+        for i in range(self._hashes):
+            position = (h1 + i * h2) % bits
+            if not data[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+
+def _trigrams(key: str) -> set[str]:
+    """Split a search key into its distinct three-character substrings."""
+    return {key[i : i + 3] for i in range(len(key) - 2)}
+
+
+class SearchIndex:
+    """Parsed icons.search: sorted keys and trigram postings.
+
+    Queries are matched against search keys (base names without variant or
+    extension). Results are ranked exact match, then prefix matches in key
+    order, then keys containing the query (shortest first), then keys
+    sharing at least half of the query's trigrams (most shared first).
+    """
+
+    def __init__(self, data: bytes) -> None:
+        """Parse an index buffer.
+
+        Args:
+            data: Contents of icons.search.
+
+        Raises:
+            ValueError: If the data is not a supported index.
+        """
+        if len(data) < SEARCH_HEADER.size:
+            raise ValueError("Search index is truncated")
+        magic, version, _, keys, paths, trigrams, postings, stamp = (
+            SEARCH_HEADER.unpack_from(data)
+        )
+        if magic != SEARCH_MAGIC or version != SEARCH_VERSION:
+            raise ValueError("Unsupported search index format")
+        arrays = array("I")
+        end = SEARCH_HEADER.size + 4 * (keys + 1 + trigrams + 1 + postings)
+        arrays.frombytes(data[SEARCH_HEADER.size : end])
+        if sys.byteorder == "big":
+            arrays.byteswap()
+        text = data[end:].decode("utf-8").split("\n") if keys else []
+        if len(text) != keys + paths + trigrams:
+            raise ValueError("Search index is truncated")
+        self._keys = text[:keys]
+        self._paths = text[keys : keys + paths]
+        self._starts = arrays[: keys + 1]
+        offsets = arrays[keys + 1 : keys + trigrams + 2]
+        self._posting_data = arrays[keys + trigrams + 2 :]
+        self._trigrams = {
+            trigram: (offsets[i], offsets[i + 1])
+            for i, trigram in enumerate(text[keys + paths :])
+        }
+        self.zip_stamp: int = stamp
+        """zip_stamp() of the icons.zip this index was built for."""
+
+    def _postings(self, trigram: str) -> array[int]:
+        """Get the key numbers containing a trigram."""
+        start, end = self._trigrams.get(trigram, (0, 0))
+        return self._posting_data[start:end]
+
+    def search(self, query: str, variant: str = "", limit: int = 20) -> list[str]:
+        """Find zip paths whose key matches a query.
+
+        Args:
+            query: Search key or part of one (lowercase kebab-case).
+            variant: Only return paths under this variant prefix, if given.
+            limit: Maximum number of paths to return.
+
+        Returns:
+            Matching zip paths, best matches first.
+        """
+        prefix = f"{variant}/" if variant else ""
+        keys = self._keys
+        found: list[str] = []
+        seen: set[int] = set()
+
+        def take(numbers: Iterable[int]) -> bool:
+            for number in numbers:
+                if number in seen:
+                    continue
+                seen.add(number)
+                for path in self._paths[
+                    self._starts[number] : self._starts[number + 1]
+                ]:
+                    if path.startswith(prefix):
+                        found.append(path)
+                        if len(found) >= limit:
+                            return True
+            return False
+
+        def prefixed() -> Iterator[int]:
+            for number in range(bisect_left(keys, query), len(keys)):
+                if not keys[number].startswith(query):
+                    return
+                yield number
+
+        if limit <= 0 or take(prefixed()):
+            return found
+
+        query_trigrams = _trigrams(query)
+        if not query_trigrams:
+            return found
+        lists = sorted((self._postings(t) for t in query_trigrams), key=len)
+        # Every key containing the query is in the rarest trigram's postings
+        substring = sorted(
+            (n for n in lists[0] if n not in seen and query in keys[n]),
+            key=lambda n: (len(keys[n]), keys[n]),
+        )
+        if take(substring):
+            return found
+
+        if found:
+            return found
+        # Nothing contains the query, so treat it as misspelled: rank keys by
+        # the number of trigrams they share with it
+        counts: Counter[int] = Counter()
+        for postings in lists:
+            counts.update(postings)
+        needed = (len(lists) + 1) // 2
+        fuzzy = sorted(
+            (n for n, count in counts.items() if count >= needed),
+            key=lambda n: (-counts[n], len(keys[n]), keys[n]),
+        )
+        take(fuzzy)
+        return found
+
+
+class TagIndex:
+    """Parsed icons.tags: tag and category → zip paths."""
+
+    def __init__(self, data: bytes) -> None:
+        """Parse an index buffer.
+
+        Args:
+            data: Contents of icons.tags.
+
+        Raises:
+            ValueError: If the data is not a supported index.
+        """
+        if len(data) < TAGS_HEADER.size:
+            raise ValueError("Tag index is truncated")
+        magic, version, _, tags, categories, paths, postings, stamp = (
+            TAGS_HEADER.unpack_from(data)
+        )
+        if magic != TAGS_MAGIC or version != TAGS_VERSION:
+            raise ValueError("Unsupported tag index format")
+        terms = tags + categories
+        end = TAGS_HEADER.size + 4 * (terms + 1 + postings)
+        arrays = array("I")
+        arrays.frombytes(data[TAGS_HEADER.size : end])
+        if sys.byteorder == "big":
+            arrays.byteswap()
+        text = data[end:].decode("utf-8").split("\n") if terms + paths else []
+        if len(text) != terms + paths:
+            raise ValueError("Tag index is truncated")
+        self.tags = text[:tags]
+        """Every tag, sorted."""
+        self.categories = text[tags:terms]
+        """Every category, sorted."""
+        self._paths = text[terms:]
+        self._offsets = arrays[: terms + 1]
+        self._postings = arrays[terms + 1 :]
+        self.zip_stamp: int = stamp
+        """zip_stamp() of the icons.zip this index was built for."""
+
+    def _find(self, terms: list[str], first: int, term: str) -> list[str]:
+        """Look up a term in one sorted term list.
+
+        Args:
+            terms: self.tags or self.categories.
+            first: Term number of terms[0].
+            term: Normalized term.
+
+        Returns:
+            Zip paths listed under the term, sorted.
+        """
+        i = bisect_left(terms, term)
+        if i == len(terms) or terms[i] != term:
+            return []
+        start, end = self._offsets[first + i], self._offsets[first + i + 1]
+        return [self._paths[number] for number in self._postings[start:end]]
+
+    def tagged(self, tag: str) -> list[str]:
+        """Get the zip paths of icons with a tag."""
+        return self._find(self.tags, 0, tag)
+
+    def in_category(self, category: str) -> list[str]:
+        """Get the zip paths of icons in a category."""
+        return self._find(self.categories, len(self.tags), category)
+
+
+class EncodedIndex:
+    """Directory of icons.encoded: where each icon's encoded bodies lie.
+
+    Only the header, names and records are read; bodies stay on disk.
+    """
+
+    def __init__(self, f: IO[bytes]) -> None:
+        """Read the directory from the start of an icons.encoded file.
+
+        Args:
+            f: icons.encoded, opened for binary reading at offset 0.
+
+        Raises:
+            ValueError: If the file is not a supported sidecar.
+        """
+        header = f.read(ENCODED_HEADER.size)
+        if len(header) < ENCODED_HEADER.size:
+            raise ValueError("Encoded sidecar is truncated")
+        magic, version, encodings, paths, text_size, stamp = ENCODED_HEADER.unpack(
+            header
+        )
+        if magic != ENCODED_MAGIC or version != ENCODED_VERSION:
+            raise ValueError("Unsupported encoded sidecar format")
+        text = f.read(text_size).decode("utf-8").split("\n")
+        self._records = f.read(paths * encodings * ENCODED_RECORD.size)
+        if len(text) != encodings + paths or len(self._records) != (
+            paths * encodings * ENCODED_RECORD.size
+        ):
+            raise ValueError("Encoded sidecar is truncated")
+        self.encodings = text[:encodings]
+        """Encodings present, as HTTP Content-Encoding tokens."""
+        self._paths = text[encodings:]
+        self._data_offset = ENCODED_HEADER.size + text_size + len(self._records)
+        self.zip_stamp: int = stamp
+        """zip_stamp() of the icons.zip this sidecar was built for."""
+
+    def find(self, name: str, encoding: str) -> tuple[int, int] | None:
+        """Locate the body of an icon in one encoding.
+
+        Args:
+            name: Normalized resource name.
+            encoding: One of self.encodings.
+
+        Returns:
+            (absolute file offset, length), or None if the name is unknown.
+        """
+        i = bisect_left(self._paths, name)
+        if i == len(self._paths) or self._paths[i] != name:
+            return None
+        record = i * len(self.encodings) + self.encodings.index(encoding)
+        offset, length = ENCODED_RECORD.unpack_from(
+            self._records, record * ENCODED_RECORD.size
+        )
+        return self._data_offset + offset, length
+
+
+class SharedIconCache:
+    """Decompressed icons in one read-only map shared by processes.
+
+    Used both for the host-wide cache file and for the anonymous map filled
+    by `warm()`. The map holds distinct icons of icons.zip, decompressed,
+    keyed by the offset of their data in icons.zip. Lookups touch no Python
+    object per icon, so reads never write to the shared pages. The map never
+    leaves the host, so it is in native byte order:
+
+    - Header (24 bytes): magic ``b"JMRC"``, version (u16), reserved (u16),
+      entry count N (u64), zip_stamp() of the icons.zip it was filled from
+      (u64).
+    - Keys: N u64 icons.zip data offsets, ascending.
+    - Starts: N + 1 u64; entry ``i`` is ``data[starts[i]:starts[i + 1]]``.
+    - Data: the decompressed icons, back to back.
+
+    Files are written under a temporary name and renamed into place, so a
+    process either sees a complete cache or none.
+    """
+
+    def __init__(self, mapped: mmap.mmap, stamp: int) -> None:
+        """Wrap a filled map.
+
+        Args:
+            mapped: Map holding the cache.
+            stamp: zip_stamp() of the current icons.zip.
+
+        Raises:
+            ValueError: If the file is not a complete cache of that zip.
+        """
+        if len(mapped) < SHARED_HEADER.size:
+            raise ValueError("Shared cache is truncated")
+        magic, version, _, count, built_for = SHARED_HEADER.unpack_from(mapped)
+        if magic != SHARED_MAGIC or version != SHARED_VERSION or built_for != stamp:
+            raise ValueError("Shared cache does not match icons.zip")
+        # The anonymous map of warm() is writable; views handed to callers
+        # must not let one of them corrupt the pages every worker shares
+        view = memoryview(mapped).toreadonly()
+        keys_end = SHARED_HEADER.size + 8 * count
+        data_start = keys_end + 8 * (count + 1)
+        if len(mapped) < data_start:
+            raise ValueError("Shared cache is truncated")
+        self._keys = view[SHARED_HEADER.size : keys_end].cast("Q")
+        self._starts = view[keys_end:data_start].cast("Q")
+        self._data = view[data_start:]
+        if len(self._data) != self._starts[-1]:
+            raise ValueError("Shared cache is truncated")
+
+    def __len__(self) -> int:
+        """Get the number of distinct icons in the cache."""
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the decompressed icons in bytes."""
+        return len(self._data)
+
+    def read(self, offset: int) -> memoryview | None:
+        """Get the decompressed content of an entry.
+
+        Args:
+            offset: Data offset of the entry in icons.zip.
+
+        Returns:
+            Read-only view into the shared map, or None if not cached.
+        """
+        i = bisect_left(self._keys, offset)
+        if i == len(self._keys) or self._keys[i] != offset:
+            return None
+        return self._data[self._starts[i] : self._starts[i + 1]]
+
+
+class IconResourcePack(ZippedResourcePack):
+    """Base class for icon packs built by pack-tools.
+
+    Subclasses override `_normalize_name()` to add extensions and default
+    variant prefixes; everything else is shared.
+    """
+
+    def __init__(
+        self,
+        package_name: str,
+        reader: str | None = None,
+        cache_bytes: int | None = None,
+        async_workers: int | None = None,
+        shared_cache: bool | None = None,
+        skip_sidecars: Iterable[str] | None = None,
+        archive_name: str = "icons.zip",
+        manifest_name: str = "pack_manifest.json",
+        default_content_type: str | None = None,
+        prefixes: list[str] | None = None,
+        pack_info: PackInfo | None = None,
+    ) -> None:
+        """Initialize icon resource pack without touching any file.
+
+        Args:
+            package_name: Python package name containing icons.zip.
+            reader: Reader backend, "file" or "mmap". Defaults to the READER
+                setting (see get_setting()), else "file". "mmap" needs
+                an index (see _get_index()) and a real file on disk;
+                otherwise reads fall back to "file".
+            cache_bytes: Budget of the decompressed-icon LRU cache in bytes;
+                0 disables it. Defaults to the CACHE_BYTES setting, else 0.
+            async_workers: Size of the thread pool that serves the async
+                getters. Defaults to the ASYNC_WORKERS setting, else 4.
+            shared_cache: Serve reads from a decompressed copy of the pack
+                shared by every process on the host (see SharedIconCache).
+                Needs an index. Defaults to the SHARED_CACHE setting ("1",
+                "true", "yes" or "on"), else off.
+            skip_sidecars: Sidecar files (see SIDECARS) to ignore as if they
+                were missing, for benchmarks and for ruling out a suspect
+                file. Defaults to the SKIP_SIDECARS setting, a
+                comma-separated list, else none.
+            archive_name: Name of zip file within package.
+            manifest_name: Name of manifest JSON file within package.
+            default_content_type: MIME type for resources. If None, read from
+                the manifest on first use.
+            prefixes: Prefix aliases. If None, read from the manifest on
+                first use.
+            pack_info: Pack metadata. If None, read from the manifest on
+                first use.
+
+        Raises:
+            ValueError: If reader is not a known backend, cache_bytes or
+                async_workers is out of range or not an integer, or
+                skip_sidecars names an unknown file.
+        """
+        reader = reader or get_setting(package_name, "READER") or "file"
+        if reader not in READERS:
+            raise ValueError(
+                f"Unknown reader '{reader}'. Must be one of: {', '.join(READERS)}"
+            )
+        if cache_bytes is None:
+            cache_bytes = int(get_setting(package_name, "CACHE_BYTES") or 0)
+        if cache_bytes < 0:
+            raise ValueError(f"cache_bytes must be >= 0, got {cache_bytes}")
+        if async_workers is None:
+            async_workers = int(get_setting(package_name, "ASYNC_WORKERS") or 4)
+        if async_workers < 1:
+            raise ValueError(f"async_workers must be >= 1, got {async_workers}")
+        if skip_sidecars is None:
+            setting = get_setting(package_name, "SKIP_SIDECARS") or ""
+            skip_sidecars = [name.strip() for name in setting.split(",")]
+            skip_sidecars = [name for name in skip_sidecars if name]
+        skip = frozenset(skip_sidecars)
+        if not skip <= set(SIDECARS):
+            unknown = ", ".join(sorted(skip - set(SIDECARS)))
+            raise ValueError(
+                f"Unknown sidecars '{unknown}'. Must be among: {', '.join(SIDECARS)}"
+            )
+        # ZippedResourcePack.__init__ parses the manifest eagerly, so it is not
+        # called; the attributes it sets are initialised here instead and the
+        # manifest-derived ones are resolved lazily by the accessors below
+        self._package_name = package_name
+        self._archive_name = archive_name
+        self._manifest_name = manifest_name
+        self._manifest: dict[str, Any] | None = None
+        self._resource_list: list[str] | None = None
+        self._default_content_type = default_content_type
+        self._prefixes = prefixes
+        self._pack_info = pack_info
+        self._reader = reader
+        self._skip_sidecars = skip
+        self._cache = ByteLRUCache(cache_bytes) if cache_bytes else None
+        self._aliases: dict[str, str] | None = None
+        self._names: dict[str, str] | None = None
+        self._index: IconIndex | IconDirectory | None = None
+        self._index_loaded = False
+        self._zip_stamp: int | None = None
+        self._filter: BloomFilter | None = None
+        self._filter_loaded = False
+        self._search: SearchIndex | None = None
+        self._search_loaded = False
+        self._tags: TagIndex | None = None
+        self._tags_loaded = False
+        self._encoded: EncodedIndex | None = None
+        self._encoded_loaded = False
+        self._mmap: mmap.mmap | None = None
+        self._mmap_failed = False
+        # Reentrant: _get_shared() loads the index while holding it
+        self._lock = threading.RLock()
+        self._async_workers = async_workers
+        if shared_cache is None:
+            shared_cache = _enabled(get_setting(package_name, "SHARED_CACHE"))
+        self._shared_enabled = shared_cache
+        self._shared: SharedIconCache | None = None
+        self._shared_loaded = False
+        self._warm: SharedIconCache | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._inflight: dict[
+            tuple[asyncio.AbstractEventLoop, str], asyncio.Future[bytes]
+        ] = {}
+
+    @property
+    def default_content_type(self) -> str:
+        """MIME type of the pack's resources, read from the manifest if unset."""
+        if self._default_content_type is None:
+            self._default_content_type = (
+                self.get_manifest()
+                .get("contents", {})
+                .get("format", "application/octet-stream")
+            )
+        return self._default_content_type
+
+    @default_content_type.setter
+    def default_content_type(self, value: str) -> None:
+        """Override the MIME type of the pack's resources."""
+        self._default_content_type = value
+
+    def get_prefixes(self) -> list[str]:
+        """Return list of optional alias prefixes.
+
+        Returns:
+            List of prefix aliases, from the manifest unless given explicitly.
+        """
+        if self._prefixes is None:
+            self._prefixes = self.get_manifest().get("pack", {}).get("prefixes", [])
+        return self._prefixes
+
+    def get_pack_info(self) -> PackInfo:
+        """Return metadata describing this resource pack.
+
+        Returns:
+            PackInfo from the manifest unless given explicitly.
+        """
+        if self._pack_info is None:
+            pack_data = self.get_manifest().get("pack", {})
+            self._pack_info = PackInfo(
+                description=pack_data.get("description", "Resource pack"),
+                source_url=pack_data.get("source_url"),
+                license_spdx=pack_data.get("upstream_license"),
+            )
+        return self._pack_info
+
+    def _load_json(self, name: str) -> dict[str, Any]:
+        """Load an optional JSON artifact from the pack package.
+
+        Args:
+            name: File name within the package.
+
+        Returns:
+            Parsed JSON object, or an empty dict if the file is missing.
+        """
+        try:
+            with (files(self._package_name) / name).open(encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _open_sidecar(self, name: str) -> IO[bytes]:
+        """Open an optional sidecar file of the pack package.
+
+        Args:
+            name: File name within the package (one of SIDECARS).
+
+        Returns:
+            The file, opened for binary reading.
+
+        Raises:
+            OSError: If the file is missing or unreadable, or skipped through
+                skip_sidecars.
+        """
+        if name in self._skip_sidecars:
+            raise FileNotFoundError(f"{name} is skipped")
+        return (files(self._package_name) / name).open("rb")
+
+    def _read_sidecar(self, name: str) -> bytes:
+        """Read an optional sidecar file of the pack package.
+
+        Args:
+            name: File name within the package (one of SIDECARS).
+
+        Returns:
+            Contents of the file.
+
+        Raises:
+            OSError: If the file is missing or unreadable, or skipped through
+                skip_sidecars.
+        """
+        with self._open_sidecar(name) as f:
+            return f.read()
+
+    def _get_aliases(self) -> dict[str, str]:
+        """Get the alias → canonical path table for deduplicated icons.
+
+        Returns:
+            Mapping of zip path to the zip path that stores its content.
+        """
+        if self._aliases is None:
+            self._aliases = self._load_json(ALIASES_NAME).get("aliases", {})
+        return self._aliases
+
+    def _get_names(self) -> dict[str, str]:
+        """Get the lookup key → zip path table of alternative spellings.
+
+        Returns:
+            Mapping of name_key() result to zip path.
+        """
+        if self._names is None:
+            self._names = self._load_json(NAMES_NAME).get("names", {})
+        return self._names
+
+    def _resolve_name(self, name: str) -> str:
+        """Resolve any accepted spelling of a name to its zip path.
+
+        Args:
+            name: Resource name from user.
+
+        Returns:
+            Zip path to look up (not necessarily present).
+        """
+        key = name_key(name)
+        return self._get_names().get(key) or self._normalize_name(key)
+
+    def _get_index(self) -> IconIndex | IconDirectory | None:
+        """Load icons.idx if it exists and matches icons.zip.
+
+        A missing, unreadable or stale index (one built for a different
+        icons.zip) is replaced by an IconDirectory read once from the zip.
+
+        Returns:
+            The index, or None if neither can be used; reads then go
+            through zipfile.
+        """
+        if not self._index_loaded:
+            with self._lock:
+                if not self._index_loaded:
+                    try:
+                        index = IconIndex(self._read_sidecar(INDEX_NAME))
+                    except (OSError, ValueError):
+                        index = None
+                    if index is not None and index.zip_stamp == self._get_zip_stamp():
+                        self._index = index
+                    else:
+                        self._index = self._read_directory()
+                    self._index_loaded = True
+        return self._index
+
+    def _read_directory(self) -> IconDirectory | None:
+        """Build the compact directory of icons.zip, in place of icons.idx.
+
+        Returns:
+            The directory, or None if icons.zip cannot be read from disk or
+            uses compression methods other than stored and deflated.
+        """
+        try:
+            with (files(self._package_name) / self._archive_name).open("rb") as f:
+                return IconDirectory(f, self._get_aliases())
+        except (OSError, ValueError):
+            return None
+
+    def _get_zip_stamp(self) -> int | None:
+        """Get the zip_stamp() of icons.zip, to detect stale sidecar files.
+
+        Returns:
+            The stamp, or None if icons.zip cannot be read.
+        """
+        if self._zip_stamp is None:
+            try:
+                with (files(self._package_name) / self._archive_name).open("rb") as f:
+                    self._zip_stamp = zip_stamp(f)
+            except (OSError, ValueError):
+                return None
+        return self._zip_stamp
+
+    def _get_filter(self) -> BloomFilter | None:
+        """Load icons.bloom if it exists and matches icons.zip.
+
+        Returns:
+            The filter, or None if it cannot be used.
+        """
+        if not self._filter_loaded:
+            with self._lock:
+                if not self._filter_loaded:
+                    try:
+                        bloom = BloomFilter(self._read_sidecar(BLOOM_NAME))
+                    except (OSError, ValueError):
+                        bloom = None
+                    if bloom is not None and bloom.zip_stamp == self._get_zip_stamp():
+                        self._filter = bloom
+                    self._filter_loaded = True
+        return self._filter
+
+    def _get_search(self) -> SearchIndex | None:
+        """Load icons.search if it exists and matches icons.zip.
+
+        Returns:
+            The search index, or None if it cannot be used.
+        """
+        if not self._search_loaded:
+            with self._lock:
+                if not self._search_loaded:
+                    try:
+                        search = SearchIndex(self._read_sidecar(SEARCH_NAME))
+                    except (OSError, ValueError):
+                        search = None
+                    if search is not None and search.zip_stamp == self._get_zip_stamp():
+                        self._search = search
+                    self._search_loaded = True
+        return self._search
+
+    def search(self, query: str, limit: int = 20) -> list[str]:
+        """Find resources by partial name, for pickers and autocompletion.
+
+        The query is normalized like a resource name, so "arrowDown" and
+        "arrow_down" match "arrow-down". A "variant/" prefix (e.g.
+        "bold/arr") restricts results to that variant. Exact and prefix
+        matches come first, then names containing the query, then names
+        sharing most of its trigrams.
+
+        Args:
+            query: Partial resource name.
+            limit: Maximum number of results.
+
+        Returns:
+            Resource names as listed by list_resources(), best matches
+            first.
+        """
+        variant, _, base = name_key(query.strip().replace(" ", "-")).rpartition("/")
+        index = self._get_search()
+        if index is not None:
+            return index.search(base, variant, limit)
+        # No usable icons.search: scan every name, ranking prefix matches
+        # before substring matches and skipping the fuzzy tier
+        prefix = f"{variant}/" if variant else ""
+        ranked = []
+        for path in self._get_resource_list():
+            if not path.startswith(prefix):
+                continue
+            key = path.rpartition("/")[2].removesuffix(".svg")
+            if key.startswith(base):
+                ranked.append((0, key, path))
+            elif base in key:
+                ranked.append((1, f"{len(key):09d}{key}", path))
+        return [path for *_, path in sorted(ranked)[: max(limit, 0)]]
+
+    def _get_tags(self) -> TagIndex | None:
+        """Load icons.tags if it exists and matches icons.zip.
+
+        Returns:
+            The tag index, or None if it cannot be used.
+        """
+        if not self._tags_loaded:
+            with self._lock:
+                if not self._tags_loaded:
+                    try:
+                        tags = TagIndex(self._read_sidecar(TAGS_NAME))
+                    except (OSError, ValueError):
+                        tags = None
+                    if tags is not None and tags.zip_stamp == self._get_zip_stamp():
+                        self._tags = tags
+                    self._tags_loaded = True
+        return self._tags
+
+    def list_tags(self) -> list[str]:
+        """List the upstream tags of the pack's icons.
+
+        Returns:
+            Sorted, lowercase tags; empty if upstream ships none.
+        """
+        tags = self._get_tags()
+        return list(tags.tags) if tags is not None else []
+
+    def list_categories(self) -> list[str]:
+        """List the upstream categories of the pack's icons.
+
+        Returns:
+            Sorted, lowercase categories; empty if upstream ships none.
+        """
+        tags = self._get_tags()
+        return list(tags.categories) if tags is not None else []
+
+    def get_tagged(self, tag: str) -> list[str]:
+        """Find icons by upstream tag, without reading any icon.
+
+        Args:
+            tag: Tag, matched case-insensitively.
+
+        Returns:
+            Sorted resource names as listed by list_resources().
+        """
+        tags = self._get_tags()
+        return tags.tagged(normalize_term(tag)) if tags is not None else []
+
+    def get_category(self, category: str) -> list[str]:
+        """Find icons by upstream category, without reading any icon.
+
+        Args:
+            category: Category, matched case-insensitively.
+
+        Returns:
+            Sorted resource names as listed by list_resources().
+        """
+        tags = self._get_tags()
+        return tags.in_category(normalize_term(category)) if tags is not None else []
+
+    def _may_contain(self, resource_name: str) -> bool:
+        """Check a normalized name against the filter.
+
+        Args:
+            resource_name: Normalized resource name, possibly an alias.
+
+        Returns:
+            False only if the pack certainly has no such name.
+        """
+        bloom = self._get_filter()
+        return bloom is None or resource_name in bloom
+
+    def has_resource(self, name: str) -> bool:
+        """Check whether the pack has a resource, without reading it.
+
+        This is the cheap way to probe several packs for a name: most absent
+        names are rejected by the filter alone.
+
+        Args:
+            name: Resource name, as accepted by get_resource().
+
+        Returns:
+            True if get_resource(name) would succeed.
+        """
+        resource_name = self._resolve_name(name)
+        if not self._may_contain(resource_name):
+            return False
+        index = self._get_index()
+        if index is not None:
+            return index.find(resource_name) is not None
+        resource_name = self._get_aliases().get(resource_name, resource_name)
+        with self._open_zip() as zip_file:
+            try:
+                zip_file.getinfo(resource_name)
+            except KeyError:
+                return False
+        return True
+
+    def _get_mmap(self) -> mmap.mmap | None:
+        """Map icons.zip into memory, once per pack instance.
+
+        The map is never closed: views handed out by get_resource_view() may
+        outlive any single call, and the OS reclaims it at process exit.
+
+        Returns:
+            Read-only map of icons.zip, or None if it cannot be mapped.
+        """
+        if self._mmap is None and not self._mmap_failed:
+            with self._lock:
+                if self._mmap is None and not self._mmap_failed:
+                    path = files(self._package_name) / self._archive_name
+                    try:
+                        with path.open("rb") as f:
+                            self._mmap = mmap.mmap(
+                                f.fileno(), 0, access=mmap.ACCESS_READ
+                            )
+                    except (OSError, ValueError):
+                        self._mmap_failed = True
+        return self._mmap
+
+    def _shared_cache_path(self) -> str:
+        """Get the shared cache file of this exact icons.zip.
+
+        The name is "<package>-<location>-<version>.icons": location hashes
+        the zip's path, so each install (virtualenv, version) has its own
+        caches, and version hashes its size and mtime, so an upgraded or
+        reinstalled pack never picks up a stale cache.
+
+        Returns:
+            Path of the cache file.
+
+        Raises:
+            OSError: If icons.zip or the cache directory is unusable.
+        """
+        archive = str(files(self._package_name) / self._archive_name)
+        stat = os.stat(archive)
+        location = hashlib.blake2b(archive.encode(), digest_size=8).hexdigest()
+        identity = f"{stat.st_size}\0{stat.st_mtime_ns}".encode()
+        version = hashlib.blake2b(identity, digest_size=8).hexdigest()
+        directory = shared_cache_dir(self._package_name)
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        if hasattr(os, "getuid") and os.stat(directory).st_uid != os.getuid():
+            raise PermissionError(f"{directory} is owned by another user")
+        name = f"{self._package_name}-{location}-{version}.icons"
+        return os.path.join(directory, name)
+
+    def _map_shared(self, path: str) -> SharedIconCache | None:
+        """Map an existing shared cache file.
+
+        Args:
+            path: Cache file.
+
+        Returns:
+            The cache, or None if the file does not exist yet.
+
+        Raises:
+            ValueError: If the file is not a cache of the current icons.zip.
+        """
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        return SharedIconCache(mapped, self._get_zip_stamp() or 0)
+
+    def _write_decompressed(
+        self, out: BinaryIO | mmap.mmap, entries: list[tuple[int, int, int, int, int]]
+    ) -> None:
+        """Write entries in the SharedIconCache layout.
+
+        Args:
+            out: File or map to write to, at its current position; it must
+                have room for SHARED_HEADER.size + 16 * len(entries) + 8
+                bytes plus the decompressed sizes.
+            entries: Index records, sorted by offset.
+
+        Raises:
+            ValueError: If an entry is corrupt.
+        """
+        starts = [0]
+        for entry in entries:
+            starts.append(starts[-1] + entry[3])
+        out.write(
+            SHARED_HEADER.pack(
+                SHARED_MAGIC,
+                SHARED_VERSION,
+                0,
+                len(entries),
+                self._get_zip_stamp() or 0,
+            )
+        )
+        out.write(array("Q", [entry[1] for entry in entries]).tobytes())
+        out.write(array("Q", starts).tobytes())
+        with (files(self._package_name) / self._archive_name).open("rb") as f:
+            for entry in entries:
+                f.seek(entry[1])
+                out.write(self._decode(entry, f.read(entry[2])))
+
+    def _remove_stale_shared(self, path: str) -> None:
+        """Delete leftover shared cache files of this install of the pack.
+
+        Removes caches of a previous icons.zip at the same path (other
+        versions) with their lock files, which an upgrade or reinstall would
+        otherwise leave behind in /dev/shm, and temporary files of fillers
+        that died before publishing (e.g., a SIGKILLed worker). Caches of
+        other installs, such as another virtualenv, are left alone.
+        Processes that still map a removed cache keep their mapping. Call it
+        while holding the host lock.
+
+        Args:
+            path: Current cache file, which is kept with its lock file.
+        """
+        directory, current = os.path.split(path)
+        stem = current.rpartition("-")[0]
+        pattern = re.compile(
+            re.escape(stem) + r"-[0-9a-f]{16}\.icons(?:\.lock|\.(\d+)\.tmp)?"
+        )
+        try:
+            names = os.listdir(directory)
+        except OSError:
+            return
+        for name in names:
+            match = pattern.fullmatch(name)
+            if match is None or name in (current, f"{current}.lock"):
+                continue
+            pid = match.group(1)
+            if pid is not None and _pid_alive(int(pid)):
+                continue
+            try:
+                os.unlink(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def _fill_shared(self, path: str, index: IconIndex | IconDirectory) -> None:
+        """Decompress every icon into a new shared cache file.
+
+        Args:
+            path: Cache file to publish.
+            index: The pack's index, listing the entries.
+
+        Raises:
+            ValueError: If an entry is corrupt.
+        """
+        self._remove_stale_shared(path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as out:
+                self._write_decompressed(out, index.entries())
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _get_shared(self) -> SharedIconCache | None:
+        """Map the host-wide decompressed cache, filling it if needed.
+
+        The first process to get here decompresses the pack while holding a
+        host-wide lock; the others wait, then map the published file.
+
+        Returns:
+            The cache, or None if shared caching is off or unavailable, in
+            which case reads take the normal path.
+        """
+        if self._shared_enabled and not self._shared_loaded:
+            with self._lock:
+                if not self._shared_loaded:
+                    index = self._get_index()
+                    try:
+                        if index is not None:
+                            path = self._shared_cache_path()
+                            shared = self._map_shared(path)
+                            if shared is None:
+                                with _host_lock(f"{path}.lock"):
+                                    shared = self._map_shared(path)
+                                    if shared is None:
+                                        self._fill_shared(path, index)
+                                        shared = self._map_shared(path)
+                            self._shared = shared
+                    except (OSError, ValueError):
+                        self._shared = None
+                    self._shared_loaded = True
+        return self._shared
+
+    def warm(
+        self,
+        variants: Iterable[str] | None = None,
+        names: Iterable[str] | None = None,
+    ) -> int:
+        """Decompress icons ahead of time, for sharing with forked workers.
+
+        Call it in the master process of a pre-forking server before the
+        workers start. The selected icons (every icon if neither variants
+        nor names is given) are decompressed into one anonymous shared
+        memory map plus an offset table (see SharedIconCache), which every
+        forked worker inherits. Reads of warm icons are a bisect and a slice
+        with no per-request inflation, and no per-icon Python object exists
+        whose reference count could dirty the shared pages, so per-worker
+        memory stays flat. A later call replaces the previous selection.
+
+        Args:
+            variants: Variants whose icons to include (e.g., ["outlined"]).
+            names: Individual resource names to include, in any spelling
+                accepted by get_resource().
+
+        Returns:
+            Number of distinct icons now warm; aliases share one entry.
+
+        Raises:
+            ValueError: If the pack has no usable index, a name is not
+                in the pack, a variant has no icons, or an entry is corrupt.
+        """
+        index = self._get_index()
+        if index is None:
+            raise ValueError(f"warm() cannot index {self._archive_name}")
+        if variants is None and names is None:
+            entries = index.entries()
+        else:
+            selected: set[tuple[int, int, int, int, int]] = set()
+            all_names = index.names() if variants else []
+            for variant in variants or ():
+                found = [name for name in all_names if name.startswith(f"{variant}/")]
+                if not found:
+                    raise ValueError(f"Variant '{variant}' has no icons in pack")
+                for name in found:
+                    entry = index.find(name)
+                    if entry is not None:
+                        selected.add(entry)
+            for name in names or ():
+                entry = index.find(self._resolve_name(name))
+                if entry is None:
+                    raise self._not_found(name)
+                selected.add(entry)
+            entries = sorted(selected, key=lambda entry: entry[1])
+        size = SHARED_HEADER.size + 16 * len(entries) + 8
+        size += sum(entry[3] for entry in entries)
+        mapped = mmap.mmap(-1, size)
+        self._write_decompressed(mapped, entries)
+        self._warm = SharedIconCache(mapped, self._get_zip_stamp() or 0)
+        return len(entries)
+
+    def _read_cached(self, entry: tuple[int, int, int, int, int]) -> memoryview | None:
+        """Get an entry from the warm map or the shared cache, if it is there.
+
+        Args:
+            entry: Record returned by IconIndex.find().
+
+        Returns:
+            View of the decompressed content, or None.
+        """
+        for cache in (self._warm, self._get_shared()):
+            if cache is not None:
+                data = cache.read(entry[1])
+                if data is not None:
+                    return data
+        return None
+
+    def _read_raw(self, offset: int, size: int) -> bytes | memoryview:
+        """Read a byte range of icons.zip with the configured backend.
+
+        Args:
+            offset: Start of the range.
+            size: Number of bytes.
+
+        Returns:
+            The bytes, as a zero-copy view when memory-mapped.
+        """
+        if self._reader == "mmap":
+            mapped = self._get_mmap()
+            if mapped is not None:
+                return memoryview(mapped)[offset : offset + size]
+        with (files(self._package_name) / self._archive_name).open("rb") as f:
+            f.seek(offset)
+            return bytes(f.read(size))
+
+    def _read_indexed(
+        self, entry: tuple[int, int, int, int, int]
+    ) -> bytes | memoryview:
+        """Read an entry located through the index.
+
+        Args:
+            entry: Record returned by IconIndex.find().
+
+        Returns:
+            Decompressed content; stored entries read through the memory map
+            are returned as views of the map.
+
+        Raises:
+            ValueError: If the entry is corrupt.
+        """
+        return self._decode(entry, self._read_raw(entry[1], entry[2]))
+
+    def _decode(
+        self, entry: tuple[int, int, int, int, int], raw: bytes | memoryview
+    ) -> bytes | memoryview:
+        """Decompress and verify the raw bytes of an indexed entry.
+
+        Args:
+            entry: Record returned by IconIndex.find().
+            raw: The entry's compressed bytes.
+
+        Returns:
+            Decompressed content (`raw` itself for stored entries).
+
+        Raises:
+            ValueError: If the entry is corrupt.
+        """
+        method, offset, _, size, crc = entry
+        data = zlib.decompress(raw, -15, size) if method == METHOD_DEFLATED else raw
+        if len(data) != size or zlib.crc32(data) != crc:
+            raise ValueError(
+                f"Corrupt entry at offset {offset} in {self._archive_name}"
+            )
+        return data
+
+    def _read_view(self, resource_name: str) -> bytes | memoryview:
+        """Read the content stored for a normalized name without copying.
+
+        Args:
+            resource_name: Normalized resource name, possibly an alias.
+
+        Returns:
+            Decompressed content, possibly a view of the memory map.
+
+        Raises:
+            KeyError: If the name does not exist.
+        """
+        if not self._may_contain(resource_name):
+            raise KeyError(resource_name)
+        index = self._get_index()
+        if index is not None:
+            entry = index.find(resource_name)
+            if entry is None:
+                raise KeyError(resource_name)
+            cached = self._read_cached(entry)
+            if cached is not None:
+                return cached
+            return self._read_indexed(entry)
+        resource_name = self._get_aliases().get(resource_name, resource_name)
+        with self._open_zip() as zip_file:
+            return bytes(zip_file.read(resource_name))
+
+    def _read(self, resource_name: str) -> bytes:
+        """Read the content stored for a normalized name.
+
+        Args:
+            resource_name: Normalized resource name, possibly an alias.
+
+        Returns:
+            Decompressed content.
+
+        Raises:
+            KeyError: If the name does not exist.
+        """
+        if self._cache is not None:
+            cached = self._cache.get(resource_name)
+            if cached is not None:
+                return cached
+        data = self._read_view(resource_name)
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if self._cache is not None:
+            self._cache.put(resource_name, data)
+        return data
+
+    def get_many(self, names: Iterable[str]) -> dict[str, bytes | None]:
+        """Read several resources in one forward sweep over icons.zip.
+
+        Names are normalized up front and the reads are sorted by their
+        offset in icons.zip, so scattered lookups become sequential I/O on a
+        single file handle. Names sharing the same stored content (aliases)
+        are read once.
+
+        Args:
+            names: Resource names, as accepted by get_resource().
+
+        Returns:
+            Mapping of each requested name, in request order, to its content,
+            or to None if the pack has no such resource.
+
+        Raises:
+            ValueError: If an entry is corrupt.
+        """
+        results: dict[str, bytes | None] = dict.fromkeys(names)
+        resource_names = {name: self._resolve_name(name) for name in results}
+        pending: dict[str, list[str]] = {}
+        for name, resource_name in resource_names.items():
+            cached = self._cache.get(resource_name) if self._cache else None
+            if cached is not None:
+                results[name] = cached
+            else:
+                pending.setdefault(resource_name, []).append(name)
+
+        for resource_name, data in self._read_sorted(list(pending)):
+            if self._cache is not None:
+                self._cache.put(resource_name, data)
+            for name in pending[resource_name]:
+                results[name] = data
+        return results
+
+    def _read_sorted(self, resource_names: list[str]) -> list[tuple[str, bytes]]:
+        """Read normalized names in icons.zip offset order.
+
+        Args:
+            resource_names: Normalized resource names, possibly aliases.
+
+        Returns:
+            (resource name, content) pairs for the names that exist.
+        """
+        resource_names = [name for name in resource_names if self._may_contain(name)]
+        if not resource_names:
+            return []
+        index = self._get_index()
+        if index is None:
+            aliases = self._get_aliases()
+            found: list[tuple[str, bytes]] = []
+            with self._open_zip() as zip_file:
+                infos = []
+                for resource_name in resource_names:
+                    try:
+                        info = zip_file.getinfo(
+                            aliases.get(resource_name, resource_name)
+                        )
+                    except KeyError:
+                        continue
+                    infos.append((info.header_offset, resource_name, info))
+                for _, resource_name, info in sorted(infos):
+                    found.append((resource_name, zip_file.read(info)))
+            return found
+
+        by_entry: dict[tuple[int, int, int, int, int], list[str]] = {}
+        for resource_name in resource_names:
+            entry = index.find(resource_name)
+            if entry is not None:
+                by_entry.setdefault(entry, []).append(resource_name)
+        entries = sorted(by_entry, key=lambda entry: entry[1])
+
+        found = []
+        uncached = []
+        for entry in entries:
+            cached = self._read_cached(entry)
+            if cached is None:
+                uncached.append(entry)
+            else:
+                data = bytes(cached)
+                found.extend((name, data) for name in by_entry[entry])
+        entries = uncached
+        if not entries:
+            return found
+        mapped = self._get_mmap() if self._reader == "mmap" else None
+        if mapped is not None:
+            view = memoryview(mapped)
+            for entry in entries:
+                raw: bytes | memoryview = view[entry[1] : entry[1] + entry[2]]
+                data = bytes(self._decode(entry, raw))
+                found.extend((name, data) for name in by_entry[entry])
+            return found
+        with (files(self._package_name) / self._archive_name).open("rb") as f:
+            for entry in entries:
+                f.seek(entry[1])
+                data = bytes(self._decode(entry, f.read(entry[2])))
+                found.extend((name, data) for name in by_entry[entry])
+        return found
+
+    def cache_info(self) -> CacheInfo | None:
+        """Get the counters of the decompressed-icon cache.
+
+        Returns:
+            CacheInfo snapshot, or None if caching is disabled.
+        """
+        return self._cache.info() if self._cache is not None else None
+
+    def _not_found(self, name: str) -> ValueError:
+        """Build the error raised for a missing resource.
+
+        Args:
+            name: Resource name from user.
+
+        Returns:
+            ValueError with suggestions of similar names.
+        """
+        available = self._get_resource_list()
+        suggestions = [
+            n
+            for n in available
+            if name.lower() in n.lower() or n.lower() in name.lower()
+        ][:5]
+        suggestion_text = (
+            f" Similar names: {', '.join(suggestions)}" if suggestions else ""
+        )
+        return ValueError(f"Resource '{name}' not found in pack.{suggestion_text}")
+
+    def _make_content(self, data: bytes) -> ResourceContent:
+        """Wrap resource bytes in a ResourceContent.
+
+        Args:
+            data: Resource content.
+
+        Returns:
+            ResourceContent with this pack's content type and metadata.
+        """
+        encoding = (
+            "utf-8"
+            if self.default_content_type.startswith("text/")
+            or self.default_content_type == "image/svg+xml"
+            else None
+        )
+        metadata = {
+            "pack_version": self.get_manifest().get("pack", {}).get("version"),
+        }
+        return ResourceContent(
+            data=data,
+            content_type=self.default_content_type,
+            encoding=encoding,
+            metadata=metadata,
+        )
+
+    def get_resource(self, name: str) -> ResourceContent:
+        """Get resource content for a name.
+
+        Args:
+            name: Resource name (e.g., "icon" or "outlined/icon.svg").
+
+        Returns:
+            ResourceContent object with resource data and metadata.
+
+        Raises:
+            ValueError: If resource not found in pack.
+        """
+        try:
+            data = self._read(self._resolve_name(name))
+        except KeyError:
+            raise self._not_found(name) from None
+        return self._make_content(data)
+
+    def get_resource_view(self, name: str) -> memoryview:
+        """Get resource bytes without copying them where possible.
+
+        With the "mmap" reader, uncompressed (stored) entries are returned as
+        a read-only view into the shared memory map, with no copy at all.
+        Other entries are returned as a view of freshly decompressed bytes.
+
+        Args:
+            name: Resource name (e.g., "icon" or "outlined/icon.svg").
+
+        Returns:
+            Read-only view of the resource content.
+
+        Raises:
+            ValueError: If resource not found in pack.
+        """
+        resource_name = self._resolve_name(name)
+        data: bytes | memoryview
+        try:
+            if self._cache is not None:
+                data = self._read(resource_name)
+            else:
+                data = self._read_view(resource_name)
+        except KeyError:
+            raise self._not_found(name) from None
+        return data if isinstance(data, memoryview) else memoryview(data)
+
+    def _locate(self, resource_name: str) -> tuple[int, int, int, int, int]:
+        """Find where the stored payload of a normalized name lies.
+
+        Args:
+            resource_name: Normalized resource name, possibly an alias.
+
+        Returns:
+            (method, data offset, compressed size, size, CRC-32), as
+            returned by IconIndex.find().
+
+        Raises:
+            KeyError: If the name does not exist.
+            ValueError: If the entry is malformed or uses another method.
+        """
+        if not self._may_contain(resource_name):
+            raise KeyError(resource_name)
+        index = self._get_index()
+        if index is not None:
+            entry = index.find(resource_name)
+            if entry is None:
+                raise KeyError(resource_name)
+            return entry
+        resource_name = self._get_aliases().get(resource_name, resource_name)
+        with self._open_zip() as zip_file:
+            info = zip_file.getinfo(resource_name)
+            zip_file.fp.seek(info.header_offset)
+            header = LOCAL_HEADER.unpack(zip_file.fp.read(LOCAL_HEADER.size))
+        if header[0] != LOCAL_HEADER_MAGIC or info.compress_type not in (
+            METHOD_STORED,
+            METHOD_DEFLATED,
+        ):
+            raise ValueError(f"Cannot pass through {resource_name} as stored")
+        offset = info.header_offset + LOCAL_HEADER.size + header[-2] + header[-1]
+        return info.compress_type, offset, info.compress_size, info.file_size, info.CRC
+
+    def get_compressed(self, name: str) -> CompressedResource:
+        """Get an icon's payload as stored in icons.zip, without inflating it.
+
+        The payload is not verified against its CRC-32, since that would
+        mean inflating it; clients decoding the response check it instead.
+        With the "mmap" reader the payload is a view of the memory map.
+
+        Args:
+            name: Resource name (e.g., "icon" or "outlined/icon.svg").
+
+        Returns:
+            CompressedResource; use to_gzip() for a gzip response body.
+
+        Raises:
+            ValueError: If resource not found in pack, or it is stored with
+                a compression method other than deflate.
+        """
+        try:
+            method, offset, compress_size, size, crc = self._locate(
+                self._resolve_name(name)
+            )
+        except KeyError:
+            raise self._not_found(name) from None
+        return CompressedResource(
+            self._read_raw(offset, compress_size), method, size, crc
+        )
+
+    def _get_encoded(self) -> EncodedIndex | None:
+        """Load the directory of icons.encoded if it exists and matches icons.zip.
+
+        Returns:
+            The directory, or None if it cannot be used.
+        """
+        if not self._encoded_loaded:
+            with self._lock:
+                if not self._encoded_loaded:
+                    try:
+                        with self._open_sidecar(ENCODED_NAME) as f:
+                            encoded = EncodedIndex(f)
+                    except (OSError, ValueError):
+                        encoded = None
+                    if (
+                        encoded is not None
+                        and encoded.zip_stamp == self._get_zip_stamp()
+                    ):
+                        self._encoded = encoded
+                    self._encoded_loaded = True
+        return self._encoded
+
+    def list_encodings(self) -> list[str]:
+        """List the content codings get_encoded() accepts.
+
+        Returns:
+            Encodings built into icons.encoded, plus "gzip", which is always
+            available by framing the stored deflate payload.
+        """
+        encoded = self._get_encoded()
+        encodings = list(encoded.encodings) if encoded is not None else []
+        return encodings if "gzip" in encodings else [*encodings, "gzip"]
+
+    def get_encoded(self, name: str, encoding: str) -> bytes:
+        """Get an icon compressed in an HTTP content coding, ready to send.
+
+        Bodies built into icons.encoded are read as they are. Without one
+        for "gzip", the stored payload is framed by get_compressed(), which
+        also costs no compression.
+
+        Args:
+            name: Resource name (e.g., "icon" or "outlined/icon.svg").
+            encoding: Content-Encoding token (e.g., "br"); see
+                list_encodings().
+
+        Returns:
+            The encoded body.
+
+        Raises:
+            ValueError: If resource not found in pack, or the encoding is
+                not available.
+        """
+        encoded = self._get_encoded()
+        if encoded is None or encoding not in encoded.encodings:
+            if encoding == "gzip":
+                return self.get_compressed(name).to_gzip()
+            raise ValueError(
+                f"Encoding '{encoding}' not available. "
+                f"Available: {', '.join(self.list_encodings())}"
+            )
+        location = encoded.find(self._resolve_name(name), encoding)
+        if location is None:
+            raise self._not_found(name)
+        offset, length = location
+        with (files(self._package_name) / ENCODED_NAME).open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool that serves the async getters.
+
+        Returns:
+            The pack's executor, created on first use.
+        """
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._async_workers,
+                        thread_name_prefix=self._package_name,
+                    )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the thread pool of the async getters, if one was started.
+
+        Waits for pending reads. The pack stays usable: a later async call
+        starts a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    async def _aread(self, resource_name: str) -> bytes:
+        """Read a normalized name off the event loop, coalescing duplicates.
+
+        Args:
+            resource_name: Normalized resource name, possibly an alias.
+
+        Returns:
+            Decompressed content.
+
+        Raises:
+            KeyError: If the name does not exist.
+        """
+        import asyncio
+
+        if not self._may_contain(resource_name):
+            raise KeyError(resource_name)
+        if self._cache is not None:
+            cached = self._cache.get(resource_name)
+            if cached is not None:
+                return cached
+        if self._warm is not None or self._shared is not None:
+            # Already mapped: a read is a memory copy, cheaper than a thread hop
+            index = self._get_index()
+            entry = index.find(resource_name) if index is not None else None
+            if entry is not None and self._read_cached(entry) is not None:
+                return self._read(resource_name)
+        loop = asyncio.get_running_loop()
+        key = (loop, resource_name)
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.run_in_executor(
+                self._get_executor(), self._read, resource_name
+            )
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared read so one cancelled waiter does not cancel it
+        # for the others
+        return await asyncio.shield(future)
+
+    async def aget_resource(self, name: str) -> ResourceContent:
+        """Get resource content for a name without blocking the event loop.
+
+        Args:
+            name: Resource name (e.g., "icon" or "outlined/icon.svg").
+
+        Returns:
+            ResourceContent object with resource data and metadata.
+
+        Raises:
+            ValueError: If resource not found in pack.
+        """
+        import asyncio
+
+        try:
+            data = await self._aread(self._resolve_name(name))
+        except KeyError:
+            loop = asyncio.get_running_loop()
+            raise await loop.run_in_executor(
+                self._get_executor(), self._not_found, name
+            ) from None
+        return self._make_content(data)
+
+    async def aget_many(self, names: Iterable[str]) -> dict[str, bytes | None]:
+        """Async counterpart of get_many(), run as one batch on the pool.
+
+        Args:
+            names: Resource names, as accepted by get_resource().
+
+        Returns:
+            Mapping of each requested name to its content, or to None if the
+            pack has no such resource.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self.get_many, list(names)
+        )
+
+    def _get_resource_list(self) -> list[str]:
+        """Get cached list of all resource names, including aliases.
+
+        Returns:
+            Sorted list of resource names.
+        """
+        if self._resource_list is None:
+            index = self._get_index()
+            if index is not None:
+                self._resource_list = index.names()
+                return self._resource_list
+            with self._open_zip() as zip_file:
+                names = {n for n in zip_file.namelist() if not n.endswith("/")}
+            names.update(self._get_aliases())
+            self._resource_list = sorted(names)
+        return self._resource_list